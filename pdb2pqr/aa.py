@@ -24,6 +24,8 @@ class Amino(residue.Residue):
     This class provides standard features of the amino acids.
     """
 
+    __slots__ = ("peptide_c", "peptide_n", "stateboolean", "wasFlipped")
+
     def __init__(self, atoms: list[ATOM | HETATM], ref: DefinitionResidue):
         """Initialize object.
 
@@ -46,6 +48,8 @@ class Amino(residue.Residue):
         self.ins_code = sample_atom.ins_code
         self.ffname = self.name
         self.map: dict[str, struct.Atom] = {}
+        self.biomolecule = None
+        self._charge = None
         self.dihedrals = []
         self.patches = []
         self.peptide_c = None
@@ -105,18 +109,14 @@ class Amino(residue.Residue):
         :param atom:  atom to add
         :type atom:  Atom
         """
-        self.atoms.append(atom)
+        residue.Residue.add_atom(self, atom)
         atomname = atom.name
-        self.map[atomname] = atom
         try:
             atom.reference = self.reference.map[atomname]
             for bond in atom.reference.bonds:
                 if self.has_atom(bond):
                     bondatom = self.map[bond]
-                    if bondatom not in atom.bonds:
-                        atom.bonds.append(bondatom)
-                    if atom not in bondatom.bonds:
-                        bondatom.bonds.append(atom)
+                    atom.connect(bondatom)
         except KeyError:
             _LOGGER.debug(f"Skipping atom reference for {atomname}")
             atom.reference = None
@@ -266,6 +266,8 @@ class Amino(residue.Residue):
 class ALA(Amino):
     """Alanine class."""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize object.
 
@@ -292,6 +294,8 @@ class ALA(Amino):
 class ARG(Amino):
     """Arginine class."""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize object.
 
@@ -324,6 +328,8 @@ class ARG(Amino):
 class ASN(Amino):
     """Asparagine class."""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize object.
 
@@ -350,6 +356,8 @@ class ASN(Amino):
 class ASP(Amino):
     """Aspartic acid class."""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize object.
 
@@ -382,6 +390,8 @@ class ASP(Amino):
 class CYS(Amino):
     """Cysteine class."""
 
+    __slots__ = ("ss_bonded", "ss_bonded_partner")
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize object.
 
@@ -424,6 +434,8 @@ class CYS(Amino):
 class GLN(Amino):
     """Glutamine class."""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize object.
 
@@ -450,6 +462,8 @@ class GLN(Amino):
 class GLU(Amino):
     """Glutamic acid class."""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize object.
 
@@ -482,6 +496,8 @@ class GLU(Amino):
 class GLY(Amino):
     """Glycine class."""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize object.
 
@@ -508,6 +524,8 @@ class GLY(Amino):
 class HIS(Amino):
     """Histidine class."""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize object.
 
@@ -580,6 +598,8 @@ class HIS(Amino):
 class ILE(Amino):
     """Isoleucine class."""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize object.
 
@@ -606,6 +626,8 @@ class ILE(Amino):
 class LEU(Amino):
     """Leucine class."""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize object.
 
@@ -632,6 +654,8 @@ class LEU(Amino):
 class LYS(Amino):
     """Lysine class."""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize object.
 
@@ -664,6 +688,8 @@ class LYS(Amino):
 class MET(Amino):
     """Methionine class."""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize object.
 
@@ -690,6 +716,8 @@ class MET(Amino):
 class PHE(Amino):
     """Phenylalanine class."""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize object.
 
@@ -716,6 +744,8 @@ class PHE(Amino):
 class PRO(Amino):
     """Proline class."""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize object.
 
@@ -755,6 +785,8 @@ class PRO(Amino):
 class SER(Amino):
     """Serine class."""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize object.
 
@@ -781,6 +813,8 @@ class SER(Amino):
 class THR(Amino):
     """Threonine class."""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize object.
 
@@ -807,6 +841,8 @@ class THR(Amino):
 class TRP(Amino):
     """Tryptophan class."""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize object.
 
@@ -833,6 +869,8 @@ class TRP(Amino):
 class TYR(Amino):
     """Tyrosine class."""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize object.
 
@@ -865,6 +903,8 @@ class TYR(Amino):
 class VAL(Amino):
     """Valine class."""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize object.
 
@@ -895,6 +935,8 @@ class WAT(residue.Residue):
 
     """
 
+    __slots__ = ()
+
     water_residue_names = ["HOH", "WAT"]
 
     def __init__(self, atoms, ref: DefinitionResidue):
@@ -917,6 +959,8 @@ class WAT(residue.Residue):
         self.fixed = 0
         self.ffname = "WAT"
         self.map = {}
+        self.biomolecule = None
+        self._charge = None
         self.reference = ref
         # Create each atom
         for atom_ in atoms:
@@ -963,18 +1007,14 @@ class WAT(residue.Residue):
         :param atom:  add atom to residue
         :type atom:  Atom
         """
-        self.atoms.append(atom)
+        residue.Residue.add_atom(self, atom)
         atomname = atom.name
-        self.map[atomname] = atom
         try:
             atom.reference = self.reference.map[atomname]
             for bond in atom.reference.bonds:
                 if self.has_atom(bond):
                     bondatom = self.map[bond]
-                    if bondatom not in atom.bonds:
-                        atom.bonds.append(bondatom)
-                    if atom not in bondatom.bonds:
-                        bondatom.bonds.append(atom)
+                    atom.connect(bondatom)
         except KeyError:
             _LOGGER.debug(f"Ignoring reference for WAT atom {atomname}")
             atom.reference = None
@@ -983,6 +1023,8 @@ class WAT(residue.Residue):
 class LIG(residue.Residue):
     """Generic ligand class."""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref):
         """Initialize this object.
 
@@ -1005,6 +1047,8 @@ class LIG(residue.Residue):
         self.fixed = 0
         self.ffname = "WAT"
         self.map = {}
+        self.biomolecule = None
+        self._charge = None
         self.reference = ref
         self.is_n_term = 0
         self.is_c_term = 0
@@ -1049,18 +1093,14 @@ class LIG(residue.Residue):
         :param atom:  add atom to residue
         :type atom:  Atom
         """
-        self.atoms.append(atom)
+        residue.Residue.add_atom(self, atom)
         atomname = atom.name
-        self.map[atomname] = atom
         try:
             atom.reference = self.reference.map[atomname]
             for bond in atom.reference.bonds:
                 if self.has_atom(bond):
                     bondatom = self.map[bond]
-                    if bondatom not in atom.bonds:
-                        atom.bonds.append(bondatom)
-                    if atom not in bondatom.bonds:
-                        bondatom.bonds.append(atom)
+                    atom.connect(bondatom)
         except KeyError:
             _LOGGER.debug(f"Ignoring atom reference for ligand {atomname}")
             atom.reference = None
@@ -6,15 +6,19 @@ Authors:  Todd Dolinsky, Yong Huang
 """
 
 import copy
+import itertools
 import logging
 import pprint
 import string
 
+import numpy as np
+
 from . import aa, forcefield, io, na, pdb
 from . import quatfit as quat
 from . import residue as residue_
 from . import structures as struct
 from . import utilities as util
+from .bonds import BondGraph
 from .config import BONDED_SS_LIMIT, PEPTIDE_DIST, RNA_MAPPING
 
 _LOGGER = logging.getLogger(__name__)
@@ -34,7 +38,12 @@ class Biomolecule:
     def __init__(self, pdblist, definition):
         """Initialize using parsed PDB file
 
-        :param pdblist:  list of objects from :mod:`pdb` from lines of PDB file
+        The records are read in a single pass so ``pdblist`` may be a
+        generator (e.g., from :func:`pdb.iter_records`); in that case only the
+        non-atom records are kept in :attr:`pdblist`.
+
+        :param pdblist:  list or iterable of objects from :mod:`pdb` from
+            lines of PDB file
         :type pdblist:  list
         :param definition:  topology definition object
         :type definition:  Definition
@@ -43,83 +52,187 @@ class Biomolecule:
         self.chains = []
         self.residues = []
         self.definition = definition
-        self.pdblist = pdblist
-        chain_dict = {}
+        self._coordinates = np.empty((0, 3))
+        self._coordinate_atoms = []
+        self._atoms = None
+        self._atoms_by_id = {}
+        self._next_atom_id = 0
+        self.bond_graph = BondGraph()
+        self._charge_summary = None
+        keep_records = not isinstance(pdblist, list)
+        self.pdblist = [] if keep_records else pdblist
+        chain_ids = string.ascii_uppercase + string.ascii_lowercase
+        chain_ids += string.digits
+        # (chain ID, residue, atom records) in file order; the chain ID is
+        # None for unlabeled residues read before the first TER, which are
+        # only assigned a chain if the structure turns out to have TERs
+        placed = []
         previous_atom = None
+        previous_pending = False
         residue = []
         num_models = 0
-        num_chains = 1
         count = 0
-        for record in pdblist:  # Find number of chains
-            if isinstance(record, pdb.TER):
-                num_chains += 1
         for record in pdblist:
             if isinstance(record, (pdb.ATOM, pdb.HETATM)):
-                if (
-                    record.chain_id == ""
-                    and num_chains > 1
-                    and record.res_name
-                    not in [
-                        "WAT",
-                        "HOH",
-                    ]
-                ):
-                    # Assign a chain ID
-                    try:
-                        record.chain_id = (
-                            string.ascii_uppercase
-                            + string.ascii_lowercase
-                            + string.digits
-                        )[count]
-                    except IndexError:
-                        raise Exception(
-                            "Too many chains exist in biomolecule. "
-                            "Consider preparing subsets."
-                        )
-
-                chain_id = record.chain_id
-                res_seq = record.res_seq
-                ins_code = record.ins_code
+                pending = False
+                if record.chain_id == "" and record.res_name not in [
+                    "WAT",
+                    "HOH",
+                ]:
+                    if count == 0:
+                        pending = True
+                    else:
+                        # Assign a chain ID
+                        try:
+                            record.chain_id = chain_ids[count]
+                        except IndexError:
+                            raise Exception(
+                                "Too many chains exist in biomolecule. "
+                                "Consider preparing subsets."
+                            )
                 if previous_atom is None:
                     previous_atom = record
-                if chain_id not in chain_dict:
-                    my_chain = struct.Chain(chain_id)
-                    chain_dict[chain_id] = my_chain
+                    previous_pending = pending
                 if (
-                    res_seq != previous_atom.res_seq
-                    or ins_code != previous_atom.ins_code
-                    or chain_id != previous_atom.chain_id
+                    record.res_seq != previous_atom.res_seq
+                    or record.ins_code != previous_atom.ins_code
+                    or record.chain_id != previous_atom.chain_id
+                    or pending != previous_pending
                 ):
-                    my_residue = self.create_residue(
-                        residue, previous_atom.res_name
+                    placed.append(
+                        self._place_residue(residue, previous_pending)
                     )
-                    chain_dict[previous_atom.chain_id].add_residue(my_residue)
                     residue = []
                 residue.append(record)
                 previous_atom = record
-            elif isinstance(record, pdb.END):
-                my_residue = self.create_residue(
-                    residue, previous_atom.res_name
-                )
-                chain_dict[previous_atom.chain_id].add_residue(my_residue)
+                previous_pending = pending
+                continue
+            if keep_records:
+                self.pdblist.append(record)
+            if isinstance(record, pdb.END):
+                if residue != []:
+                    placed.append(
+                        self._place_residue(residue, previous_pending)
+                    )
                 residue = []
             elif isinstance(record, pdb.MODEL):
                 num_models += 1
                 if residue == []:
                     continue
                 if num_models > 1:
-                    my_residue = self.create_residue(
-                        residue, previous_atom.res_name
+                    placed.append(
+                        self._place_residue(residue, previous_pending)
                     )
-                    chain_dict[previous_atom.chain_id].add_residue(my_residue)
+                    residue = []
                     break
             elif isinstance(record, pdb.TER):
                 count += 1
         if residue != [] and num_models <= 1:
-            my_residue = self.create_residue(residue, previous_atom.res_name)
-            chain_dict[previous_atom.chain_id].add_residue(my_residue)
+            placed.append(self._place_residue(residue, previous_pending))
+        chain_dict = {}
+        for placed_id, my_residue, records in placed:
+            chain_id = placed_id
+            if placed_id is None:
+                chain_id = ""
+                if count > 0:
+                    chain_id = chain_ids[0]
+                    my_residue.set_chain_id(chain_id)
+                    for record in records:
+                        record.chain_id = chain_id
+            if chain_id not in chain_dict:
+                chain_dict[chain_id] = struct.Chain(chain_id)
+            chain_dict[chain_id].add_residue(my_residue)
+        self.set_chains(chain_dict)
+
+    def _place_residue(self, residue, pending):
+        """Create a residue from atom records and note its chain.
+
+        :param residue:  list of atom records for a single residue
+        :type residue:  list
+        :param pending:  whether the chain ID has yet to be assigned
+        :type pending:  bool
+        :return:  (chain ID or None if pending, residue, atom records)
+        :rtype:  (str, Residue, list)
+        """
+        my_residue = self.create_residue(residue, residue[-1].res_name)
+        chain_id = None if pending else residue[-1].chain_id
+        return chain_id, my_residue, residue
+
+    @classmethod
+    def from_columns(cls, columns, definition, pdblist=None):
+        """Create a biomolecule directly from columnar atom data.
+
+        This follows the same rules as :meth:`__init__` (only the first model
+        is used and chain IDs are assigned to unlabeled chains separated by
+        TER records) but avoids creating a :mod:`pdb` record object for every
+        atom.
+
+        :param columns:  atom columns from :func:`pdb.read_pdb_columns`
+        :type columns:  pdb.AtomColumns
+        :param definition:  topology definition object
+        :type definition:  Definition
+        :param pdblist:  other records or lines from the file (e.g., header)
+        :type pdblist:  list
+        :return:  new biomolecule
+        :rtype:  Biomolecule
+        """
+        biomolecule = cls([], definition)
+        biomolecule.pdblist = [] if pdblist is None else pdblist
+        columns = columns.take(columns.model <= 1)
+        chain_ids = columns.chain_id.astype("U1")
+        num_chains = columns.num_ter + 1
+        if num_chains > 1:
+            letters = np.array(
+                list(
+                    string.ascii_uppercase
+                    + string.ascii_lowercase
+                    + string.digits
+                )
+            )
+            unlabeled = (chain_ids == "") & ~np.isin(
+                columns.res_name, ["WAT", "HOH"]
+            )
+            if np.any(columns.ter[unlabeled] >= len(letters)):
+                raise Exception(
+                    "Too many chains exist in biomolecule. "
+                    "Consider preparing subsets."
+                )
+            chain_ids[unlabeled] = letters[columns.ter[unlabeled]]
+            columns.chain_id = chain_ids
+        # Residues start wherever the chain, sequence number, or insertion
+        # code changes
+        changed = (
+            (chain_ids[1:] != chain_ids[:-1])
+            | (columns.res_seq[1:] != columns.res_seq[:-1])
+            | (columns.ins_code[1:] != columns.ins_code[:-1])
+        )
+        bounds = [0, *(np.flatnonzero(changed) + 1).tolist(), len(columns)]
+        chain_dict = {}
+        records = list(columns.records())
+        for start, stop in itertools.pairwise(bounds):
+            if start == stop:
+                continue
+            residue = records[start:stop]
+            chain_id = residue[-1].chain_id
+            if chain_id not in chain_dict:
+                chain_dict[chain_id] = struct.Chain(chain_id)
+            my_residue = biomolecule.create_residue(
+                residue, residue[-1].res_name
+            )
+            chain_dict[chain_id].add_residue(my_residue)
+        biomolecule.set_chains(chain_dict)
+        return biomolecule
+
+    def set_chains(self, chain_dict):
+        """Set the chain map, chain list, and residue list.
+
+        :param chain_dict:  dictionary of chains indexed by chain ID
+        :type chain_dict:  {str: Chain}
+        """
         # Keep a map for accessing chains via chain_id
         self.chainmap = chain_dict.copy()
+        self.chains = []
+        self.residues = []
         # Make a list for sequential ordering of chains
         if "" in chain_dict:
             chain_dict["ZZ"] = chain_dict[""]
@@ -131,6 +244,127 @@ class Biomolecule:
         for chain in self.chains:
             for residue in chain.residues:
                 self.residues.append(residue)
+                residue.biomolecule = self
+        self._atoms = None
+        self._atoms_by_id = {}
+        self._next_atom_id = 0
+        self.update_atoms(added=self.atoms)
+        self.bond_graph.rebuild(self.atoms)
+        self._charge_summary = None
+        self.pack_coordinates()
+
+    def update_atoms(self, added=(), removed=()):
+        """Update the atom index after atoms are added, removed, or moved.
+
+        Each new atom is given the next unused :attr:`Atom.id`.  IDs are not
+        reused, so they stay the same for the life of the biomolecule and
+        can be used in place of the atom objects (see
+        :meth:`get_atom_by_id`).  The :attr:`atoms` list is rebuilt the next
+        time it is used.
+
+        Residues of the biomolecule call this from
+        :meth:`Residue.add_atom`, :meth:`Residue.remove_atom`, and
+        :meth:`Residue.reorder`.
+
+        :param added:  atoms added to the biomolecule
+        :type added:  [Atom]
+        :param removed:  atoms removed from the biomolecule
+        :type removed:  [Atom]
+        """
+        for atom in removed:
+            self._atoms_by_id.pop(atom.id, None)
+        for atom in added:
+            atom.id = self._next_atom_id
+            self._atoms_by_id[atom.id] = atom
+            self._next_atom_id += 1
+        self._atoms = None
+
+    def get_atom_by_id(self, atom_id):
+        """Get an atom by its ID.
+
+        :param atom_id:  atom ID (see :meth:`update_atoms`)
+        :type atom_id:  int
+        :return:  atom
+        :rtype:  Atom
+        :raises KeyError:  if no atom in the biomolecule has the ID
+        """
+        return self._atoms_by_id[atom_id]
+
+    @property
+    def num_atom_ids(self):
+        """Number of atom IDs assigned so far.
+
+        All atom IDs are less than this, so it can be used to size arrays
+        indexed by atom ID.
+
+        :rtype:  int
+        """
+        return self._next_atom_id
+
+    def pack_coordinates(self):
+        """Store the coordinates of all atoms in one array.
+
+        Each atom reads and writes its coordinates in a row of
+        :attr:`coordinates` (see :meth:`Atom.bind_coords`).  This is done
+        when the chains are set and again by :attr:`coordinates` whenever
+        atoms have been added or removed.
+        """
+        atoms = self.atoms
+        coordinates = np.empty((len(atoms), 3))
+        for index, atom in enumerate(atoms):
+            atom.bind_coords(coordinates, index)
+        self._coordinates = coordinates
+        self._coordinate_atoms = atoms
+
+    @property
+    def coordinates(self):
+        """Coordinates of all atoms.
+
+        Row ``i`` holds the coordinates of ``atoms[i]`` and is shared with
+        that atom, so the array can be used for batched calculations
+        without copying and stays current as atoms are moved.
+
+        :return:  array of coordinates with shape (N, 3)
+        :rtype:  numpy.ndarray
+        """
+        if self._coordinate_atoms is not self.atoms:
+            self.pack_coordinates()
+        return self._coordinates
+
+    def copy(self):
+        """Copy the biomolecule so it can be modified independently.
+
+        The chains, residues, and atoms are copied.  The topology definitions,
+        the residue and atom references, and the PDB records are shared with
+        the original since they are not modified after the residues are set
+        up.
+
+        :return:  new biomolecule
+        :rtype:  Biomolecule
+        """
+        memo = {
+            id(self.definition): self.definition,
+            id(self.pdblist): self.pdblist,
+            id(self._coordinates): self._coordinates.copy(),
+        }
+        objects = [self, *self.chains]
+        for residue in self.residues:
+            memo[id(residue.reference)] = residue.reference
+            objects.append(residue)
+            for atom in residue.atoms:
+                memo[id(atom.reference)] = atom.reference
+                objects.append(atom)
+        # Create every copy before filling in their attributes so bonds
+        # between atoms do not recurse through the whole structure
+        for obj in objects:
+            memo[id(obj)] = copy.copy(obj)
+        for obj in objects:
+            new_obj = memo[id(obj)]
+            for name, value in util.attributes(obj).items():
+                setattr(new_obj, name, copy.deepcopy(value, memo))
+        biomolecule = memo[id(self)]
+        biomolecule.pack_coordinates()
+        return biomolecule
 
     @property
     def num_missing_heavy(self):
@@ -289,6 +523,7 @@ class Biomolecule:
                         newchain.add_residue(res)
                         chain.residues.remove(res)
                         res.set_chain_id(chainid[0])
+                    self.update_atoms()
                     self.assign_termini(
                         chain, neutraln=neutraln, neutralc=neutralc
                     )
@@ -563,17 +798,16 @@ class Biomolecule:
 
         Update using the reference objects in each atom.
         """
+        add_bond = self.bond_graph.add
         for residue in self.residues:
             if isinstance(residue, (aa.Amino, aa.WAT, na.Nucleic)):
                 for atom in residue.atoms:
                     if not atom.has_reference:
                         continue
                     for bond in atom.reference.bonds:
-                        if not residue.has_atom(bond):
-                            continue
-                        bondatom = residue.get_atom(bond)
-                        if bondatom not in atom.bonds:
-                            atom.add_bond(bondatom)
+                        bondatom = residue.map.get(bond)
+                        if bondatom is not None:
+                            add_bond(atom, bondatom)
 
     def update_bonds(self):
         """Update the bonding network of the biomolecule.
@@ -723,27 +957,11 @@ class Biomolecule:
             list of atoms that were not found in the forcefield)
         :rtype:  (list, list)
         """
-        misslist = []
-        hitlist = []
-        for residue in self.residues:
-            if isinstance(residue, (aa.Amino, aa.WAT, na.Nucleic)):
-                resname = residue.ffname
-            else:
-                resname = residue.name
-            for atom in residue.atoms:
-                atomname = atom.name
-                charge, radius = forcefield_.get_params(resname, atomname)
-                if charge is not None and radius is not None:
-                    atom.ffcharge = charge
-                    atom.radius = radius
-                    hitlist.append(atom)
-                else:
-                    misslist.append(atom)
-            charge_err = util.noninteger_charge(residue.charge)
-            if charge_err:
-                _LOGGER.warning(
-                    f"Residue {residue} has non-integer charge: {charge_err}. "
-                )
+        hitlist, misslist = forcefield_.assign(self)
+        for residue, charge_err in self.charge_summary["noninteger"]:
+            _LOGGER.warning(
+                f"Residue {residue} has non-integer charge: {charge_err}. "
+            )
         return hitlist, misslist
 
     def apply_name_scheme(self, forcefield_):
@@ -1094,7 +1312,7 @@ class Biomolecule:
         :type outfilename:  str
         """
         # Cache the initial atom numbers
-        numcache = {atom: atom.serial for atom in self.atoms}
+        numcache = {atom.id: atom.serial for atom in self.atoms}
         self.reserialize()
         amberff = forcefield.Forcefield("amber", definition, None)
         charmmff = forcefield.Forcefield("charmm", definition, None)
@@ -1133,7 +1351,7 @@ class Biomolecule:
             file_.write("</BODY></HTML>\n")
         # Return the original numbers back
         for atom in self.atoms:
-            atom.serial = numcache[atom]
+            atom.serial = numcache[atom.id]
 
     def reserialize(self):
         """Generate new serial numbers for atoms in the biomolecule."""
@@ -1144,14 +1362,20 @@ class Biomolecule:
     def atoms(self):
         """Return all Atom objects in list format.
 
+        The list is cached until atoms are added, removed, or moved (see
+        :meth:`update_atoms`) and should not be modified.
+
         :return:  all atom objects
         :rtype:  [Atom]
         """
-        atomlist = []
-        for chain in self.chains:
-            for atom in chain.atoms:
-                atomlist.append(atom)
-        return atomlist
+        if self._atoms is None:
+            self._atoms = [
+                atom
+                for chain in self.chains
+                for residue in chain.residues
+                for atom in residue.atoms
+            ]
+        return self._atoms
 
     @property
     def charge(self):
@@ -1167,19 +1391,62 @@ class Biomolecule:
             the total charge on the biomolecule)
         :rtype:  (list, float)
         """
-        charge = 0.0
-        misslist = []
-        for chain in self.chains:
-            for residue in chain.residues:
-                rescharge = residue.charge
-                charge += rescharge
-                if isinstance(residue, na.Nucleic) and (
-                    residue.is3term or residue.is5term
-                ):
-                    continue
-                if util.noninteger_charge(rescharge):
-                    misslist.append(residue)
-        return misslist, charge
+        summary = self.charge_summary
+        misslist = [
+            residue
+            for residue, _ in summary["noninteger"]
+            if not (
+                isinstance(residue, na.Nucleic)
+                and (residue.is3term or residue.is5term)
+            )
+        ]
+        return misslist, summary["total"]
+
+    @property
+    def charge_summary(self):
+        """Summarize the charges of the residues, chains, and biomolecule.
+
+        The summary is cached until an atom charge changes or atoms are
+        added or removed (see :meth:`Residue.charge_changed`), so checking
+        the charges again only costs a dictionary lookup.
+
+        :return:  dictionary with the ``total`` charge of the biomolecule,
+            the charge of each chain in ``chains`` (by chain ID; chains
+            with the same ID are added together), and a list of (residue,
+            description of problem) for the residues with ``noninteger``
+            charges
+        :rtype:  dict
+        """
+        if self._charge_summary is None:
+            total = 0.0
+            chains = {}
+            noninteger = []
+            for chain in self.chains:
+                chain_charge = 0.0
+                for residue in chain.residues:
+                    charge = residue.charge
+                    total += charge
+                    chain_charge += charge
+                    charge_err = util.noninteger_charge(charge)
+                    if charge_err:
+                        noninteger.append((residue, charge_err))
+                # Chains split from one chain can share an ID
+                chains[chain.chain_id] = (
+                    chains.get(chain.chain_id, 0.0) + chain_charge
+                )
+            self._charge_summary = {
+                "total": total,
+                "chains": chains,
+                "noninteger": noninteger,
+            }
+        return self._charge_summary
+
+    def charges_changed(self):
+        """Discard the cached :attr:`charge_summary`.
+
+        This is called by :meth:`Residue.charge_changed`.
+        """
+        self._charge_summary = None
 
     def __str__(self):
         output = [chain.get_summary() for chain in self.chains]
@@ -0,0 +1,191 @@
+"""Bond graph of a biomolecule.
+
+The bonds of each atom are listed in :attr:`Atom.bonds`.  A
+:class:`BondGraph` indexes those lists by atom ID (see
+:meth:`Biomolecule.update_atoms`) so that a bond can be tested without
+scanning the lists, and provides the bonds as arrays for calculations over
+many atoms at once (e.g., excluding bonded pairs from neighbor scoring).
+"""
+
+import numpy as np
+
+#: Number of bits for each atom ID in the integer key of a bond
+ID_BITS = 32
+
+
+class BondGraph:
+    """Bonds between the atoms of a biomolecule.
+
+    Bonds are directed like the :attr:`Atom.bonds` lists they mirror:
+    :meth:`has_bond` is equivalent to ``other in atom.bonds``.  Each bond is
+    stored as one integer key made from the IDs of its atoms.  The lists
+    must only be changed through :meth:`Atom.add_bond` and
+    :meth:`Atom.remove_bond` (or :meth:`add` and :meth:`discard`) once the
+    graph is built.
+    """
+
+    def __init__(self):
+        self._keys = set()
+        self._sorted_keys = None
+
+    def __len__(self):
+        return len(self._keys)
+
+    def rebuild(self, atoms):
+        """Rebuild the graph from the bond lists of atoms.
+
+        :param atoms:  atoms of the biomolecule
+        :type atoms:  [Atom]
+        """
+        self._keys = {
+            (atom.id << ID_BITS) | other.id
+            for atom in atoms
+            for other in atom.bonds
+        }
+        self._sorted_keys = None
+
+    def add(self, atom, other):
+        """Add a bond from one atom to another (if not already present).
+
+        :param atom:  atom to add the bond to
+        :type atom:  Atom
+        :param other:  bonded atom
+        :type other:  Atom
+        """
+        key = (atom.id << ID_BITS) | other.id
+        if key in self._keys:
+            return
+        self._keys.add(key)
+        self._sorted_keys = None
+        atom.bonds.append(other)
+
+    def discard(self, atom, other):
+        """Remove a bond from one atom to another (if present).
+
+        :param atom:  atom to remove the bond from
+        :type atom:  Atom
+        :param other:  bonded atom
+        :type other:  Atom
+        """
+        key = (atom.id << ID_BITS) | other.id
+        if key not in self._keys:
+            return
+        self._keys.remove(key)
+        self._sorted_keys = None
+        atom.bonds.remove(other)
+
+    def remove_atom(self, atom):
+        """Remove all bonds to and from an atom.
+
+        The bonds back to ``atom`` are removed from the bond lists of the
+        atoms it is bonded to.  The bond list of ``atom`` itself is kept
+        (the hydrogen optimization still inspects removed atoms), but its
+        bonds are no longer in the graph.
+
+        :param atom:  atom being removed from the biomolecule
+        :type atom:  Atom
+        """
+        for other in atom.bonds:
+            self._keys.discard((atom.id << ID_BITS) | other.id)
+            self.discard(other, atom)
+        self._sorted_keys = None
+
+    def has_bond(self, atom, other):
+        """Test whether one atom is bonded to another.
+
+        :param atom:  atom with bond
+        :type atom:  Atom
+        :param other:  bonded atom
+        :type other:  Atom
+        :return:  True if ``other`` is in the bonds of ``atom``
+        :rtype:  bool
+        """
+        return ((atom.id << ID_BITS) | other.id) in self._keys
+
+    def is_bonded(self, atom, other):
+        """Test whether two atoms are bonded in either direction.
+
+        :param atom:  first atom
+        :type atom:  Atom
+        :param other:  second atom
+        :type other:  Atom
+        :return:  True if either atom is in the bonds of the other
+        :rtype:  bool
+        """
+        keys = self._keys
+        forward = (atom.id << ID_BITS) | other.id
+        backward = (other.id << ID_BITS) | atom.id
+        return forward in keys or backward in keys
+
+    def sorted_keys(self):
+        """Get the keys of all bonds as a sorted array.
+
+        The array is cached until the graph changes.
+
+        :return:  keys ``(atom_id << ID_BITS) | bonded_id``
+        :rtype:  numpy.ndarray
+        """
+        if self._sorted_keys is None:
+            keys = np.fromiter(self._keys, dtype=np.int64, count=len(self))
+            keys.sort()
+            self._sorted_keys = keys
+        return self._sorted_keys
+
+    def csr(self, num_ids):
+        """Get the bonds in compressed sparse row (CSR) form.
+
+        The IDs of the atoms bonded to the atom with ID ``i`` are
+        ``indices[indptr[i]:indptr[i + 1]]`` (in increasing order).
+
+        :param num_ids:  number of atom IDs (see
+            :attr:`Biomolecule.num_atom_ids`)
+        :type num_ids:  int
+        :return:  (indptr, indices) arrays
+        :rtype:  (numpy.ndarray, numpy.ndarray)
+        """
+        keys = self.sorted_keys()
+        counts = np.bincount(keys >> ID_BITS, minlength=num_ids)
+        indptr = np.zeros(num_ids + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return indptr, keys & ((1 << ID_BITS) - 1)
+
+    def excluded_mask(self, atom_ids, other_ids):
+        """Find which pairs of atoms are bonded in either direction.
+
+        Bonded pairs are usually excluded when scoring contacts between
+        neighboring atoms.
+
+        :param atom_ids:  IDs of the first atom of each pair (or one ID for
+            the first atom of all pairs)
+        :type atom_ids:  numpy.ndarray or int
+        :param other_ids:  IDs of the second atom of each pair
+        :type other_ids:  numpy.ndarray
+        :return:  boolean array that is True for bonded pairs
+        :rtype:  numpy.ndarray
+        """
+        atom_ids = np.asarray(atom_ids, dtype=np.int64)
+        other_ids = np.asarray(other_ids, dtype=np.int64)
+        keys = self.sorted_keys()
+        forward = (atom_ids << ID_BITS) | other_ids
+        backward = (other_ids << ID_BITS) | atom_ids
+        return _in_sorted(forward, keys) | _in_sorted(backward, keys)
+
+
+def _in_sorted(values, sorted_values):
+    """Test which values are in a sorted array.
+
+    Unlike :func:`numpy.isin`, the sorted array is searched without sorting
+    it again, so this is fast for a few values and many sorted values.
+
+    :param values:  values to test
+    :type values:  numpy.ndarray
+    :param sorted_values:  sorted array to search
+    :type sorted_values:  numpy.ndarray
+    :return:  boolean array that is True for values in ``sorted_values``
+    :rtype:  numpy.ndarray
+    """
+    if len(sorted_values) == 0:
+        return np.zeros(values.shape, dtype=bool)
+    index = np.searchsorted(sorted_values, values)
+    index[index == len(sorted_values)] = 0
+    return sorted_values[index] == values
@@ -2,6 +2,8 @@
 
 import logging
 
+import numpy as np
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -31,9 +33,18 @@ class Cells:
         :param biomolecule:  biomolecule with atoms to assign to cells
         :type biomolecule:  Biomolecule
         """
-        for atom in biomolecule.atoms:
-            atom.cell = None
-            self.add_cell(atom)
+        atoms = biomolecule.atoms
+        coords = biomolecule.coordinates
+        size = self.cellsize
+        # Same as add_cell for all atoms at once
+        trunc = np.trunc(coords).astype(int)
+        keys = np.where(coords < 0, (trunc - 1) // size, trunc // size) * size
+        for atom, key in zip(atoms, map(tuple, keys.tolist()), strict=True):
+            try:
+                self.cellmap[key].append(atom)
+            except KeyError:
+                self.cellmap[key] = [atom]
+            atom.cell = key
 
     def add_cell(self, atom):
         """Add an atom to the cell.
@@ -10,14 +10,48 @@ This methods use the pdbx/cif parser provided by WWPDB
 import logging
 from datetime import datetime
 
-import pdbx
 from numpy import ceil, minimum
 
 from . import pdb
+from .utilities import lazy_import
+
+# pdbx is only loaded if CIF files are read
+pdbx = lazy_import("pdbx")
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _cif_value(value, default=""):
+    """Replace unknown (``?``) and inapplicable (``.``) CIF values.
+
+    :mod:`pdbx` reads these values as None and the empty string, respectively.
+
+    :param value:  CIF value
+    :type value:  str
+    :param default:  value for missing entries
+    :type default:  str
+    :return:  value or default
+    :rtype:  str
+    """
+    if value in (None, "", "?", "."):
+        return default
+    return value
+
+
+def _cif_charge(value):
+    """Convert a CIF formal charge to PDB format (e.g., ``-1`` to ``1-``).
+
+    :param value:  CIF ``pdbx_formal_charge`` value
+    :type value:  str
+    :return:  PDB-format charge or empty string if there is no charge
+    :rtype:  str
+    """
+    charge = int(_cif_value(value, "0"))
+    if charge == 0:
+        return ""
+    return f"{abs(charge)}{'+' if charge > 0 else '-'}"
+
+
 def atom_site(block):
     """Handle ATOM_SITE block.
 
@@ -26,347 +60,93 @@ def atom_site(block):
     atomic displacement parameters, magnetic moments and directions.
     (Source: https://j.mp/2Zprx41)
 
+    The category is read column-wise and :class:`pdb.ATOM` and
+    :class:`pdb.HETATM` objects are created directly from the values, so
+    chain IDs, atom names, and residue numbers that don't fit the PDB columns
+    are preserved.
+
     :param block:  PDBx data block
     :type block:  [str]
     :return:  (array of pdb.ATOM objects, array of things that weren't handled
         by parser)
     :rtype:  ([Atom], [str])
     """
-    line = 0
     pdb_arr = []
     err_arr = []
     atoms = block.get_object("atom_site")
-    num_model_arr = count_models(block)
-    if len(num_model_arr) == 1:
-        # TODO - this part of the conditional should be a separate function
-        for i in range(atoms.row_count):
-            if atoms.get_value("group_PDB", i) == "ATOM":
-                try:
-                    line = ""
-                    # 1  - 6 RECORD NAME (ATOM)
-                    line += atoms.get_value("group_PDB", i) + " " * (
-                        6 - len(atoms.get_value("group_PDB", i))
-                    )
-                    # 7  - 11 ATOM SERIAL
-                    line += " " * (
-                        5 - len(str(atoms.get_value("id", i)))
-                    ) + str(atoms.get_value("id", i))
-                    # 12 - 13
-                    line += "  "
-                    # 14 - 16 ATOM NAME
-                    line += atoms.get_value("label_atom_id", i) + " " * (
-                        3 - len(atoms.get_value("label_atom_id", i))
-                    )
-                    # 17 ALT LOCATION
-                    if atoms.get_value("label_alt_id", i) == ".":
-                        line += " "
-                    else:
-                        atoms.get_value("label_alt_id", i)
-                    # 18 - 20 RES NAME
-                    line += " " * (
-                        3 - len(atoms.get_value("label_comp_id", i))
-                    ) + atoms.get_value("label_comp_id", i)
-                    # 21
-                    line += " "
-                    # 22 CHAIN ID
-                    line += " " * (
-                        1 - len(atoms.get_value("label_asym_id", i))
-                    ) + atoms.get_value("label_asym_id", i)
-                    # 23 - 26 RES SEQ ID
-                    line += " " * (
-                        4 - len(str(atoms.get_value("auth_seq_id", i)))
-                    ) + str(atoms.get_value("auth_seq_id", i))
-                    # 27 - 30
-                    line += " " * 3
-                    # 31 - 38 X Coords
-                    line += " " * (
-                        8 - len(str(atoms.get_value("Cartn_x", i)))
-                    ) + str(atoms.get_value("Cartn_x", i))
-                    # 39 - 46 Y Coords
-                    line += " " * (
-                        8 - len(str(atoms.get_value("Cartn_y", i)))
-                    ) + str(atoms.get_value("Cartn_y", i))
-                    # 47 - 54 Z Coords
-                    line += " " * (
-                        8 - len(str(atoms.get_value("Cartn_z", i)))
-                    ) + str(atoms.get_value("Cartn_z", i))
-                    # 55 - 60 OCCUPANCY
-                    line += " " * (
-                        6 - len(str(atoms.get_value("occupancy", i)))
-                    ) + str(atoms.get_value("occupancy", i))
-                    # 61 - 66 TEMP FACTOR
-                    line += " " * (
-                        6 - len(str(atoms.get_value("B_iso_or_equiv", i)))
-                    ) + str(atoms.get_value("B_iso_or_equiv", i))
-                    # 67 - 76
-                    line += " " * 10
-                    # 77 - 78 ELEMENT SYMBOL
-                    line += " " * (
-                        2 - len(atoms.get_value("type_symbol", i))
-                    ) + atoms.get_value("type_symbol", i)
-                    # 79 - 80 CHARGE OF ATOM
-                    if atoms.get_value("pdbx_formal_charge", i) == "?":
-                        line += " " * 2
-                    else:
-                        atoms.get_value("pdbx_formal_charge", i)
-                    pdb_arr.append(pdb.ATOM(line))
-                except KeyError:
-                    _LOGGER.error(f"atom_site: Error reading line: #{line}#\n")
-            elif atoms.get_value("group_PDB", i) == "HETATM":
-                try:
-                    line = ""
-                    # 1  - 6 RECORD NAME (HETATM)
-                    line += atoms.get_value("group_PDB", i) + "" * (
-                        6 - len(atoms.get_value("group_PDB", i))
-                    )
-                    # 7  - 11 ATOM SERIAL
-                    line += " " * (
-                        5 - len(str(atoms.get_value("id", i)))
-                    ) + str(atoms.get_value("id", i))
-                    # 12 - 13
-                    line += "  "
-                    # 14 - 16 ATOM NAME
-                    line += atoms.get_value("label_atom_id", i) + " " * (
-                        3 - len(atoms.get_value("label_atom_id", i))
-                    )
-                    # 17 ALT LOCATION
-                    if atoms.get_value("label_alt_id", i) == ".":
-                        line += " "
-                    else:
-                        atoms.get_value("label_alt_id", i)
-                    # 18 - 20 RES NAME
-                    line += " " * (
-                        3 - len(atoms.get_value("label_comp_id", i))
-                    ) + atoms.get_value("label_comp_id", i)
-                    # 21
-                    line += " "
-                    # 22 CHAIN ID
-                    line += " " * (
-                        1 - len(atoms.get_value("label_asym_id", i))
-                    ) + atoms.get_value("label_asym_id", i)
-                    # 23 - 26 RES SEQ ID
-                    line += " " * (
-                        4 - len(str(atoms.get_value("auth_seq_id", i)))
-                    ) + str(atoms.get_value("auth_seq_id", i))
-                    # 27 - 30
-                    line += " " * 3
-                    # 31 - 38 X Coords
-                    line += " " * (
-                        8 - len(str(atoms.get_value("Cartn_x", i)))
-                    ) + str(atoms.get_value("Cartn_x", i))
-                    # 39 - 46 Y Coords
-                    line += " " * (
-                        8 - len(str(atoms.get_value("Cartn_y", i)))
-                    ) + str(atoms.get_value("Cartn_y", i))
-                    # 47 - 54 Z Coords
-                    line += " " * (
-                        8 - len(str(atoms.get_value("Cartn_z", i)))
-                    ) + str(atoms.get_value("Cartn_z", i))
-                    # 55 - 60 OCCUPANCY
-                    line += " " * (
-                        6 - len(str(atoms.get_value("occupancy", i)))
-                    ) + str(atoms.get_value("occupancy", i))
-                    # 61 - 66 TEMP FACTOR
-                    line += " " * (
-                        6 - len(str(atoms.get_value("B_iso_or_equiv", i)))
-                    ) + str(atoms.get_value("B_iso_or_equiv", i))
-                    # 67 - 76
-                    line += " " * (10)
-                    # 77 - 78 ELEMENT SYMBOL
-                    line += " " * (
-                        2 - len(atoms.get_value("type_symbol", i))
-                    ) + atoms.get_value("type_symbol", i)
-                    # 79 - 80 CHARGE OF ATOM
-                    if atoms.get_value("pdbx_formal_charge", i) == "?":
-                        line += " " * 2
-                    else:
-                        atoms.get_value("pdbx_formal_charge", i)
-                    pdb_arr.append(pdb.HETATM(line))
-                except KeyError:
-                    _LOGGER.error(f"atom_site: Error reading line:\n{line}")
+    klasses = {"ATOM": pdb.ATOM, "HETATM": pdb.HETATM}
+    num_rows = atoms.row_count
+    if num_rows == 0:
         return pdb_arr, err_arr
-    # TODO - Given the return statement above, is this "else" ever reached?
-    else:
-        # TODO - this part of the conditional should be a separate function
-        for j in num_model_arr:
-            try:
-                line = "MODEL "
-                line += " " * 4
-                line += " " * (4 - len(str(j))) + str(j)
-                pdb_arr.append(pdb.MODEL(line))
-            except ValueError:
-                _LOGGER.error(f"atom_site: Error readline line:\n{line}")
-                err_arr.append("MODEL")
-
-            for i in range(atoms.row_count):
-                if atoms.get_value("pdbx_PDB_model_num", i) == j:
-                    if atoms.get_value("group_PDB", i) == "ATOM":
-                        try:
-                            line = ""
-                            # 1  - 6 RECORD NAME (ATOM)
-                            line += atoms.get_value("group_PDB", i) + " " * (
-                                6 - len(atoms.get_value("group_PDB", i))
-                            )
-                            # 7  - 11 ATOM SERIAL
-                            line += " " * (
-                                5 - len(str(atoms.get_value("id", i)))
-                            ) + str(atoms.get_value("id", i))
-                            # 12 - 13
-                            line += "  "
-                            # 14 - 16 ATOM NAME
-                            line += atoms.get_value(
-                                "label_atom_id", i
-                            ) + " " * (
-                                3 - len(atoms.get_value("label_atom_id", i))
-                            )
-                            # 17 ALT LOCATION
-                            if atoms.get_value("label_alt_id", i) == ".":
-                                line += " "
-                            else:
-                                atoms.get_value("label_alt_id", i)
-                            # 18 - 20 RES NAME
-                            line += " " * (
-                                3 - len(atoms.get_value("label_comp_id", i))
-                            ) + atoms.get_value("label_comp_id", i)
-                            # 21
-                            line += " "
-                            # 22 CHAIN ID
-                            line += " " * (
-                                1 - len(atoms.get_value("label_asym_id", i))
-                            ) + atoms.get_value("label_asym_id", i)
-                            # 23 - 26 RES SEQ ID
-                            line += " " * (
-                                4 - len(str(atoms.get_value("auth_seq_id", i)))
-                            ) + str(atoms.get_value("auth_seq_id", i))
-                            # 27 - 30
-                            line += " " * 3
-                            # 31 - 38 X Coords
-                            line += " " * (
-                                8 - len(str(atoms.get_value("Cartn_x", i)))
-                            ) + str(atoms.get_value("Cartn_x", i))
-                            # 39 - 46 Y Coords
-                            line += " " * (
-                                8 - len(str(atoms.get_value("Cartn_y", i)))
-                            ) + str(atoms.get_value("Cartn_y", i))
-                            # 47 - 54 Z Coords
-                            line += " " * (
-                                8 - len(str(atoms.get_value("Cartn_z", i)))
-                            ) + str(atoms.get_value("Cartn_z", i))
-                            # 55 - 60 OCCUPANCY
-                            line += " " * (
-                                6 - len(str(atoms.get_value("occupancy", i)))
-                            ) + str(atoms.get_value("occupancy", i))
-                            # 61 - 66 TEMP FACTOR
-                            line += " " * (
-                                6
-                                - len(
-                                    str(atoms.get_value("B_iso_or_equiv", i))
-                                )
-                            ) + str(atoms.get_value("B_iso_or_equiv", i))
-                            # 67 - 76
-                            line += " " * 10
-                            # 77 - 78 ELEMENT SYMBOL
-                            line += " " * (
-                                2 - len(atoms.get_value("type_symbol", i))
-                            ) + atoms.get_value("type_symbol", i)
-                            # 79 - 80 CHARGE OF ATOM
-                            if atoms.get_value("pdbx_formal_charge", i) == "?":
-                                line += " " * 2
-                            else:
-                                atoms.get_value("pdbx_formal_charge", i)
-                            pdb_arr.append(pdb.ATOM(line))
-                        except KeyError:
-                            _LOGGER.error(
-                                f"atom_site: Error reading line:\n{line}"
-                            )
-                            err_arr.append("ATOM")
-                    elif atoms.get_value("group_PDB", i) == "HETATM":
-                        try:
-                            line = ""
-                            # 1  - 6 RECORD NAME (HETATM)
-                            line += atoms.get_value("group_PDB", i) + "" * (
-                                6 - len(atoms.get_value("group_PDB", i))
-                            )
-                            # 7  - 11 ATOM SERIAL
-                            line += " " * (
-                                5 - len(str(atoms.get_value("id", i)))
-                            ) + str(atoms.get_value("id", i))
-                            # 12 - 13
-                            line += "  "
-                            # 14 - 16 ATOM NAME
-                            line += atoms.get_value(
-                                "label_atom_id", i
-                            ) + " " * (
-                                3 - len(atoms.get_value("label_atom_id", i))
-                            )
-                            # 17      ALT LOCATION
-                            if atoms.get_value("label_alt_id", i) == ".":
-                                line += " "
-                            else:
-                                atoms.get_value("label_alt_id", i)
-                            # 18 - 20 RES NAME
-                            line += " " * (
-                                3 - len(atoms.get_value("label_comp_id", i))
-                            ) + atoms.get_value("label_comp_id", i)
-                            # 21
-                            line += " "
-                            # 22      CHAIN ID
-                            line += " " * (
-                                1 - len(atoms.get_value("label_asym_id", i))
-                            ) + atoms.get_value("label_asym_id", i)
-                            # 23 - 26 RES SEQ ID
-                            line += " " * (
-                                4 - len(str(atoms.get_value("auth_seq_id", i)))
-                            ) + str(atoms.get_value("auth_seq_id", i))
-                            # 27 - 30
-                            line += " " * 3
-                            # 31 - 38 X Coords
-                            line += " " * (
-                                8 - len(str(atoms.get_value("Cartn_x", i)))
-                            ) + str(atoms.get_value("Cartn_x", i))
-                            # 39 - 46 Y Coords
-                            line += " " * (
-                                8 - len(str(atoms.get_value("Cartn_y", i)))
-                            ) + str(atoms.get_value("Cartn_y", i))
-                            # 47 - 54 Z Coords
-                            line += " " * (
-                                8 - len(str(atoms.get_value("Cartn_z", i)))
-                            ) + str(atoms.get_value("Cartn_z", i))
-                            # 55 - 60 OCCUPANCY
-                            line += " " * (
-                                6 - len(str(atoms.get_value("occupancy", i)))
-                            ) + str(atoms.get_value("occupancy", i))
-                            # 61 - 66 TEMP FACTOR
-                            line += " " * (
-                                6
-                                - len(
-                                    str(atoms.get_value("B_iso_or_equiv", i))
-                                )
-                            ) + str(atoms.get_value("B_iso_or_equiv", i))
-                            # 67 - 76
-                            line += " " * 10
-                            # 77 - 78 ELEMENT SYMBOL
-                            line += " " * (
-                                2 - len(atoms.get_value("type_symbol", i))
-                            ) + atoms.get_value("type_symbol", i)
-                            # 79 - 80 CHARGE OF ATOM
-                            if atoms.get_value("pdbx_formal_charge", i) == "?":
-                                line += " " * 2
-                            else:
-                                atoms.get_value("pdbx_formal_charge", i)
-                            pdb_arr.append(pdb.HETATM(line))
-                        except KeyError:
-                            _LOGGER.error(
-                                f"atom_site: Error reading line:\n{line}"
-                            )
-                            err_arr.append("HETATOM")
-            try:
-                line = "ENDMDL"
-                pdb_arr.append(pdb.ENDMDL(line))
-            except KeyError:
-                _LOGGER.error(f"atom_site: Error reading line:\n{line}")
-                err_arr.append("ENDMDL")
+    columns = list(zip(*atoms.row_list, strict=True))
+
+    def column(name, default="."):
+        """Return a whole column, or a column of defaults if missing."""
+        if atoms.has_attribute(name):
+            return columns[atoms.get_attribute_index(name)]
+        return (default,) * num_rows
+
+    rows = zip(
+        column("group_PDB"),
+        column("id"),
+        column("label_atom_id"),
+        column("label_alt_id"),
+        column("label_comp_id"),
+        column("label_asym_id"),
+        column("auth_seq_id"),
+        column("pdbx_PDB_ins_code"),
+        column("Cartn_x"),
+        column("Cartn_y"),
+        column("Cartn_z"),
+        column("occupancy"),
+        column("B_iso_or_equiv"),
+        column("type_symbol"),
+        column("pdbx_formal_charge"),
+        column("pdbx_PDB_model_num", "1"),
+        strict=True,
+    )
+    models = {}
+    for row in rows:
+        group = row[0]
+        if group not in klasses:
+            continue
+        try:
+            record = klasses[group].from_fields(
+                serial=int(row[1]),
+                name=row[2],
+                alt_loc=_cif_value(row[3]),
+                res_name=row[4],
+                chain_id=_cif_value(row[5]),
+                res_seq=int(row[6]),
+                ins_code=_cif_value(row[7]),
+                x=float(row[8]),
+                y=float(row[9]),
+                z=float(row[10]),
+                occupancy=float(_cif_value(row[11], "0")),
+                temp_factor=float(_cif_value(row[12], "0")),
+                element=_cif_value(row[13]),
+                charge=_cif_charge(row[14]),
+            )
+        except (TypeError, ValueError) as error:
+            # Unknown values (e.g., a ``?`` residue number) are read as None
+            _LOGGER.error(f"atom_site: Error reading row: {row}: {error}")
+            err_arr.append(group)
+            continue
+        models.setdefault(row[15], []).append(record)
+    if len(models) <= 1:
+        for records in models.values():
+            pdb_arr += records
         return pdb_arr, err_arr
+    for model_num, records in models.items():
+        line = f"MODEL     {model_num:>4}"
+        try:
+            pdb_arr.append(pdb.MODEL(line))
+        except ValueError:
+            _LOGGER.error(f"atom_site: Error reading line:\n{line}")
+            err_arr.append("MODEL")
+        pdb_arr += records
+        pdb_arr.append(pdb.ENDMDL("ENDMDL"))
+    return pdb_arr, err_arr
 
 
 def conect(block):
@@ -1002,23 +782,6 @@ def ssbond(block):
     return ssb_arr, ssb_err
 
 
-def count_models(block):
-    """Count models in structure file block.
-
-    :param block:  PDBx data block
-    :type block:  [str]
-    :return:  number of models in block
-    :rtype:  int
-    """
-    atom_obj = block.get_object("atom_site")
-    model_num = []
-    for i in range(atom_obj.row_count):
-        tmp = atom_obj.get_value("pdbx_PDB_model_num", i)
-        if tmp not in model_num:
-            model_num.append(tmp)
-    return model_num
-
-
 def read_cif(cif_file):
     """Parse CIF-format data into array of Atom objects.
 
@@ -187,3 +187,28 @@ BOLTZMANN = 1.380649e-23
 
 #: Charge deviation considered to be non-integer
 CHARGE_ERROR = 1e-3
+
+#: Base URL for downloading structures by ID (can be replaced with a mirror)
+RCSB_URL = "https://files.rcsb.org/download"
+
+#: Maximum size (in bytes) of the downloaded structure cache
+CACHE_MAX_BYTES = 2**30
+
+#: Format of cached topology definitions (increase when the pickled classes
+#: change so old caches are not used)
+DEFINITION_CACHE_FORMAT = 5
+
+#: Number of concurrent downloads when prefetching structures
+FETCH_WORKERS = 8
+
+#: Number of times to retry failed downloads
+FETCH_RETRIES = 3
+
+#: Timeout (in seconds) for downloads
+FETCH_TIMEOUT = 60
+
+#: Number of lines joined into each write when writing output files
+WRITE_CHUNK_LINES = 8192
+
+#: Number of lines parsed at a time when reading DX data values
+DX_CHUNK_LINES = 65536
@@ -8,6 +8,8 @@
 
 import logging
 
+import numpy as np
+
 from . import aa, cells, io
 from . import quatfit as quat
 from . import utilities as util
@@ -96,12 +98,9 @@ class Debump:
         closeatoms = self.cells.get_near_cells(atom)
         # Loop through and see if any are within the cutoff
         bumpscore = 0.0
+        candidates = []
         for closeatom in closeatoms:
             closeresidue = closeatom.residue
-            if closeresidue == residue and (
-                closeatom in atom.bonds or atom in closeatom.bonds
-            ):
-                continue
             if not isinstance(closeresidue, aa.Amino):
                 continue
             if (
@@ -123,7 +122,12 @@ class Debump:
                 and atom.hacceptor
             ):
                 continue
-            dist = util.distance(atom.coords, closeatom.coords)
+            candidates.append(closeatom)
+        candidates = self.exclude_bonded(atom, candidates)
+        dists = util.distances(
+            atom.coords, [closeatom.coords for closeatom in candidates]
+        )
+        for closeatom, dist in zip(candidates, dists.tolist(), strict=True):
             other_size = (
                 BUMP_HYDROGEN_SIZE
                 if closeatom.is_hydrogen
@@ -297,6 +301,36 @@ class Debump:
         # If we're here, debumping was unsuccessful
         return False
 
+    def exclude_bonded(self, atom, closeatoms):
+        """Remove the atoms in the same residue that are bonded to an atom.
+
+        Bonded atoms are close by construction, so they are not conflicts.
+
+        :param atom:  the atom to test
+        :type atom:  Atom
+        :param closeatoms:  nearby atoms
+        :type closeatoms:  [Atom]
+        :return:  nearby atoms that are not bonded to the atom
+        :rtype:  [Atom]
+        """
+        residue = atom.residue
+        same = [
+            index
+            for index, closeatom in enumerate(closeatoms)
+            if closeatom.residue == residue
+        ]
+        if not same:
+            return closeatoms
+        bonded = self.biomolecule.bond_graph.excluded_mask(
+            atom.id, [closeatoms[index].id for index in same]
+        )
+        excluded = {same[index] for index in np.flatnonzero(bonded)}
+        return [
+            closeatom
+            for index, closeatom in enumerate(closeatoms)
+            if index not in excluded
+        ]
+
     def get_closest_atom(self, atom):
         """Get the closest atom that does not form a donor/acceptor pair.
 
@@ -315,6 +349,7 @@ class Debump:
         bestwatdist = 999.99
         bestatom = None
         bestwatatom = None
+        candidates = []
         residue = atom.residue
         # Get atoms from nearby cells
         closeatoms = self.cells.get_near_cells(atom)
@@ -343,8 +378,12 @@ class Debump:
                 and atom.hacceptor
             ):
                 continue
-            dist = util.distance(atom.coords, closeatom.coords)
-            if isinstance(closeresidue, aa.WAT):
+            candidates.append(closeatom)
+        dists = util.distances(
+            atom.coords, [closeatom.coords for closeatom in candidates]
+        )
+        for closeatom, dist in zip(candidates, dists.tolist(), strict=True):
+            if isinstance(closeatom.residue, aa.WAT):
                 if dist < bestwatdist:
                     bestwatdist = dist
                     bestwatatom = closeatom
@@ -378,6 +417,7 @@ class Debump:
         """
         # Initialize some variables
         nearatoms = {}
+        candidates = []
         residue = atom.residue
         atom_size = BUMP_HYDROGEN_SIZE if atom.is_hydrogen else BUMP_HEAVY_SIZE
         # Get atoms from nearby cells
@@ -385,10 +425,6 @@ class Debump:
         # Loop through and see if any are within the cutoff
         for closeatom in closeatoms:
             closeresidue = closeatom.residue
-            if closeresidue == residue and (
-                closeatom in atom.bonds or atom in closeatom.bonds
-            ):
-                continue
             if not isinstance(closeresidue, (aa.Amino, aa.WAT)):
                 continue
             if (
@@ -411,7 +447,12 @@ class Debump:
                 and atom.hacceptor
             ):
                 continue
-            dist = util.distance(atom.coords, closeatom.coords)
+            candidates.append(closeatom)
+        candidates = self.exclude_bonded(atom, candidates)
+        dists = util.distances(
+            atom.coords, [closeatom.coords for closeatom in candidates]
+        )
+        for closeatom, dist in zip(candidates, dists.tolist(), strict=True):
             other_size = (
                 BUMP_HYDROGEN_SIZE
                 if closeatom.is_hydrogen
@@ -8,8 +8,11 @@
 import copy
 import logging
 import re
+from collections.abc import MutableMapping
 from xml import sax
 
+import numpy as np
+
 from . import residue, structures
 
 _LOGGER = logging.getLogger(__name__)
@@ -142,7 +145,7 @@ class Definition:
         :param patch_file:  file-like object with patch definitions
         :type patch_file:  file
         """
-        self.map = {}
+        self.map = DefinitionMap()
         self.patches = {}
         handler = DefinitionHandler()
         sax.make_parser()
@@ -156,10 +159,10 @@ class Definition:
         for patch in handler.patches:
             if patch.newname != "":
                 # Find all residues matching applyto
+                applyto = re.compile(patch.applyto)
                 resnames = list(self.map.keys())
                 for name in resnames:
-                    regexp = re.compile(patch.applyto).match(name)
-                    if not regexp:
+                    if not applyto.match(name):
                         continue
                     newname = patch.newname.replace("*", name)
                     self.add_patch(patch, name, newname)
@@ -169,6 +172,9 @@ class Definition:
     def add_patch(self, patch, refname, newname):
         """Add a patch to a topology definition residue.
 
+        The patched residue is only built when it is first used (see
+        :class:`DefinitionMap`).
+
         :param patch:  the patch object to add
         :type patch:  Patch
         :param refname:  the name of the object to add the patch to
@@ -176,38 +182,129 @@ class Definition:
         :param newname:  the name of the new (patched) object
         :type newname:  str
         """
-        try:
-            aadef = self.map[refname]  # The reference
-            patch_residue = copy.deepcopy(aadef)
-            # Add atoms from patch
-            for atomname in patch.map:
-                patch_residue.map[atomname] = patch.map[atomname]
-                for bond in patch.map[atomname].bonds:
-                    if bond not in patch_residue.map:
-                        continue
-                    if atomname not in patch_residue.map[bond].bonds:
-                        patch_residue.map[bond].bonds.append(atomname)
-            # Rename atoms as directed
-            for key in patch.altnames:
-                patch_residue.altnames[key] = patch.altnames[key]
-            # Remove atoms as directed
-            for remove in patch.remove:
-                if not patch_residue.has_atom(remove):
+        # Point at the new reference (if there is one to patch)
+        self.map.add_patch(patch, refname, newname)
+        # Store the patch
+        self.patches[newname] = patch
+
+
+class PatchedResidue:
+    """A patched topology definition residue that is built on first use."""
+
+    def __init__(self, patch, base):
+        """Initialize object.
+
+        :param patch:  the patch to apply
+        :type patch:  Patch
+        :param base:  the residue to patch
+        :type base:  DefinitionResidue or PatchedResidue
+        """
+        self.patch = patch
+        self.base = base
+        self.residue = None
+
+    def build(self):
+        """Build the patched residue (once).
+
+        :return:  patched residue
+        :rtype:  DefinitionResidue
+        """
+        if self.residue is not None:
+            return self.residue
+        base = self.base
+        if isinstance(base, PatchedResidue):
+            base = base.build()
+        patch = self.patch
+        patch_residue = copy.deepcopy(base)
+        # Add atoms from patch
+        for atomname in patch.map:
+            patch_residue.map[atomname] = patch.map[atomname]
+            for bond in patch.map[atomname].bonds:
+                if bond not in patch_residue.map:
                     continue
-                removebonds = patch_residue.map[remove].bonds
-                del patch_residue.map[remove]
-                for bond in removebonds:
-                    if remove in patch_residue.map[bond].bonds:
-                        patch_residue.map[bond].bonds.remove(remove)
-            # Add the new dihedrals
-            for dihedral in patch.dihedrals:
-                patch_residue.dihedrals.append(dihedral)
-            # Point at the new reference
-            self.map[newname] = patch_residue
-            # Store the patch
-            self.patches[newname] = patch
-        except KeyError:  # Just store the patch
-            self.patches[newname] = patch
+                if atomname not in patch_residue.map[bond].bonds:
+                    patch_residue.map[bond].bonds.append(atomname)
+        # Rename atoms as directed
+        for key in patch.altnames:
+            patch_residue.altnames[key] = patch.altnames[key]
+        # Remove atoms as directed
+        for remove in patch.remove:
+            if not patch_residue.has_atom(remove):
+                continue
+            removebonds = patch_residue.map[remove].bonds
+            del patch_residue.map[remove]
+            for bond in removebonds:
+                if remove in patch_residue.map[bond].bonds:
+                    patch_residue.map[bond].bonds.remove(remove)
+        # Add the new dihedrals
+        for dihedral in patch.dihedrals:
+            patch_residue.dihedrals.append(dihedral)
+        self.residue = patch_residue
+        self.base = None
+        return patch_residue
+
+
+class DefinitionMap(MutableMapping):
+    """Topology definition residues indexed by name.
+
+    Patched residues are recorded by :meth:`add_patch` and only built (and
+    then kept) when they are first looked up, so the many patch and residue
+    combinations that a structure never uses cost almost nothing.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def __getitem__(self, name):
+        entry = self._entries[name]
+        if isinstance(entry, PatchedResidue):
+            entry = entry.build()
+            self._entries[name] = entry
+        return entry
+
+    def __setitem__(self, name, residue):
+        self._entries[name] = residue
+
+    def __delitem__(self, name):
+        del self._entries[name]
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def add_patch(self, patch, refname, newname):
+        """Record a patched residue.
+
+        :param patch:  the patch to apply
+        :type patch:  Patch
+        :param refname:  the name of the residue to patch
+        :type refname:  str
+        :param newname:  the name of the patched residue
+        :type newname:  str
+        :return:  whether a residue named ``refname`` exists to be patched
+        :rtype:  bool
+        """
+        base = self._entries.get(refname)
+        if base is None:
+            return False
+        self._entries[newname] = PatchedResidue(patch, base)
+        return True
+
+    @property
+    def num_built(self):
+        """Number of residues that have been built.
+
+        :rtype:  int
+        """
+        return sum(
+            not isinstance(entry, PatchedResidue)
+            for entry in self._entries.values()
+        )
 
 
 class Patch:
@@ -244,6 +341,8 @@ class DefinitionResidue(residue.Residue):
         self.dihedrals = []
         self.map = {}
         self.altnames = {}
+        self.biomolecule = None
+        self._charge = None
 
     def __str__(self):
         text = f"{self.name}\n"
@@ -301,6 +400,8 @@ class DefinitionAtom(structures.Atom):
         :param z:  z-coordinate
         :type z:  float
         """
+        self._coords = np.zeros((1, 3))
+        self._row = 0
         self.name = name
         self.x = x
         self.y = y
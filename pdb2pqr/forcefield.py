@@ -7,11 +7,12 @@ forcefield is considered a chain of residues of atoms.
 .. codeauthor::  Yong Huang
 """
 
+import hashlib
 import logging
 import re
 from xml import sax
 
-from . import io
+from . import aa, io, na
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -74,12 +75,12 @@ class ForcefieldHandler(sax.ContentHandler):
         :rtype:  [re.Match]
         """
         name_list = []
-        regname += "$"
+        regexp = re.compile(regname + "$")
         # Find the existing items that match this string
         for name in map_:
-            regexp = re.compile(regname).match(name)
-            if regexp:
-                name_list.append(regexp)
+            match = regexp.match(name)
+            if match:
+                name_list.append(match)
         return name_list
 
     def startElement(self, name, _):
@@ -160,6 +161,101 @@ class ForcefieldHandler(sax.ContentHandler):
             self.oldresname = text
 
 
+#: Compiled forcefield parameter maps shared by :class:`Forcefield` objects
+_COMPILED_FORCEFIELDS = {}
+
+
+def read_dat(ff_text, ff_path=""):
+    """Read forcefield parameters from DAT-format text.
+
+    :param ff_text:  contents of DAT-format forcefield file
+    :type ff_text:  str
+    :param ff_path:  path to forcefield file (for error messages)
+    :type ff_path:  str
+    :return:  dictionary of residue names and :class:`ForcefieldResidue`
+        objects
+    :rtype:  dict
+    :raises ValueError:  if the file format is not recognized
+    """
+    map_ = {}
+    for line in ff_text.splitlines():
+        if line.startswith("#"):
+            continue
+        fields = line.split()
+        if fields == []:
+            continue
+        try:
+            resname = fields[0]
+            atomname = fields[1]
+            charge = float(fields[2])
+            radius = float(fields[3])
+        except ValueError:
+            txt = "Unable to recognize user-defined forcefield file"
+            txt += f" {ff_path}!" if ff_path != "" else "!"
+            txt += " Please use a valid parameter file."
+            raise ValueError(txt)
+        try:
+            group = fields[4]
+            atom = ForcefieldAtom(atomname, charge, radius, resname, group)
+        except IndexError:
+            atom = ForcefieldAtom(atomname, charge, radius, resname)
+        my_residue = map_.get(resname)
+        if my_residue is None:
+            my_residue = ForcefieldResidue(resname)
+            map_[resname] = my_residue
+        my_residue.add_atom(atom)
+    return map_
+
+
+def compile_forcefield(ff_path, names_path, reference):
+    """Build the parameter map and lookup index for a forcefield.
+
+    The DAT-format parameters are merged with the ``.names`` aliases into a
+    single map of residue names to :class:`ForcefieldResidue` objects and a
+    flat index of ``(residue name, atom name)`` pairs to
+    :class:`ForcefieldAtom` objects.  Compiled forcefields are cached by the
+    contents of both files and the residue names of the reference
+    definitions, so the files are only parsed once per process.  The
+    returned map and index are shared and must not be modified.
+
+    :param ff_path:  path to DAT-format forcefield file
+    :type ff_path:  str
+    :param names_path:  path to XML-format ``.names`` file
+    :type names_path:  str
+    :param reference:  reference map of topology definitions
+    :type reference:  dict
+    :return:  (dictionary of residue names and :class:`ForcefieldResidue`
+        objects, dictionary of residue and atom names and
+        :class:`ForcefieldAtom` objects)
+    :rtype:  (dict, dict)
+    :raises ValueError:  if the forcefield file format is not recognized
+    """
+    with open(ff_path, "rb") as ff_file:
+        ff_data = ff_file.read()
+    with open(names_path, "rb") as names_file:
+        names_data = names_file.read()
+    key = (
+        hashlib.sha256(ff_data).hexdigest(),
+        hashlib.sha256(names_data).hexdigest(),
+        tuple(sorted(reference)),
+    )
+    compiled = _COMPILED_FORCEFIELDS.get(key)
+    if compiled is None:
+        map_ = read_dat(ff_data.decode("utf-8"), str(ff_path))
+        handler = ForcefieldHandler(map_, reference)
+        sax.parseString(names_data, handler)
+        index = {
+            (resname, atomname): atom
+            for resname, residue in map_.items()
+            for atomname, atom in residue.atoms.items()
+        }
+        compiled = map_, index
+        _COMPILED_FORCEFIELDS[key] = compiled
+    else:
+        _LOGGER.debug(f"Using compiled forcefield parameters for {ff_path}")
+    return compiled
+
+
 class Forcefield:
     """Parameter definitions for a given forcefield.
 
@@ -190,60 +286,23 @@ class Forcefield:
         :type usernames:  str
         :raises ValueError:  if invalid force field names specified
         """
-        self.map = {}
         self.name = str(ff_name)
-        defpath = ""
         defpath = io.test_dat_file(ff_name) if userff is None else userff
-        with open(defpath, encoding="utf-8") as ff_file:
-            lines = ff_file.readlines()
-            for line in lines:
-                if not line.startswith("#"):
-                    fields = line.split()
-                    if fields == []:
-                        continue
-                    try:
-                        resname = fields[0]
-                        atomname = fields[1]
-                        charge = float(fields[2])
-                        radius = float(fields[3])
-                    except ValueError:
-                        txt = (
-                            "Unable to recognize user-defined forcefield file"
-                        )
-                        txt += f" {defpath}!" if defpath != "" else "!"
-                        txt += " Please use a valid parameter file."
-                        raise ValueError(txt)
-                    try:
-                        group = fields[4]
-                        atom = ForcefieldAtom(
-                            atomname, charge, radius, resname, group
-                        )
-                    except IndexError:
-                        atom = ForcefieldAtom(
-                            atomname, charge, radius, resname
-                        )
-
-                    my_residue = self.get_residue(resname)
-                    if my_residue is None:
-                        my_residue = ForcefieldResidue(resname)
-                        self.map[resname] = my_residue
-                    my_residue.add_atom(atom)
-        # Now parse the XML file, associating with FF objects -
+        # Now find the XML file, associating with FF objects -
         # This is not necessary (if canonical names match ff names)
         try:
-            defpath = io.test_names_file(ff_name)
+            namespath = io.test_names_file(ff_name)
         except FileNotFoundError:
-            defpath = None
+            namespath = None
         if usernames:
             names_path = usernames
-        elif defpath:
-            names_path = defpath
+        elif namespath:
+            names_path = namespath
         else:
             raise ValueError("Unable to identify .names file.")
-        handler = ForcefieldHandler(self.map, definition.map)
-        sax.make_parser()
-        with open(names_path, encoding="utf-8") as namesfile:
-            sax.parseString(namesfile.read(), handler)
+        self.map, self.index = compile_forcefield(
+            defpath, names_path, definition.map
+        )
 
     def has_residue(self, resname):
         """Check if the residue name is in the map or not.
@@ -281,15 +340,10 @@ class Forcefield:
             this atom)
         :rtype:  (str, str)
         """
-        rname = None
-        aname = None
-        if resname in self.map:
-            res = self.map[resname]
-            if res.has_atom(atomname):
-                atom = res.atoms[atomname]
-                aname = atom.name
-                rname = atom.resname
-        return rname, aname
+        atom = self.index.get((resname, atomname))
+        if atom is None:
+            return None, None
+        return atom.resname, atom.name
 
     def get_group(self, resname, atomname):
         """Get the group/type associated with the input fields.
@@ -301,13 +355,10 @@ class Forcefield:
         :return:  group name or empty string
         :rtype:  str
         """
-        group = ""
-        if resname in self.map:
-            resid = self.map[resname]
-            if resid.has_atom(atomname):
-                atom = resid.atoms[atomname]
-                group = atom.group
-        return group
+        atom = self.index.get((resname, atomname))
+        if atom is None:
+            return ""
+        return atom.group
 
     def get_params(self, resname, atomname):
         """Get the charge and radius parameters for an atom in a residue.
@@ -326,15 +377,37 @@ class Forcefield:
         :return:  (charge of the atom, radius of the atom)
         :rtype:  (float, float)
         """
-        charge = None
-        radius = None
-        if resname in self.map:
-            resid = self.map[resname]
-            if resid.has_atom(atomname):
-                atom = resid.atoms[atomname]
-                charge = atom.charge
-                radius = atom.radius
-        return charge, radius
+        atom = self.index.get((resname, atomname))
+        if atom is None:
+            return None, None
+        return atom.charge, atom.radius
+
+    def assign(self, biomolecule):
+        """Assign charges and radii to all atoms in a biomolecule.
+
+        :param biomolecule:  biomolecule with atoms to assign
+        :type biomolecule:  Biomolecule
+        :return:  (list of atoms that were found in the forcefield,
+            list of atoms that were not found in the forcefield)
+        :rtype:  (list, list)
+        """
+        index = self.index
+        hitlist = []
+        misslist = []
+        for residue in biomolecule.residues:
+            if isinstance(residue, (aa.Amino, aa.WAT, na.Nucleic)):
+                resname = residue.ffname
+            else:
+                resname = residue.name
+            for atom in residue.atoms:
+                ffatom = index.get((resname, atom.name))
+                if ffatom is None:
+                    misslist.append(atom)
+                else:
+                    atom.ffcharge = ffatom.charge
+                    atom.radius = ffatom.radius
+                    hitlist.append(atom)
+        return hitlist, misslist
 
     def get_params1(self, residue, name):
         """Get the charge and radius parameters for an atom in a residue.
@@ -366,10 +439,7 @@ class Forcefield:
         else:
             resname = residue.name
             atomname = name
-        defresidue = self.get_residue(resname)
-        if defresidue is None:
-            return charge, radius
-        atom = defresidue.get_atom(atomname)
+        atom = self.index.get((resname, atomname))
         if atom is not None:
             charge = atom.charge
             radius = atom.radius
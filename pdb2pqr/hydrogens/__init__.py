@@ -12,6 +12,7 @@ This is an module for hydrogen optimization routines.
 """
 
 __author__ = "Todd Dolinsky, Jens Erik Nielsen, Yong Huang, Nathan Baker"
+import hashlib
 import logging
 from xml import sax
 
@@ -64,19 +65,42 @@ TITRATION_DICT = {
 }
 
 
+#: Hydrogen definition names for terminal patches (see
+#: :meth:`HydrogenRoutines.residue_types`)
+TERMINAL_DEFINITIONS = {
+    "NTERM": "NTR",
+    "NEUTRAL-NTERM": "NTR",
+    "CTERM": "CTR",
+    "NEUTRAL-CTERM": "CTR",
+}
+
+
+#: Hydrogen handlers created by :func:`create_handler`, indexed by the
+#: SHA-256 hash of the definition file
+_HANDLERS = {}
+
+
 def create_handler(hyd_path=HYD_DEF_PATH):
     """Create and populate a hydrogen handler.
 
+    Handlers are cached by the contents of the definition file so the file
+    is only parsed once per process.  The returned handler is shared and
+    must not be modified.
+
     :param hyd_def_file:  path to hydrogen definition file
     :type hyd_def_file:  string or pathlib.Path object
     :return: HydrogenHandler object
     :rtype: HydrogenHandler
     """
-    handler = HydrogenHandler()
     hyd_path = io.test_dat_file(hyd_path)
-    with open(hyd_path) as hyd_file:
-        sax.make_parser()
-        sax.parseString(hyd_file.read(), handler)
+    with open(hyd_path, "rb") as hyd_file:
+        hyd_data = hyd_file.read()
+    key = hashlib.sha256(hyd_data).hexdigest()
+    handler = _HANDLERS.get(key)
+    if handler is None:
+        handler = HydrogenHandler()
+        sax.parseString(hyd_data, handler)
+        _HANDLERS[key] = handler
     return handler
 
 
@@ -90,6 +114,9 @@ class HydrogenRoutines:
     def __init__(self, debumper, handler):
         """Initialize object.
 
+        Only the hydrogen definitions for residue types that are present in
+        the biomolecule (see :meth:`residue_types`) are kept.
+
         :param debumper:  Debump object
         :type debumper:  debump.Debump
         :param handler:  HydrogenHandler object
@@ -101,7 +128,32 @@ class HydrogenRoutines:
         self.atomlist = []
         self.resmap = {}
         self.hydrodefs = []
-        self.map = handler.map
+        residue_types = self.residue_types()
+        self.map = {
+            name: holder
+            for name, holder in handler.map.items()
+            if name in residue_types
+        }
+
+    def residue_types(self):
+        """Get the names of the residue types in the biomolecule.
+
+        These are the names that :meth:`is_optimizeable` looks up:  residue
+        names, reference names, and patches.  Terminal patches are given by
+        their hydrogen definition names (``NTR`` and ``CTR``).
+
+        :return:  set of residue type names
+        :rtype:  set
+        """
+        names = set()
+        for residue in self.biomolecule.residues:
+            names.add(residue.name)
+            reference = getattr(residue, "reference", None)
+            if reference is not None:
+                names.add(reference.name)
+            for patch in getattr(residue, "patches", []):
+                names.add(TERMINAL_DEFINITIONS.get(patch, patch))
+        return names
 
     def switchstate(self, states, amb, state_id):
         """Switch a residue to a new state by first removing all hydrogens.
@@ -842,14 +894,12 @@ class HydrogenRoutines:
         return mydef
 
     def read_hydrogen_def(self, topo):
-        """Read the hydrogen definition file
+        """Read the hydrogen definitions for residues in the biomolecule.
+
+        Definitions are only built for the residue types that are present
+        in the biomolecule (see :meth:`residue_types`).
 
         :param topo:  Topology object
         :type topo:  Topology object
         """
-        self.hydrodefs = []
-        for mapping in self.map:
-            res = mapping
-            mydef = self.parse_hydrogen(res, topo)
-            self.hydrodefs.append(mydef)
-            res = ""
+        self.hydrodefs = [self.parse_hydrogen(res, topo) for res in self.map]
@@ -196,10 +196,7 @@ class Optimize:
         newatom = residue.get_atom(addname)
         self.routines.cells.add_cell(newatom)
         # Set the bonds (since not in reference structure)
-        if newatom not in atom.bonds:
-            atom.bonds.append(newatom)
-        if atom not in newatom.bonds:
-            newatom.bonds.append(atom)
+        atom.connect(newatom)
 
     @classmethod
     def make_water_with_one_bond(cls, atom, addname):
@@ -230,10 +227,7 @@ class Optimize:
 
         # Set the bonds (since not in reference structure)
         newatom = residue.get_atom(addname)
-        if newatom not in atom.bonds:
-            atom.bonds.append(newatom)
-        if atom not in newatom.bonds:
-            newatom.bonds.append(atom)
+        atom.connect(newatom)
 
     @classmethod
     def make_atom_with_one_bond_h(cls, atom, addname):
@@ -290,10 +284,7 @@ class Optimize:
         residue.create_atom(addname, newcoords)
         # Set the bonds (since not in reference structure)
         newatom = residue.get_atom(addname)
-        if newatom not in atom.bonds:
-            atom.bonds.append(newatom)
-        if atom not in newatom.bonds:
-            newatom.bonds.append(atom)
+        atom.connect(newatom)
 
     def try_single_alcoholic_h(self, donor, acc, newatom):
         """Attempt to add an atom to make a hydrogen bond.
@@ -532,10 +523,7 @@ class Optimize:
         newatom.z = bestcoords[2]
         self.routines.cells.add_cell(newatom)
         # Set the bonds (since not in reference structure)
-        if newatom not in acc.bonds:
-            acc.bonds.append(newatom)
-        if acc not in newatom.bonds:
-            newatom.bonds.append(acc)
+        acc.connect(newatom)
         return True
 
     @classmethod
@@ -633,10 +621,7 @@ class Optimize:
         newatom = residue.get_atom(newname)
         self.routines.cells.add_cell(newatom)
         # Set the bonds (since not in reference structure)
-        if newatom not in acc.bonds:
-            acc.bonds.append(newatom)
-        if acc not in newatom.bonds:
-            newatom.bonds.append(acc)
+        acc.connect(newatom)
         return True
 
 
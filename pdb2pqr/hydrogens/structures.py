@@ -68,18 +68,12 @@ class Flip(optimize.Optimize):
                 newbond = f"{bond}FLIP"
                 if residue.has_atom(newbond):
                     bondatom = residue.map[newbond]
-                    if bondatom not in newatom.bonds:
-                        newatom.bonds.append(bondatom)
-                    if newatom not in bondatom.bonds:
-                        bondatom.bonds.append(newatom)
+                    newatom.connect(bondatom)
                 # And connect back to the existing structure
                 newbond = bond
                 if residue.has_atom(newbond):
                     bondatom = residue.map[newbond]
-                    if bondatom not in newatom.bonds:
-                        newatom.bonds.append(bondatom)
-                    if newatom not in bondatom.bonds:
-                        bondatom.bonds.append(newatom)
+                    newatom.connect(bondatom)
         residue.set_donors_acceptors()
         # Add to the optimization list
         for name in moveablenames:
@@ -885,10 +879,7 @@ class Carboxylic(optimize.Optimize):
             self.routines.cells.add_cell(newatom)
             newatom.refdistance = hatom.refdistance
             # Set the bonds for the new atom
-            if bondatom not in newatom.bonds:
-                newatom.bonds.append(bondatom)
-            if newatom not in bondatom.bonds:
-                bondatom.bonds.append(newatom)
+            newatom.connect(bondatom)
             # Break if this is the only atom to add
             self.atomlist.append(bondatom)
             self.hlist.append(residue.get_atom(f"{hname}1"))
@@ -1305,6 +1296,12 @@ class HydrogenHandler(sax.ContentHandler):
         self.curholder = None
         self.map = {}
 
+    def __getstate__(self):
+        # The XML parser's locator cannot be pickled (or shared)
+        state = self.__dict__.copy()
+        state["_locator"] = None
+        return state
+
     def startElement(self, name, _):
         """Create optimization holder objects or atoms.
 
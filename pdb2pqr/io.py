@@ -1,27 +1,51 @@
 """Functions related to reading and writing data."""
 
+import contextlib
+import functools
+import hashlib
 import io
+import itertools
 import logging
+import os
+import pickle
+import struct
+import tempfile
+import zipfile
 
 # import argparse
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import requests
+import numpy as np
 
 from . import cif, inputgen, pdb, psize
 from . import definitions as defns
+from . import utilities as util
 from .config import (
     AA_DEF_PATH,
+    CACHE_MAX_BYTES,
+    DEFINITION_CACHE_FORMAT,
+    DX_CHUNK_LINES,
+    FETCH_RETRIES,
+    FETCH_TIMEOUT,
+    FETCH_WORKERS,
     FILTER_WARNINGS,
     FILTER_WARNINGS_LIMIT,
     FORCE_FIELDS,
     NA_DEF_PATH,
     PATCH_DEF_PATH,
+    RCSB_URL,
     TITLE_STR,
+    VERSION,
+    WRITE_CHUNK_LINES,
 )
 from .structures import Atom
 
+# requests is only loaded if structures are downloaded
+requests = util.lazy_import("requests")
+urllib3 = util.lazy_import("urllib3")
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -50,15 +74,80 @@ class DuplicateFilter(logging.Filter):
         return True
 
 
-def print_biomolecule_atoms(atomlist, chainflag=False, pdbfile=False):
-    """Get PDB-format text lines for specified atoms.
+@functools.cache
+def _atom_name_field(name):
+    """Format an atom name as in :meth:`Atom.get_common_string_rep`.
+
+    :param name:  atom name
+    :type name:  str
+    :return:  4-character name field
+    :rtype:  str
+    """
+    if len(name) == 4 or len(name.strip("FLIP")) == 4:
+        return str.ljust(name, 4)[:4]
+    return " " + str.ljust(name, 3)[:3]
+
+
+@functools.lru_cache(maxsize=4096)
+def _residue_field(res_name, chain_id, res_seq, ins_code):
+    """Format the residue columns as in :meth:`Atom.get_common_string_rep`.
+
+    :param res_name:  residue name
+    :type res_name:  str
+    :param chain_id:  chain ID (empty if not printed)
+    :type chain_id:  str
+    :param res_seq:  residue number
+    :type res_seq:  int
+    :param ins_code:  insertion code
+    :type ins_code:  str
+    :return:  residue name, chain ID, residue number, and insertion code
+        fields
+    :rtype:  str
+    """
+    if len(res_name) == 4:
+        text = str.ljust(res_name, 4)[:4]
+    else:
+        text = " " + str.ljust(res_name, 3)[:3]
+    text += " " + str.ljust(chain_id, 1)[:1]
+    text += str.rjust(f"{res_seq:d}", 4)[:4]
+    text += f"{ins_code}   " if ins_code != "" else "    "
+    return text
+
+
+def _format_coords(atom):
+    """Format atom coordinates as in :meth:`Atom.get_common_string_rep`.
+
+    :param atom:  atom to format
+    :type atom:  Atom
+    :return:  coordinate fields
+    :rtype:  str
+    """
+    text = f"{atom.x:8.3f}{atom.y:8.3f}{atom.z:8.3f}"
+    if len(text) != 24:
+        # At least one value overflowed its column and must be truncated
+        text = "".join(
+            str.ljust(f"{value:8.3f}", 8)[:8]
+            for value in (atom.x, atom.y, atom.z)
+        )
+    return text
+
+
+def iter_atom_lines(atomlist, chainflag=False, pdbfile=False):
+    """Generate PDB- or PQR-format text lines for specified atoms.
+
+    The lines are identical to those produced by :meth:`Atom.get_pqr_string`
+    and :meth:`Atom.get_pdb_string`, but the fields that are shared by many
+    atoms (atom names and residue columns) are only formatted once and each
+    line is assembled with a single join.
 
     :param [Atom] atomlist:  the list of atoms to include
     :param bool chainflag:  flag whether to print chainid or not
-    :return:  list of strings, each representing an atom PDB line
-    :rtype:  [str]
+    :param bool pdbfile:  flag whether to print PDB format rather than PQR
+    :return:  generator of strings, each representing an atom PDB line
+    :rtype:  str
     """
-    text = []
+    if pdbfile:
+        chainflag = True
     currentchain_id = None
     for iatom, atom in enumerate(atomlist):
         # Print the "TER" records between chains
@@ -66,20 +155,89 @@ def print_biomolecule_atoms(atomlist, chainflag=False, pdbfile=False):
             currentchain_id = atom.chain_id
         elif atom.chain_id != currentchain_id:
             currentchain_id = atom.chain_id
-            text.append("TER\n")
-        atom.serial = iatom + 1
-        if pdbfile is True:
-            text.append(f"{atom.get_pdb_string()}\n")
+            yield "TER\n"
+        serial = iatom + 1
+        atom.serial = serial
+        if pdbfile:
+            tail = (
+                f"{atom.occupancy:>6.2f}{atom.temp_factor:>6.2f}      "
+                f"{atom.seg_id:4.4s}{atom.element:>2.2s}{atom.charge:2.2s}"
+            )
         else:
-            text.append(f"{atom.get_pqr_string(chainflag=chainflag)}\n")
-    text.append("TER\nEND")
-    return text
+            ffcharge = 0.0 if atom.ffcharge is None else atom.ffcharge
+            radius = 0.0 if atom.radius is None else atom.radius
+            tail = f"{ffcharge:8.4f}{radius:7.4f}"
+            if len(tail) != 15:
+                tail = (
+                    str.rjust(f"{ffcharge:.4f}", 8)[:8]
+                    + str.rjust(f"{radius:.4f}", 7)[:7]
+                )
+        yield "".join(
+            (
+                str.ljust(atom.type, 6)[:6],
+                str.rjust(str(serial), 5)[:5],
+                " ",
+                _atom_name_field(atom.name),
+                _residue_field(
+                    atom.res_name,
+                    atom.chain_id if chainflag else "",
+                    atom.res_seq,
+                    atom.ins_code,
+                ),
+                _format_coords(atom),
+                tail,
+                "\n",
+            )
+        )
+    yield "TER\nEND"
+
+
+def print_biomolecule_atoms(atomlist, chainflag=False, pdbfile=False):
+    """Get PDB-format text lines for specified atoms.
+
+    :param [Atom] atomlist:  the list of atoms to include
+    :param bool chainflag:  flag whether to print chainid or not
+    :return:  list of strings, each representing an atom PDB line
+    :rtype:  [str]
+    """
+    return list(iter_atom_lines(atomlist, chainflag, pdbfile))
+
+
+def write_lines(file_, lines, chunk_size=WRITE_CHUNK_LINES):
+    """Write lines to a file in large chunks.
+
+    :param file_:  file object ready for writing as text
+    :type file_:  file
+    :param lines:  iterable of lines (including line terminators)
+    :type lines:  [str]
+    :param chunk_size:  number of lines to join for each write
+    :type chunk_size:  int
+    """
+    lines = iter(lines)
+    while chunk := list(itertools.islice(lines, chunk_size)):
+        file_.write("".join(chunk))
+
+
+def write_biomolecule_atoms(file_, atomlist, chainflag=False, pdbfile=False):
+    """Write PDB- or PQR-format lines for specified atoms to a file.
+
+    The output is identical to writing the lines from
+    :func:`print_biomolecule_atoms` but the lines are never all held in
+    memory.
+
+    :param file_:  file object ready for writing as text
+    :type file_:  file
+    :param [Atom] atomlist:  the list of atoms to include
+    :param bool chainflag:  flag whether to print chainid or not
+    :param bool pdbfile:  flag whether to print PDB format rather than PQR
+    """
+    write_lines(file_, iter_atom_lines(atomlist, chainflag, pdbfile))
 
 
 def get_old_header(pdblist):
     """Get old header from list of :mod:`pdb` objects.
 
-    :param pdblist:  list of :mod:`pdb` block objects
+    :param pdblist:  list of :mod:`pdb` block objects or raw record lines
     :type pdblist:  []
     :return:  old header as string
     :rtype:  str
@@ -99,8 +257,12 @@ def get_old_header(pdblist):
         pdb.SPRSDE,
         pdb.NUMMDL,
     )
+    header_names = {klass.__name__ for klass in header_types}
     for pdb_obj in pdblist:
-        if not isinstance(pdb_obj, header_types):
+        if isinstance(pdb_obj, str):
+            if pdb_obj[0:6].strip() not in header_names:
+                break
+        elif not isinstance(pdb_obj, header_types):
             break
         old_header.write(str(pdb_obj))
         old_header.write("\n")
@@ -419,47 +581,278 @@ def test_xml_file(name):
     return test_for_file(name, "xml")
 
 
-def get_pdb_file(name):
+@contextlib.contextmanager
+def _open_atomic(path):
+    """Open a temporary binary file that replaces a path when closed.
+
+    Readers never see part of the file.  If writing fails, the temporary
+    file is removed and the path is left unchanged.
+
+    :param path:  destination path
+    :type path:  Path
+    :return:  context manager for the temporary file object
+    :rtype:  file
+    """
+    handle, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as tmp_file:
+            yield tmp_file
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    Path(tmp_name).replace(path)
+
+
+def _write_atomic(path, data):
+    """Write a file via a temporary file so readers never see part of it.
+
+    :param path:  destination path
+    :type path:  Path
+    :param data:  file contents
+    :type data:  bytes
+    """
+    with _open_atomic(path) as out_file:
+        out_file.write(data)
+
+
+class StructureCache:
+    """Content-addressed on-disk cache for downloaded structure files.
+
+    File contents are stored under their SHA-256 digest in ``objects/`` and
+    small index files in ``keys/`` map cache keys (e.g., ``1abc.pdb``) to
+    digests.  The digest is checked whenever an entry is read so corrupted
+    entries are discarded rather than parsed.  When the total size of the
+    stored files exceeds the limit, the least recently used files are
+    removed.
+    """
+
+    def __init__(self, path, max_bytes=CACHE_MAX_BYTES):
+        """Initialize cache.
+
+        :param path:  cache directory (created if needed)
+        :type path:  str
+        :param max_bytes:  maximum total size of cached files
+        :type max_bytes:  int
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.object_dir = self.path / "objects"
+        self.key_dir = self.path / "keys"
+        self.object_dir.mkdir(parents=True, exist_ok=True)
+        self.key_dir.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key):
+        """Get cached data.
+
+        :param key:  cache key
+        :type key:  str
+        :return:  cached data or None if not cached (or corrupted)
+        :rtype:  bytes
+        """
+        key_path = self.key_dir / key
+        try:
+            digest = key_path.read_text().strip()
+            object_path = self.object_dir / digest
+            data = object_path.read_bytes()
+        except (FileNotFoundError, ValueError):
+            return None
+        if hashlib.sha256(data).hexdigest() != digest:
+            _LOGGER.warning(f"Discarding corrupted cache entry for {key}.")
+            object_path.unlink(missing_ok=True)
+            key_path.unlink(missing_ok=True)
+            return None
+        # Mark as recently used
+        os.utime(object_path)
+        return data
+
+    def put(self, key, data):
+        """Add data to the cache.
+
+        :param key:  cache key
+        :type key:  str
+        :param data:  data to cache
+        :type data:  bytes
+        :return:  SHA-256 digest of data
+        :rtype:  str
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        object_path = self.object_dir / digest
+        if not object_path.is_file():
+            _write_atomic(object_path, data)
+        _write_atomic(self.key_dir / key, digest.encode("utf-8"))
+        self.evict()
+        return digest
+
+    def evict(self):
+        """Remove least recently used files until the cache fits its limit."""
+        entries = []
+        total = 0
+        for object_path in self.object_dir.iterdir():
+            if object_path.suffix == ".tmp":
+                continue
+            try:
+                stat = object_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, object_path))
+            total += stat.st_size
+        entries.sort()
+        for _, size, object_path in entries:
+            if total <= self.max_bytes:
+                break
+            _LOGGER.debug(f"Evicting {object_path.name} from cache.")
+            object_path.unlink(missing_ok=True)
+            total -= size
+
+
+@functools.cache
+def get_session():
+    """Get a shared HTTP session with connection pooling and retries.
+
+    :return:  session for downloading structures
+    :rtype:  requests.Session
+    """
+    session = requests.Session()
+    retry = urllib3.util.Retry(
+        total=FETCH_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=FETCH_WORKERS,
+        pool_maxsize=FETCH_WORKERS,
+        max_retries=retry,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_structure(pdb_id, format_="pdb", mirror=RCSB_URL, cache=None):
+    """Download a structure file by ID.
+
+    :param pdb_id:  PDB ID
+    :type pdb_id:  str
+    :param format_:  file format (``pdb`` or ``cif``)
+    :type format_:  str
+    :param mirror:  base URL of structure archive
+    :type mirror:  str
+    :param cache:  cache for downloaded files (or None)
+    :type cache:  StructureCache
+    :return:  contents of structure file
+    :rtype:  str
+    :raises OSError:  problems downloading file
+    """
+    key = f"{pdb_id.lower()}.{format_}"
+    data = None if cache is None else cache.get(key)
+    if data is None:
+        url_path = f"{mirror.rstrip('/')}/{pdb_id}.{format_}"
+        _LOGGER.debug(f"Attempting to fetch structure from {url_path}")
+        try:
+            resp = get_session().get(url_path, timeout=FETCH_TIMEOUT)
+        except requests.RequestException as err:
+            errstr = f"Unable to retrieve {url_path}: {err}"
+            raise OSError(errstr) from err
+        if resp.status_code != requests.codes["ok"]:
+            errstr = f"Got code {resp.status_code} while retrieving {url_path}"
+            raise OSError(errstr)
+        data = resp.content
+        if cache is not None:
+            cache.put(key, data)
+    else:
+        _LOGGER.debug(f"Using cached copy of {key}")
+    return data.decode("utf-8")
+
+
+def prefetch_structures(
+    pdb_ids,
+    format_="pdb",
+    mirror=RCSB_URL,
+    cache=None,
+    max_workers=FETCH_WORKERS,
+):
+    """Download several structure files concurrently into a cache.
+
+    :param pdb_ids:  PDB IDs
+    :type pdb_ids:  [str]
+    :param format_:  file format (``pdb`` or ``cif``)
+    :type format_:  str
+    :param mirror:  base URL of structure archive
+    :type mirror:  str
+    :param cache:  cache for downloaded files
+    :type cache:  StructureCache
+    :param max_workers:  number of concurrent downloads
+    :type max_workers:  int
+    :return:  IDs that could not be downloaded
+    :rtype:  [str]
+    """
+
+    def fetch(pdb_id):
+        try:
+            fetch_structure(pdb_id, format_, mirror, cache)
+        except OSError as err:
+            _LOGGER.error(err)
+            return pdb_id
+        return None
+
+    # Set up the shared session before the workers need it
+    get_session()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        failed = executor.map(fetch, pdb_ids)
+    return [pdb_id for pdb_id in failed if pdb_id is not None]
+
+
+def get_pdb_file(name, mirror=RCSB_URL, cache=None):
     """Obtain a PDB file.
 
     First check the path given on the command line - if that file is not
     available, obtain the file from the PDB webserver at
-    http://www.rcsb.org/pdb/
+    http://www.rcsb.org/pdb/ (or a mirror).
+
+    Local files compressed with gzip, bzip2, or xz (``.gz``, ``.bz2``, or
+    ``.xz`` suffix) are decompressed as they are read.  Downloads are in CIF
+    format if the name ends in ``.cif`` and PDB format otherwise.
 
     .. todo::  This should be a context manager (to close the open file).
-    .. todo::  Remove hard-coded parameters.
 
     :param name:  name of PDB file (path) or PDB ID
     :type name:  str
+    :param mirror:  base URL of structure archive
+    :type mirror:  str
+    :param cache:  cache for downloaded files (or None)
+    :type cache:  StructureCache
     :return:  file-like object containing PDB file
     :rtype:  file
     """
     path = Path(name)
     if path.is_file():
-        return open(path, encoding="utf-8")
-    url_path = f"https://files.rcsb.org/download/{path.stem}.pdb"
-    _LOGGER.debug(f"Attempting to fetch PDB from {url_path}")
-    resp = requests.get(url_path)
-    if resp.status_code != requests.codes["ok"]:
-        errstr = f"Got code {resp.status_code} while retrieving {url_path}"
-        raise IOError(errstr)
-    return io.StringIO(resp.text)
+        return util.open_file(path)
+    format_ = "cif" if util.uncompressed_suffix(path) == ".cif" else "pdb"
+    if path.suffix.lower() in util.COMPRESSED_OPENERS:
+        path = path.with_suffix("")
+    return io.StringIO(
+        fetch_structure(path.stem, format_, mirror=mirror, cache=cache)
+    )
 
 
-def get_molecule(input_path):
+def get_molecule(input_path, mirror=RCSB_URL, cache=None):
     """Get molecular structure information as a series of parsed lines.
 
     :param input_path:  structure file PDB ID or path
     :type intput_path:  str
+    :param mirror:  base URL of structure archive
+    :type mirror:  str
+    :param cache:  cache for downloaded files (or None)
+    :type cache:  StructureCache
     :return: (list of molecule records, Boolean indicating whether entry is
         CIF)
     :rtype:  ([str], bool)
     :raises RuntimeError:  problems with structure file
     """
     path = Path(input_path)
-    input_file = get_pdb_file(input_path)
+    input_file = get_pdb_file(input_path, mirror=mirror, cache=cache)
     is_cif = False
-    if path.suffix.lower() == ".cif":
+    if util.uncompressed_suffix(path) == ".cif":
         pdblist, errlist = cif.read_cif(input_file)
         is_cif = True
     else:
@@ -477,30 +870,65 @@ def get_molecule(input_path):
 
 
 def get_definitions(
-    aa_path=AA_DEF_PATH, na_path=NA_DEF_PATH, patch_path=PATCH_DEF_PATH
+    aa_path=AA_DEF_PATH,
+    na_path=NA_DEF_PATH,
+    patch_path=PATCH_DEF_PATH,
+    cache_dir=None,
 ):
     """Load topology definition files.
 
+    If ``cache_dir`` is given, the fully-built definitions (including patched
+    residues) are stored there in binary form, keyed by the contents of the
+    definition files, and loaded from the cache on later calls.  The cache is
+    rebuilt automatically when any of the definition files change.
+
     :param aa_path:  likely location of amino acid topology definitions
     :type aa_path:  str
     :param na_path:  likely location of nucleic acid topology definitions
     :type na_path:  str
     :param patch_path:  likely location of patch topology definitions
     :type patch_path:  str
+    :param cache_dir:  directory for caching compiled definitions
+    :type cache_dir:  str
     :return:  topology Definitions object.
     :rtype:  Definition
     """
-    aa_path_ = test_xml_file(aa_path)
-    na_path_ = test_xml_file(na_path)
-    patch_path_ = test_xml_file(patch_path)
-    with (
-        open(aa_path_) as aa_file,
-        open(na_path_) as na_file,
-        open(patch_path_) as patch_file,
-    ):
-        definitions = defns.Definition(
-            aa_file=aa_file, na_file=na_file, patch_file=patch_file
+    paths = [test_xml_file(path) for path in (aa_path, na_path, patch_path)]
+    contents = [Path(path).read_bytes() for path in paths]
+    cache_path = None
+    if cache_dir is not None:
+        digest = hashlib.sha256(
+            f"{VERSION} {DEFINITION_CACHE_FORMAT}".encode()
+        )
+        for content in contents:
+            digest.update(hashlib.sha256(content).digest())
+        cache_path = (
+            Path(cache_dir) / "definitions" / f"{digest.hexdigest()}.pickle"
         )
+        try:
+            with open(cache_path, "rb") as cache_file:
+                definitions = pickle.load(cache_file)
+        except FileNotFoundError:
+            pass
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            _LOGGER.warning(f"Discarding unreadable cache {cache_path}.")
+        else:
+            if isinstance(definitions, defns.Definition):
+                _LOGGER.debug(f"Loaded topology definitions from {cache_path}")
+                return definitions
+    aa_file, na_file, patch_file = (io.BytesIO(data) for data in contents)
+    definitions = defns.Definition(
+        aa_file=aa_file, na_file=na_file, patch_file=patch_file
+    )
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            _write_atomic(
+                cache_path,
+                pickle.dumps(definitions, protocol=pickle.HIGHEST_PROTOCOL),
+            )
+        except OSError as err:
+            _LOGGER.warning(f"Unable to cache topology definitions: {err}")
     return definitions
 
 
@@ -542,12 +970,139 @@ def read_pqr(pqr_file):
     :returns:  list of atoms read from file
     :rtype:  [Atom]
     """
-    atoms = []
+    return list(iter_pqr(pqr_file))
+
+
+def iter_pqr(pqr_file):
+    """Lazily read atoms from a PQR file.
+
+    :param pqr_file:  file object ready for reading as text
+    :type pqr_file:  file
+    :returns:  generator of atoms read from file
+    :rtype:  Atom
+    """
     for line in pqr_file:
         atom = Atom.from_pqr_line(line)
         if atom is not None:
-            atoms.append(atom)
-    return atoms
+            yield atom
+
+
+def write_npz(path, atomlist, compress=False):
+    """Write atom parameters as NumPy arrays in NPZ format.
+
+    The file contains one array per field:
+
+    * ``serial``, ``res_seq``:  integers
+    * ``coords``:  ``(N, 3)`` float coordinates
+    * ``charge``, ``radius``:  floats (0 if not assigned, as in PQR output)
+    * ``type``, ``name``, ``res_name``, ``chain_id``, ``ins_code``:
+      fixed-width strings
+
+    :param path:  path for NPZ file
+    :type path:  str
+    :param [Atom] atomlist:  the list of atoms to include
+    :param compress:  compress arrays (prevents memory-mapping in
+        :func:`read_npz`)
+    :type compress:  bool
+    """
+    arrays = {
+        "type": np.array([atom.type for atom in atomlist], dtype=str),
+        "serial": np.array([atom.serial for atom in atomlist], dtype=np.int64),
+        "name": np.array([atom.name for atom in atomlist], dtype=str),
+        "res_name": np.array([atom.res_name for atom in atomlist], dtype=str),
+        "chain_id": np.array([atom.chain_id for atom in atomlist], dtype=str),
+        "res_seq": np.array(
+            [atom.res_seq for atom in atomlist], dtype=np.int64
+        ),
+        "ins_code": np.array([atom.ins_code for atom in atomlist], dtype=str),
+        "coords": np.array(
+            [(atom.x, atom.y, atom.z) for atom in atomlist], dtype=np.float64
+        ).reshape(-1, 3),
+        "charge": np.array(
+            [
+                0.0 if atom.ffcharge is None else atom.ffcharge
+                for atom in atomlist
+            ],
+            dtype=np.float64,
+        ),
+        "radius": np.array(
+            [0.0 if atom.radius is None else atom.radius for atom in atomlist],
+            dtype=np.float64,
+        ),
+    }
+    save = np.savez_compressed if compress else np.savez
+    with open(path, "wb") as npz_file:
+        save(npz_file, **arrays)
+
+
+def _memmap_npz_member(path, zip_file, info):
+    """Memory-map an uncompressed array stored in an NPZ file.
+
+    :param path:  path to NPZ file
+    :type path:  str
+    :param zip_file:  open NPZ file
+    :type zip_file:  zipfile.ZipFile
+    :param info:  archive member for the array
+    :type info:  zipfile.ZipInfo
+    :return:  read-only memory-mapped array
+    :rtype:  numpy.ndarray
+    """
+    with zip_file.open(info) as member:
+        version = np.lib.format.read_magic(member)
+        if version == (1, 0):
+            read_header = np.lib.format.read_array_header_1_0
+        else:
+            read_header = np.lib.format.read_array_header_2_0
+        shape, fortran_order, dtype = read_header(member)
+        header_size = member.tell()
+    # Find the start of the member data after its local file header
+    with open(path, "rb") as raw_file:
+        raw_file.seek(info.header_offset)
+        local_header = raw_file.read(zipfile.sizeFileHeader)
+    name_size, extra_size = struct.unpack("<HH", local_header[26:30])
+    offset = (
+        info.header_offset
+        + zipfile.sizeFileHeader
+        + name_size
+        + extra_size
+        + header_size
+    )
+    return np.memmap(
+        path,
+        dtype=dtype,
+        mode="r",
+        offset=offset,
+        shape=shape,
+        order="F" if fortran_order else "C",
+    )
+
+
+def read_npz(path, mmap=False):
+    """Read atom parameters written by :func:`write_npz`.
+
+    No :class:`Atom` objects are created.
+
+    :param path:  path to NPZ file
+    :type path:  str
+    :param mmap:  memory-map the arrays rather than reading them (only for
+        uncompressed files)
+    :type mmap:  bool
+    :return:  dictionary of arrays indexed by field name
+    :rtype:  {str: numpy.ndarray}
+    :raises ValueError:  if memory-mapping is requested for a compressed file
+    """
+    if not mmap:
+        with np.load(path) as npz_file:
+            return {key: npz_file[key] for key in npz_file.files}
+    arrays = {}
+    with zipfile.ZipFile(path) as zip_file:
+        for info in zip_file.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                err = f"Unable to memory-map compressed array {info.filename}"
+                raise ValueError(err)
+            key = info.filename.removesuffix(".npy")
+            arrays[key] = _memmap_npz_member(path, zip_file, info)
+    return arrays
 
 
 def read_qcd(qcd_file):
@@ -567,32 +1122,36 @@ def read_qcd(qcd_file):
     return atoms
 
 
-def read_dx(dx_file):
-    """Read DX-format volumetric information.
+def read_dx_header(dx_file):
+    """Read the header of a DX-format file.
 
-    The OpenDX file format is defined at
-    <https://www.idvbook.com/wp-content/uploads/2010/12/opendx.pdf`.
-
-    .. note:: This function is not a general-format OpenDX file parser and
-       makes many assumptions about the input data type, grid structure, etc.
-
-    .. todo:: This function should be moved into the APBS code base.
+    Reading stops at the first data value so the values can then be read
+    with :func:`iter_dx_values`.
 
     :param dx_file:  file object for DX file, ready for reading as text
     :type dx_file:  file
-    :returns:  dictionary with data from DX file
+    :returns:  dictionary with grid information from DX file: the number of
+        grid points (``shape``), grid origin (``origin``), grid spacing
+        vectors (``delta``, one row per axis), number of values
+        (``num_values``, None if not given), as well as the ``number of grid
+        points``, ``lower left corner``, and ``grid spacing`` lists used by
+        :func:`write_cube`
     :rtype:  dict
     :raises ValueError:  on parsing error
     """
     dx_dict = {
         "grid spacing": [],
-        "values": [],
         "number of grid points": None,
         "lower left corner": None,
+        "num_values": None,
     }
-    for line in dx_file:
-        words = [w.strip() for w in line.split()]
-        if words[0] in ["#", "attribute", "component"]:
+    while True:
+        position = dx_file.tell()
+        line = dx_file.readline()
+        if line == "":
+            break
+        words = line.split()
+        if len(words) == 0 or words[0] in ["#", "attribute", "component"]:
             pass
         elif words[0] == "object":
             if words[1] == "1":
@@ -601,6 +1160,12 @@ def read_dx(dx_file):
                     int(words[6]),
                     int(words[7]),
                 )
+            elif "follows" in words:
+                if "items" in words:
+                    dx_dict["num_values"] = int(
+                        words[words.index("items") + 1]
+                    )
+                break
         elif words[0] == "origin":
             dx_dict["lower left corner"] = [
                 float(words[1]),
@@ -611,11 +1176,124 @@ def read_dx(dx_file):
             spacing = [float(words[1]), float(words[2]), float(words[3])]
             dx_dict["grid spacing"].append(spacing)
         else:
-            for word in words:
-                dx_dict["values"].append(float(word))
+            # Data values without an "object ... data follows" line
+            dx_file.seek(position)
+            break
+    dx_dict["shape"] = dx_dict["number of grid points"]
+    dx_dict["origin"] = np.array(dx_dict["lower left corner"], dtype=float)
+    dx_dict["delta"] = np.array(dx_dict["grid spacing"], dtype=float)
+    return dx_dict
+
+
+def iter_dx_values(dx_file, chunk_lines=DX_CHUNK_LINES):
+    """Read DX-format data values in chunks.
+
+    The file must be positioned at the start of the data values (e.g., by
+    :func:`read_dx_header`).  Reading stops at the first line after the
+    values that starts with a keyword.
+
+    :param dx_file:  file object for DX file, ready for reading as text
+    :type dx_file:  file
+    :param chunk_lines:  number of lines to parse at a time
+    :type chunk_lines:  int
+    :returns:  generator of arrays of values in file order
+    :rtype:  numpy.ndarray
+    """
+    while lines := list(itertools.islice(dx_file, chunk_lines)):
+        for iline, line in enumerate(lines):
+            if line.lstrip()[:1].isalpha():
+                yield np.fromstring("".join(lines[:iline]), sep=" ")
+                return
+        yield np.fromstring("".join(lines), sep=" ")
+
+
+def read_dx(dx_file, cache_path=None):
+    """Read DX-format volumetric information.
+
+    The OpenDX file format is defined at
+    <https://www.idvbook.com/wp-content/uploads/2010/12/opendx.pdf`.
+
+    The values are returned as a flat :mod:`numpy` array in file order (z
+    varies fastest) so ``values.reshape(dx_dict["shape"])`` is indexed by
+    x, y, and z grid indices.  If ``cache_path`` is given, the values are
+    saved there in NPY format and memory-mapped; later calls with the same
+    cache path memory-map the cached values instead of parsing the file
+    (unless the DX file is newer than the cache).
+
+    .. note:: This function is not a general-format OpenDX file parser and
+       makes many assumptions about the input data type, grid structure, etc.
+
+    .. todo:: This function should be moved into the APBS code base.
+
+    :param dx_file:  file object for DX file, ready for reading as text
+    :type dx_file:  file
+    :param cache_path:  path to NPY file for caching values
+    :type cache_path:  str
+    :returns:  dictionary with data from DX file; see :func:`read_dx_header`
+        for the grid information keys and ``values`` for the data
+    :rtype:  dict
+    :raises ValueError:  on parsing error
+    """
+    dx_dict = read_dx_header(dx_file)
+    num_values = dx_dict["num_values"]
+    if cache_path is not None:
+        cache_path = Path(cache_path)
+        values = _read_dx_cache(dx_file, cache_path, num_values)
+        if values is not None:
+            dx_dict["values"] = values
+            return dx_dict
+    if num_values is None:
+        values = np.concatenate([np.empty(0), *iter_dx_values(dx_file)])
+    else:
+        values = np.empty(num_values)
+        ivalue = 0
+        for chunk in iter_dx_values(dx_file):
+            values[ivalue : ivalue + len(chunk)] = chunk
+            ivalue += len(chunk)
+        if ivalue != num_values:
+            err = f"Expected {num_values} values in DX file; found {ivalue}"
+            raise ValueError(err)
+    if cache_path is not None:
+        # Save through a file object so the path is used exactly as given
+        # (np.save adds ".npy" to paths without it)
+        with _open_atomic(cache_path) as cache_file:
+            np.save(cache_file, values)
+        values = np.load(cache_path, mmap_mode="r")
+    dx_dict["values"] = values
     return dx_dict
 
 
+def _read_dx_cache(dx_file, cache_path, num_values):
+    """Memory-map cached DX values if the cache is up to date.
+
+    :param dx_file:  file object for DX file
+    :type dx_file:  file
+    :param cache_path:  path to NPY cache file
+    :type cache_path:  Path
+    :param num_values:  expected number of values (None if unknown)
+    :type num_values:  int
+    :returns:  cached values or None if there is no usable cache
+    :rtype:  numpy.ndarray
+    """
+    if not cache_path.is_file():
+        return None
+    dx_path = getattr(dx_file, "name", None)
+    if (
+        isinstance(dx_path, (str, Path))
+        and Path(dx_path).is_file()
+        and Path(dx_path).stat().st_mtime > cache_path.stat().st_mtime
+    ):
+        return None
+    try:
+        values = np.load(cache_path, mmap_mode="r")
+    except ValueError:
+        return None
+    if num_values is not None and values.shape != (num_values,):
+        return None
+    _LOGGER.debug(f"Using cached DX values from {cache_path}")
+    return values
+
+
 def write_cube(cube_file, data_dict, atom_list, comment="CPMD CUBE FILE."):
     """Write a Cube-format data file.
 
@@ -632,6 +1310,23 @@ def write_cube(cube_file, data_dict, atom_list, comment="CPMD CUBE FILE."):
     :param comment:  comment for Cube file
     :type comment:  str
     """
+    write_cube_header(cube_file, data_dict, atom_list, comment)
+    write_cube_values(cube_file, [data_dict["values"]])
+
+
+def write_cube_header(
+    cube_file, data_dict, atom_list, comment="CPMD CUBE FILE."
+):
+    """Write the grid and atom information of a Cube-format data file.
+
+    :param cube_file:  file object ready for writing text data
+    :type cube_file:  file
+    :param data_dict:  dictionary of grid information as produced by
+        :func:`read_dx_header` or :func:`read_dx`
+    :type data_dict:  dict
+    :param comment:  comment for Cube file
+    :type comment:  str
+    """
     cube_file.write(comment + "\n")
     cube_file.write("OUTER LOOP: X, MIDDLE LOOP: Y, INNER LOOP: Z\n")
     num_atoms = len(atom_list)
@@ -654,13 +1349,37 @@ def write_cube(cube_file, data_dict, atom_list, comment="CPMD CUBE FILE."):
             f"{atom.serial:>4} {atom.charge:>11.6f} {atom.x:>11.6f} "
             f"{atom.y:>11.6f} {atom.z:>11.6f}\n"
         )
+
+
+def write_cube_values(cube_file, chunks, chunk_lines=WRITE_CHUNK_LINES):
+    """Write the volumetric values of a Cube-format data file.
+
+    Values are written six per line as they arrive so arbitrarily large
+    grids can be converted with constant memory (e.g., from
+    :func:`iter_dx_values`).  Each chunk of lines is formatted and written
+    at once.
+
+    :param cube_file:  file object ready for writing text data
+    :type cube_file:  file
+    :param chunks:  iterable of arrays of values in grid order
+    :type chunks:  [numpy.ndarray]
+    :param chunk_lines:  maximum number of lines to format for each write
+    :type chunk_lines:  int
+    """
     stride = 6
-    values = data_dict["values"]
-    for i in range(0, len(values), 6):
-        if i + stride < len(values):
-            imax = i + 6
-            words = [f"{val:< 13.5E}" for val in values[i:imax]]
-            cube_file.write(" ".join(words) + "\n")
-        else:
-            words = [f"{val:< 13.5E}" for val in values[i:]]
-            cube_file.write(" ".join(words))
+    line_format = " ".join(["% -13.5E"] * stride)
+    chunk_size = stride * chunk_lines
+    carry = np.empty(0)
+    separator = ""
+    for chunk in chunks:
+        values = np.concatenate((carry, np.ravel(chunk)))
+        num_full = len(values) - len(values) % stride
+        for start in range(0, num_full, chunk_size):
+            block = values[start : min(start + chunk_size, num_full)]
+            text = "\n".join([line_format] * (len(block) // stride))
+            cube_file.write(separator + text % tuple(block.tolist()))
+            separator = "\n"
+        carry = values[num_full:]
+    if len(carry) > 0:
+        text = " ".join(["% -13.5E"] * len(carry))
+        cube_file.write(separator + text % tuple(carry.tolist()))
@@ -8,6 +8,7 @@ It was created to avoid cluttering the __init__.py file.
 """
 
 import argparse
+import itertools
 import logging
 import sys
 from collections import OrderedDict
@@ -16,24 +17,32 @@ from io import StringIO
 from os import PathLike
 from pathlib import Path
 
-import propka.input as pk_in
 import propka.lib
-import propka.output as pk_out
-from propka.molecular_container import MolecularContainer
-from propka.parameters import Parameters
 
-from . import aa, debump, forcefield, hydrogens, io
+from . import aa, debump, hydrogens, io, pdb, profiling, shared
 from . import biomolecule as biomol
 from .config import (
     CITATIONS,
     FORCE_FIELDS,
     IGNORED_PROPKA_OPTIONS,
+    RCSB_URL,
     REPAIR_LIMIT,
     TITLE_STR,
     VERSION,
 )
 from .ligand.mol2 import Mol2Molecule
-from .utilities import noninteger_charge
+from .utilities import (
+    COMPRESSED_OPENERS,
+    lazy_import,
+    noninteger_charge,
+    open_file,
+)
+
+# PROPKA is only loaded if pKa values are assigned
+pk_in = lazy_import("propka.input")
+pk_out = lazy_import("propka.output")
+pk_mc = lazy_import("propka.molecular_container")
+pk_params = lazy_import("propka.parameters")
 
 _LOGGER = logging.getLogger(f"PDB2PQR{VERSION}")
 
@@ -57,9 +66,37 @@ def build_main_parser():
     )
     pars.add_argument(
         "input_path",
-        help="Input PDB path or ID (to be retrieved from RCSB database",
+        help=(
+            "Input PDB path or ID (to be retrieved from RCSB database); "
+            "paths ending in .gz, .bz2, or .xz are decompressed"
+        ),
+    )
+    pars.add_argument(
+        "output_pqr",
+        help="Output PQR path (compressed if ending in .gz, .bz2, or .xz)",
+    )
+    pars.add_argument(
+        "--mirror",
+        default=RCSB_URL,
+        help="Base URL for downloading structures by ID",
+    )
+    pars.add_argument(
+        "--cache-dir",
+        default=None,
+        help=(
+            "Directory for caching downloaded structures and compiled "
+            "topology definitions"
+        ),
+    )
+    pars.add_argument(
+        "--profile",
+        action="store_true",
+        default=False,
+        help=(
+            "Write the wall time, CPU time, and peak memory use of each "
+            "phase of the run to a JSON file next to the output PQR"
+        ),
     )
-    pars.add_argument("output_pqr", help="Output PQR path")
     pars.add_argument(
         "--log-level",
         help="Logging level",
@@ -73,8 +110,14 @@ def build_main_parser():
     grp1.add_argument(
         "--ff",
         choices=[ff.upper() for ff in FORCE_FIELDS],
-        default="PARSE",
-        help="The forcefield to use.",
+        action="append",
+        default=None,
+        help=(
+            "The forcefield to use (default PARSE). Can be given several "
+            "times to prepare the structure once and write a PQR for each "
+            "forcefield (named by adding the forcefield to the output PQR "
+            "name)"
+        ),
     )
     grp1.add_argument(
         "--userff",
@@ -141,7 +184,8 @@ def build_main_parser():
         "--apbs-input",
         help=(
             "Create a template APBS input file based on the generated PQR "
-            "file at the specified location."
+            "file at the specified location (requires uncompressed PQR "
+            "output)."
         ),
     )
     grp2.add_argument(
@@ -149,7 +193,7 @@ def build_main_parser():
         default=None,
         help=(
             "Create a PDB file based on input. This will be missing charges "
-            "and radii"
+            "and radii; compressed if ending in .gz, .bz2, or .xz"
         ),
     )
     grp2.add_argument(
@@ -160,6 +204,16 @@ def build_main_parser():
             "match only one ligand in the PDB file."
         ),
     )
+    grp2.add_argument(
+        "--output-format",
+        choices=["pqr", "npz"],
+        default="pqr",
+        help=(
+            "Format of the output file: PQR text or NumPy arrays of "
+            "coordinates, charges, radii, and atom/residue/chain identifiers "
+            "(see pdb2pqr.io.read_npz)"
+        ),
+    )
     grp2.add_argument(
         "--whitespace",
         action="store_true",
@@ -193,6 +247,17 @@ def build_main_parser():
         default=False,
         help="Drop waters before processing biomolecule.",
     )
+    grp2.add_argument(
+        "--ensemble",
+        choices=["split", "multi"],
+        default=None,
+        help=(
+            "Process every model of a multi-model structure (rather than only "
+            "the first): 'split' writes one output file per model (with the "
+            "model number added to the file name) and 'multi' writes all "
+            "models to one file with MODEL/ENDMDL records"
+        ),
+    )
     grp2.add_argument(
         "--include-header",
         action="store_true",
@@ -226,6 +291,20 @@ def build_main_parser():
             "calculation method."
         ),
     )
+    grp3.add_argument(
+        "--ph-sweep",
+        type=float,
+        nargs=3,
+        metavar=("START", "STOP", "STEP"),
+        default=None,
+        help=(
+            "Write a PQR for each pH from START to STOP (inclusive) in steps "
+            "of STEP (named by adding the pH to the output PQR name). The "
+            "pKa values are calculated once and hydrogens are optimized "
+            "once for each distinct set of titration states. Requires "
+            "--titration-state-method=propka and overrides --with-ph."
+        ),
+    )
     pars: argparse.ArgumentParser = propka.lib.build_parser(pars)
 
     # Override version flag set by PROPKA
@@ -294,18 +373,59 @@ def check_options(args):
                     f"processed correctly by PDB2PQR. Ignoring."
                 )
                 setattr(args, option, new_value)
-    if (args.ph < 0) or (args.ph > 14):
-        err = (
-            f"Specified pH ({args.ph}) is outside the range "
-            "[1, 14] of this program"
-        )
-        raise RuntimeError(err)
-    if args.neutraln and (args.ff is None or args.ff.lower() != "parse"):
+    for ph in args.ph_values or [args.ph]:
+        if (ph < 0) or (ph > 14):
+            err = (
+                f"Specified pH ({ph}) is outside the range "
+                "[1, 14] of this program"
+            )
+            raise RuntimeError(err)
+    if args.ph_sweep is not None:
+        if not args.ph_values:
+            err = f"--ph-sweep {args.ph_sweep} does not give any pH values!"
+            raise RuntimeError(err)
+        if args.pka_method != "propka":
+            err = "--ph-sweep option requires --titration-state-method=propka!"
+            raise RuntimeError(err)
+    not_parse = any(ff.lower() != "parse" for ff in args.forcefields)
+    if args.neutraln and not_parse:
         err = "--neutraln option only works with PARSE forcefield!"
         raise RuntimeError(err)
-    if args.neutralc and (args.ff is None or args.ff.lower() != "parse"):
+    if args.neutralc and not_parse:
         err = "--neutralc option only works with PARSE forcefield!"
         raise RuntimeError(err)
+    if len(args.forcefields) > 1 and args.userff:
+        err = "--userff option does not work with several --ff!"
+        raise RuntimeError(err)
+    if len(args.forcefields) > 1 or args.ph_sweep is not None:
+        for option, value in [
+            ("--clean", args.clean),
+            ("--ensemble", args.ensemble),
+        ]:
+            if value:
+                err = (
+                    f"{option} option does not work with several --ff or "
+                    "with --ph-sweep!"
+                )
+                raise RuntimeError(err)
+    if args.ensemble == "multi" and args.apbs_input:
+        err = "--apbs-input option does not work with --ensemble=multi!"
+        raise RuntimeError(err)
+    compressed = Path(args.output_pqr).suffix.lower() in COMPRESSED_OPENERS
+    if compressed and args.apbs_input:
+        # APBS cannot read compressed PQR files
+        err = "--apbs-input option does not work with compressed output!"
+        raise RuntimeError(err)
+    if args.output_format == "npz":
+        if args.apbs_input:
+            err = "--apbs-input option requires --output-format=pqr!"
+            raise RuntimeError(err)
+        if args.ensemble == "multi":
+            err = "--ensemble=multi option requires --output-format=pqr!"
+            raise RuntimeError(err)
+        if compressed:
+            err = "--output-format=npz does not work with compressed output!"
+            raise RuntimeError(err)
 
 
 def print_pqr(args, pqr_lines, header_lines, missing_lines, is_cif):
@@ -320,7 +440,7 @@ def print_pqr(args, pqr_lines, header_lines, missing_lines, is_cif):
         in header)
     :param bool is_cif:  flag indicating CIF format
     """
-    with open(args.output_pqr, "w") as outfile:
+    with open_file(args.output_pqr, "wt") as outfile:
         # Adding whitespaces if --whitespace is in the options
         if header_lines:
             _LOGGER.warning(
@@ -330,23 +450,32 @@ def print_pqr(args, pqr_lines, header_lines, missing_lines, is_cif):
             _LOGGER.warning(
                 f"Ignoring {len(missing_lines)} missing lines in output."
             )
-        for line in pqr_lines:
-            if args.whitespace:
-                if line[0:4] == "ATOM" or line[0:6] == "HETATM":
-                    newline = (
-                        line[0:6]
-                        + " "
-                        + line[6:16]
-                        + " "
-                        + line[16:38]
-                        + " "
-                        + line[38:46]
-                        + " "
-                        + line[46:]
-                    )
-                    outfile.write(newline)
-            elif line[0:3] != "TER" or not is_cif:
-                outfile.write(line)
+        if args.whitespace:
+            io.write_lines(
+                outfile,
+                (
+                    line[0:6]
+                    + " "
+                    + line[6:16]
+                    + " "
+                    + line[16:38]
+                    + " "
+                    + line[38:46]
+                    + " "
+                    + line[46:]
+                    for line in pqr_lines
+                    if line[0:4] == "ATOM" or line[0:6] == "HETATM"
+                ),
+            )
+        else:
+            io.write_lines(
+                outfile,
+                (
+                    line
+                    for line in pqr_lines
+                    if line[0:3] != "TER" or not is_cif
+                ),
+            )
         if is_cif:
             outfile.write("#\n")
 
@@ -363,7 +492,7 @@ def print_pdb(args, pdb_lines, header_lines, missing_lines, is_cif):
         header)
     :param bool is_cif:  flag indicating CIF format
     """
-    with open(args.pdb_output, "w") as outfile:
+    with open_file(args.pdb_output, "wt") as outfile:
         # Adding whitespaces if --whitespace is in the options
         if header_lines:
             _LOGGER.warning(
@@ -373,9 +502,29 @@ def print_pdb(args, pdb_lines, header_lines, missing_lines, is_cif):
             _LOGGER.warning(
                 f"Ignoring {len(missing_lines)} missing lines in output."
             )
-        for line in pdb_lines:
-            if line[0:3] != "TER" or not is_cif:
-                outfile.write(line)
+        io.write_lines(
+            outfile,
+            (line for line in pdb_lines if line[0:3] != "TER" or not is_cif),
+        )
+
+
+def ph_sweep_values(start, stop, step):
+    """Get the pH values of a sweep.
+
+    :param start:  first pH
+    :type start:  float
+    :param stop:  last pH (included if reached by whole steps)
+    :type stop:  float
+    :param step:  pH step (must be positive)
+    :type step:  float
+    :return:  pH values (rounded to avoid accumulating floating-point
+        errors)
+    :rtype:  [float]
+    """
+    if step <= 0 or stop < start:
+        return []
+    num_steps = int((stop - start) / step + 1e-9)
+    return [round(start + i * step, 6) for i in range(num_steps + 1)]
 
 
 def transform_arguments(args):
@@ -391,10 +540,17 @@ def transform_arguments(args):
     if args.assign_only or args.clean:
         args.debump = False
         args.opt = False
-    if args.userff is not None:
-        args.userff = args.userff
-    elif args.ff is not None:
-        args.ff = args.ff.lower()
+    forcefields = args.ff if isinstance(args.ff, list) else [args.ff]
+    forcefields = [ff for ff in forcefields if ff is not None] or ["PARSE"]
+    if args.userff is None:
+        forcefields = [ff.lower() for ff in forcefields]
+    args.forcefields = list(dict.fromkeys(forcefields))
+    args.ff = args.forcefields[0]
+    args.ph_values = None
+    if args.ph_sweep is not None:
+        args.ph_values = ph_sweep_values(*args.ph_sweep)
+        if args.ph_values:
+            args.ph = args.ph_values[0]
     if args.ffout is not None:
         args.ffout = args.ffout.lower()
     return args
@@ -492,12 +648,27 @@ def drop_water(pdblist):
     .. todo:: this module is already too long but this function fits better
         here. Other possible place would be utilities.
 
-    :param pdb_list:  list of PDB records as returned by io.get_molecule
+    :param pdb_list:  list of PDB records as returned by io.get_molecule or
+        any other iterable of records (e.g., from :func:`pdb.iter_records`)
     :type pdb_list:  [str]
-    :return:  new list of PDB records with waters removed.
+    :return:  new list of PDB records with waters removed; a generator is
+        returned if the input is not a list so that streams stay lazy
     :rtype:  [str]
     """
-    pdblist_new = []
+    records = _iter_non_water(pdblist)
+    if isinstance(pdblist, list):
+        return list(records)
+    return records
+
+
+def _iter_non_water(pdblist):
+    """Yield the records in a PDB record iterable that are not waters.
+
+    :param pdb_list:  iterable of PDB records
+    :type pdb_list:  iterable
+    :return:  generator of non-water records
+    :rtype:  BaseRecord
+    """
     for record in pdblist:
         record_type = record.record_type()
         if (
@@ -505,8 +676,26 @@ def drop_water(pdblist):
             and record.res_name in aa.WAT.water_residue_names
         ):
             continue
-        pdblist_new.append(record)
-    return pdblist_new
+        yield record
+
+
+def check_charges(biomolecule):
+    """Check that the residue and total charges are integers.
+
+    Residues with non-integer charges are reported as warnings.
+
+    :param biomolecule:  biomolecule with assigned charges
+    :type biomolecule:  Biomolecule
+    :raises ValueError:  if the total charge is not an integer
+    """
+    summary = biomolecule.charge_summary
+    for residue, charge_err in summary["noninteger"]:
+        _LOGGER.warning(
+            f"Residue {residue} has non-integer charge:  {charge_err}"
+        )
+    charge_err = noninteger_charge(summary["total"])
+    if charge_err:
+        raise ValueError(charge_err)
 
 
 def run_propka(args, biomolecule):
@@ -526,8 +715,10 @@ def run_propka(args, biomolecule):
 
     with StringIO() as fpdb:
         fpdb.writelines(lines)
-        parameters = pk_in.read_parameter_file(args.parameters, Parameters())
-        molecule = MolecularContainer(parameters, args)
+        parameters = pk_in.read_parameter_file(
+            args.parameters, pk_params.Parameters()
+        )
+        molecule = pk_mc.MolecularContainer(parameters, args)
         # needs a mock name with .pdb extension to work with stream data, hence the "input.pdb"
         molecule = pk_in.read_molecule_file("input.pdb", molecule, fpdb)
 
@@ -592,7 +783,16 @@ def run_propka(args, biomolecule):
     return rows, pka_str
 
 
-def non_trivial(args, biomolecule, ligand, definition, is_cif):
+def non_trivial(
+    args,
+    biomolecule,
+    ligand,
+    definition,
+    is_cif,
+    forcefield_=None,
+    hydrogen_handler=None,
+    profile=None,
+):
     """Perform a non-trivial PDB2PQR run.
 
     .. todo::
@@ -609,23 +809,94 @@ def non_trivial(args, biomolecule, ligand, definition, is_cif):
     :type definition:  Definition
     :param is_cif:  indicates whether file is CIF format
     :type is_cif:  bool
+    :param forcefield_:  forcefield (loaded from ``args`` if None)
+    :type forcefield_:  Forcefield
+    :param hydrogen_handler:  hydrogen topology definitions (loaded if None)
+    :type hydrogen_handler:  HydrogenHandler
+    :param profile:  profile for recording the time of each phase
+    :type profile:  Profile
     :raises ValueError:  for missing atoms that prevent debumping
     :return:  dictionary with results
     :rtype:  dict
     """
-    _LOGGER.info("Loading forcefield.")
-    forcefield_ = forcefield.Forcefield(
-        args.ff, definition, args.userff, args.usernames
+    if profile is None:
+        profile = profiling.Profile()
+    if forcefield_ is None:
+        _LOGGER.info("Loading forcefield.")
+        profile.start("forcefield")
+        forcefield_ = shared.get_forcefield(
+            args.ff, definition, args.userff, args.usernames
+        )
+    ((results, _),) = non_trivial_variants(
+        args,
+        biomolecule,
+        ligand,
+        definition,
+        is_cif,
+        [forcefield_],
+        hydrogen_handler=hydrogen_handler,
+        profile=profile,
     )
-    _LOGGER.info("Loading hydrogen topology definitions.")
-    hydrogen_handler = hydrogens.create_handler()
-    debumper = debump.Debump(biomolecule)
+    return results
+
+
+def non_trivial_variants(
+    args,
+    biomolecule,
+    ligand,
+    definition,
+    is_cif,
+    forcefields,
+    ph_values=None,
+    hydrogen_handler=None,
+    profile=None,
+):
+    """Perform a non-trivial PDB2PQR run for several forcefields and pHs.
+
+    Repair, debumping, and PROPKA do not depend on the forcefield or pH and
+    are run once.  The pKa values are applied for each combination of
+    forcefield and pH (the naming of titration states depends on the
+    forcefield); combinations that give the same titration states share the
+    addition and optimization of hydrogens.  Each combination is applied to
+    its own copy of the biomolecule (the last one uses ``biomolecule``
+    itself).
+
+    :param args:  command-line arguments
+    :type args:  argparse.Namespace
+    :param biomolecule:  biomolecule
+    :type biomolecule:  Biomolecule
+    :param ligand:  ligand object or None
+    :type ligand:  Mol2Molecule
+    :param definition:  topology definition
+    :type definition:  Definition
+    :param is_cif:  indicates whether file is CIF format
+    :type is_cif:  bool
+    :param forcefields:  forcefields to apply
+    :type forcefields:  [Forcefield]
+    :param ph_values:  pH values for assigning titration states
+        (``args.ph`` if None)
+    :type ph_values:  [float]
+    :param hydrogen_handler:  hydrogen topology definitions (loaded if None)
+    :type hydrogen_handler:  HydrogenHandler
+    :param profile:  profile for recording the time of each phase
+    :type profile:  Profile
+    :raises ValueError:  for missing atoms that prevent debumping
+    :return:  (dictionary with results, biomolecule) for each forcefield and
+        pH, with the pH values varying fastest
+    :rtype:  [(dict, Biomolecule)]
+    """
+    if profile is None:
+        profile = profiling.Profile()
+    if ph_values is None:
+        ph_values = [args.ph]
+    variants = list(itertools.product(forcefields, ph_values))
     pka_df = None
     if args.assign_only:
         # TODO - I don't understand why HIS needs to be set to HIP for
         # assign-only
         biomolecule.set_hip()
     else:
+        profile.start("repair")
         if is_repairable(biomolecule, args.ligand is not None):
             _LOGGER.info(
                 f"Attempting to repair {biomolecule.num_missing_heavy:d} "
@@ -636,50 +907,167 @@ def non_trivial(args, biomolecule, ligand, definition, is_cif):
         biomolecule.update_ss_bridges()
         if args.debump:
             _LOGGER.info("Debumping biomolecule.")
+            profile.start("debump")
             try:
-                debumper.debump_biomolecule()
+                debump.Debump(biomolecule).debump_biomolecule()
             except ValueError as err:
                 err = f"Unable to debump biomolecule. {err}"
                 raise ValueError(err)
         if args.pka_method == "propka":
             _LOGGER.info("Assigning titration states with PROPKA.")
+            profile.start("propka")
             biomolecule.remove_hydrogens()
             pka_df, pka_str = run_propka(args, biomolecule)
             _LOGGER.info(f"PROPKA information:\n{pka_str}")
-            biomolecule.apply_pka_values(
-                forcefield_.name,
-                args.ph,
-                {
-                    f"{row['res_name']} {row['res_num']} {row['chain_id']}": row[
-                        "pKa"
-                    ]
-                    for row in pka_df
-                    if row["group_label"].startswith(row["res_name"])
-                },
+    # Group the variants by titration states
+    groups = {}
+    if pka_df is None:
+        groups[None] = biomolecule, list(range(len(variants)))
+    else:
+        profile.start("titration states")
+        for index, (forcefield_, ph) in enumerate(variants):
+            if index < len(variants) - 1:
+                variant_biomolecule = biomolecule.copy()
+            else:
+                variant_biomolecule = biomolecule
+            variant_biomolecule.apply_pka_values(
+                forcefield_.name, ph, pka_values(pka_df)
             )
-
-        _LOGGER.info("Adding hydrogens to biomolecule.")
-        biomolecule.add_hydrogens()
-        if args.debump:
-            _LOGGER.info("Debumping biomolecule (again).")
-            debumper.debump_biomolecule()
-        _LOGGER.info("Optimizing hydrogen bonds")
-        hydrogen_routines = hydrogens.HydrogenRoutines(
-            debumper, hydrogen_handler
+            key = titration_states(variant_biomolecule)
+            groups.setdefault(key, (variant_biomolecule, []))[1].append(index)
+        _LOGGER.info(
+            f"Found {len(groups)} distinct sets of titration states for "
+            f"{len(variants)} combinations of forcefield and pH."
         )
-        if args.opt:
-            hydrogen_routines.set_optimizeable_hydrogens()
-            biomolecule.hold_residues(None)
-            hydrogen_routines.initialize_full_optimization()
-        else:
-            hydrogen_routines.initialize_wat_optimization()
-        hydrogen_routines.optimize_hydrogens()
-        hydrogen_routines.cleanup()
-    _LOGGER.info("Applying force field to biomolecule states.")
+    results = {}
+    for group_biomolecule, indices in groups.values():
+        if not args.assign_only:
+            if hydrogen_handler is None:
+                _LOGGER.info("Loading hydrogen topology definitions.")
+                profile.start("hydrogen handler")
+                hydrogen_handler = shared.get_hydrogen_handler()
+            add_hydrogens(args, group_biomolecule, hydrogen_handler, profile)
+        for index in indices:
+            if index != indices[-1]:
+                variant_biomolecule = group_biomolecule.copy()
+            else:
+                variant_biomolecule = group_biomolecule
+            forcefield_, ph = variants[index]
+            variant_results = apply_forcefield(
+                args,
+                variant_biomolecule,
+                ligand,
+                definition,
+                is_cif,
+                forcefield_,
+                ph,
+                profile,
+            )
+            variant_results["pka_df"] = pka_df
+            results[index] = variant_results, variant_biomolecule
+    profile.stop()
+    return [results[index] for index in range(len(variants))]
+
+
+def pka_values(pka_df):
+    """Get the pKa values of titratable residues from PROPKA results.
+
+    :param pka_df:  PROPKA results from :func:`run_propka`
+    :type pka_df:  [dict]
+    :return:  pKa values indexed by residue name, number, and chain ID (as
+        expected by :meth:`Biomolecule.apply_pka_values`)
+    :rtype:  {str: float}
+    """
+    return {
+        f"{row['res_name']} {row['res_num']} {row['chain_id']}": row["pKa"]
+        for row in pka_df
+        if row["group_label"].startswith(row["res_name"])
+    }
+
+
+def titration_states(biomolecule):
+    """Summarize the titration states assigned to a biomolecule.
+
+    :param biomolecule:  biomolecule
+    :type biomolecule:  Biomolecule
+    :return:  patches applied to each residue (empty for residues that
+        cannot be patched)
+    :rtype:  tuple
+    """
+    return tuple(
+        tuple(getattr(residue, "patches", ()))
+        for residue in biomolecule.residues
+    )
+
+
+def add_hydrogens(args, biomolecule, hydrogen_handler, profile):
+    """Add hydrogens to a biomolecule and optimize their positions.
+
+    :param args:  command-line arguments
+    :type args:  argparse.Namespace
+    :param biomolecule:  biomolecule with assigned titration states
+    :type biomolecule:  Biomolecule
+    :param hydrogen_handler:  hydrogen topology definitions
+    :type hydrogen_handler:  HydrogenHandler
+    :param profile:  profile for recording the time of each phase
+    :type profile:  Profile
+    """
+    debumper = debump.Debump(biomolecule)
+    _LOGGER.info("Adding hydrogens to biomolecule.")
+    profile.start("add hydrogens")
+    biomolecule.add_hydrogens()
+    if args.debump:
+        _LOGGER.info("Debumping biomolecule (again).")
+        profile.start("debump hydrogens")
+        debumper.debump_biomolecule()
+    _LOGGER.info("Optimizing hydrogen bonds")
+    profile.start("optimize hydrogens")
+    hydrogen_routines = hydrogens.HydrogenRoutines(debumper, hydrogen_handler)
+    if args.opt:
+        hydrogen_routines.set_optimizeable_hydrogens()
+        biomolecule.hold_residues(None)
+        hydrogen_routines.initialize_full_optimization()
+    else:
+        hydrogen_routines.initialize_wat_optimization()
+    hydrogen_routines.optimize_hydrogens()
+    hydrogen_routines.cleanup()
+    profile.stop()
+
+
+def apply_forcefield(
+    args, biomolecule, ligand, definition, is_cif, forcefield_, ph, profile
+):
+    """Apply a forcefield to a biomolecule and format the output.
+
+    :param args:  command-line arguments
+    :type args:  argparse.Namespace
+    :param biomolecule:  biomolecule with hydrogens
+    :type biomolecule:  Biomolecule
+    :param ligand:  ligand object or None
+    :type ligand:  Mol2Molecule
+    :param definition:  topology definition
+    :type definition:  Definition
+    :param is_cif:  indicates whether file is CIF format
+    :type is_cif:  bool
+    :param forcefield_:  forcefield
+    :type forcefield_:  Forcefield
+    :param ph:  pH used for assigning titration states (for the header)
+    :type ph:  float
+    :param profile:  profile for recording the time of each phase
+    :type profile:  Profile
+    :raises ValueError:  if the total charge is not an integer
+    :return:  dictionary with results (without ``pka_df``)
+    :rtype:  dict
+    """
+    _LOGGER.info(
+        f"Applying force field {forcefield_.name} to biomolecule states."
+    )
+    profile.start("apply forcefield")
     biomolecule.set_states()
     matched_atoms, missing_atoms = biomolecule.apply_force_field(forcefield_)
     if args.ligand is not None:
         _LOGGER.info("Processing ligand.")
+        profile.start("ligand")
         _LOGGER.warning("Using ZAP9 forcefield for ligand radii.")
         ligand.assign_parameters()
         lig_atoms = []
@@ -703,35 +1091,27 @@ def non_trivial(args, biomolecule, ligand, definition, is_cif):
                     _LOGGER.warning(err)
                     missing_atoms.append(pdb_atom)
         matched_atoms += lig_atoms
-    total_charge = 0
-    for residue in biomolecule.residues:
-        charge = residue.charge
-        charge_err = noninteger_charge(charge)
-        if charge_err:
-            _LOGGER.warning(
-                f"Residue {residue} has non-integer charge:  {charge_err}"
-            )
-        total_charge += charge
-    charge_err = noninteger_charge(total_charge)
-    if charge_err:
-        raise ValueError(charge_err)
+    profile.start("charges")
+    check_charges(biomolecule)
     if args.ffout is not None:
         _LOGGER.info(f"Applying custom naming scheme ({args.ffout}).")
-        if args.ffout != args.ff:
-            name_scheme = forcefield.Forcefield(args.ffout, definition, None)
+        profile.start("naming scheme")
+        if args.ffout != forcefield_.name:
+            name_scheme = shared.get_forcefield(args.ffout, definition)
         else:
             name_scheme = forcefield_
         biomolecule.apply_name_scheme(name_scheme)
     _LOGGER.info("Regenerating headers.")
+    profile.start("headers")
     reslist, charge = biomolecule.charge
     if is_cif:
         header = io.print_pqr_header_cif(
             missing_atoms,
             reslist,
             charge,
-            args.ff,
+            forcefield_.name,
             args.pka_method,
-            args.ph,
+            ph,
             args.ffout,
             include_old_header=args.include_header,
         )
@@ -741,29 +1121,36 @@ def non_trivial(args, biomolecule, ligand, definition, is_cif):
             missing_atoms,
             reslist,
             charge,
-            args.ff,
+            forcefield_.name,
             args.pka_method,
-            args.ph,
+            ph,
             args.ffout,
             include_old_header=args.include_header,
         )
     _LOGGER.info("Regenerating PDB lines.")
+    profile.start("atom lines")
     lines = io.print_biomolecule_atoms(matched_atoms, args.keep_chain)
+    profile.stop()
     return {
         "lines": lines,
+        "atoms": matched_atoms,
         "header": header,
         "missed_residues": missing_atoms,
-        "pka_df": pka_df,
     }
 
 
-def main_driver(args: argparse.Namespace):
+def main_driver(args: argparse.Namespace, profile=None):
     """Main driver for running program from the command line.
 
     Validate inputs, launch PDB2PQR, handle output.
 
     :param args:  command-line arguments
     :type args:  argparse.Namespace
+    :param profile:  profile for recording the wall time, CPU time, and peak
+        memory use of each phase of the run (see :meth:`Profile.as_dict`)
+    :type profile:  Profile
+    :return:  (missing atoms, PROPKA results, biomolecule)
+    :rtype:  (list, list, Biomolecule)
     """
     _LOGGER.debug(f"Invoked with arguments: {args}")
     print_splash_screen(args)
@@ -771,20 +1158,90 @@ def main_driver(args: argparse.Namespace):
     args = transform_arguments(args)
     check_files(args)
     check_options(args)
+    if profile is None:
+        profile = profiling.Profile()
     _LOGGER.info("Loading topology files.")
-    definition = io.get_definitions()
+    with profile.phase("definitions"):
+        definition = shared.get_definitions(cache_dir=args.cache_dir)
     _LOGGER.info(f"Loading molecule: {args.input_path}")
-    pdblist, is_cif = io.get_molecule(args.input_path)
-    if args.drop_water:
-        _LOGGER.info("Dropping water from structure.")
-        pdblist = drop_water(pdblist)
-    _LOGGER.info("Setting up molecule.")
-    biomolecule, definition, ligand = setup_molecule(
-        pdblist, definition, args.ligand
+    cache = None
+    if args.cache_dir is not None:
+        cache = io.StructureCache(args.cache_dir)
+    with profile.phase("molecule"):
+        pdblist, is_cif = io.get_molecule(
+            args.input_path, mirror=args.mirror, cache=cache
+        )
+        if args.drop_water:
+            _LOGGER.info("Dropping water from structure.")
+            pdblist = drop_water(pdblist)
+    if len(args.forcefields) > 1 or args.ph_values is not None:
+        result = run_variants(args, pdblist, definition, is_cif, profile)
+    elif args.ensemble is None:
+        results, biomolecule = process_model(
+            args, pdblist, definition, is_cif, profile=profile
+        )
+        with profile.phase("output"):
+            write_outputs(args, results, biomolecule, is_cif)
+        result = results["missed_residues"], results["pka_df"], biomolecule
+    else:
+        result = run_ensemble(args, pdblist, definition, is_cif, profile)
+    if args.profile:
+        profile_path = profile_json_path(args.output_pqr)
+        _LOGGER.info(f"Writing run profile to {profile_path}.")
+        profile.write_json(profile_path)
+    return result
+
+
+def profile_json_path(output_pqr):
+    """Get the path of the run profile written next to the output PQR.
+
+    For example, the profile for ``out.pqr.gz`` is ``out.profile.json``.
+
+    :param output_pqr:  path to output PQR file
+    :type output_pqr:  str
+    :return:  path to JSON file
+    :rtype:  str
+    """
+    path = Path(output_pqr)
+    if path.suffix.lower() in COMPRESSED_OPENERS:
+        path = path.with_suffix("")
+    return str(path.with_name(f"{path.stem}.profile.json"))
+
+
+def process_model(
+    args,
+    pdblist,
+    definition,
+    is_cif,
+    forcefield_=None,
+    hydrogen_handler=None,
+    profile=None,
+):
+    """Set up and process the biomolecule for a single model.
+
+    :param args:  command-line arguments
+    :type args:  argparse.Namespace
+    :param pdblist:  list of PDB records
+    :type pdblist:  list
+    :param definition:  topology definition
+    :type definition:  Definition
+    :param is_cif:  indicates whether file is CIF format
+    :type is_cif:  bool
+    :param forcefield_:  forcefield (loaded from ``args`` if None)
+    :type forcefield_:  Forcefield
+    :param hydrogen_handler:  hydrogen topology definitions (loaded if None)
+    :type hydrogen_handler:  HydrogenHandler
+    :param profile:  profile for recording the time of each phase
+    :type profile:  Profile
+    :return:  (dictionary with results, biomolecule)
+    :rtype:  (dict, Biomolecule)
+    :raises RuntimeError:  if the biomolecule could not be processed
+    """
+    if profile is None:
+        profile = profiling.Profile()
+    biomolecule, definition, ligand = setup_model(
+        args, pdblist, definition, profile
     )
-    _LOGGER.info("Setting termini states for biomolecule chains.")
-    biomolecule.set_termini(neutraln=args.neutraln, neutralc=args.neutralc)
-    biomolecule.update_bonds()
     if args.clean:
         _LOGGER.info(
             "Arguments specified cleaning only; skipping remaining steps."
@@ -796,6 +1253,7 @@ def main_driver(args: argparse.Namespace):
             "lines": io.print_biomolecule_atoms(
                 biomolecule.atoms, args.keep_chain
             ),
+            "atoms": biomolecule.atoms,
             "pka_df": None,
         }
     else:
@@ -806,18 +1264,136 @@ def main_driver(args: argparse.Namespace):
                 ligand=ligand,
                 definition=definition,
                 is_cif=is_cif,
+                forcefield_=forcefield_,
+                hydrogen_handler=hydrogen_handler,
+                profile=profile,
             )
         except ValueError as err:
             _LOGGER.critical(err)
             _LOGGER.critical("Giving up.")
             raise RuntimeError from err
-    print_pqr(
-        args=args,
-        pqr_lines=results["lines"],
-        header_lines=results["header"],
-        missing_lines=results["missed_residues"],
-        is_cif=is_cif,
+    return results, biomolecule
+
+
+def setup_model(args, pdblist, definition, profile):
+    """Set up the biomolecule for a single model and set its termini.
+
+    :param args:  command-line arguments
+    :type args:  argparse.Namespace
+    :param pdblist:  list of PDB records
+    :type pdblist:  list
+    :param definition:  topology definition
+    :type definition:  Definition
+    :param profile:  profile for recording the time of each phase
+    :type profile:  Profile
+    :return:  biomolecule, definition (with ligand, if any), and ligand
+        object (or None)
+    :rtype:  (Biomolecule, Definition, Mol2Molecule)
+    """
+    _LOGGER.info("Setting up molecule.")
+    with profile.phase("setup"):
+        biomolecule, definition, ligand = setup_molecule(
+            pdblist, definition, args.ligand
+        )
+        _LOGGER.info("Setting termini states for biomolecule chains.")
+        biomolecule.set_termini(neutraln=args.neutraln, neutralc=args.neutralc)
+        biomolecule.update_bonds()
+    return biomolecule, definition, ligand
+
+
+def run_variants(args, pdblist, definition, is_cif, profile=None):
+    """Prepare the structure once and write a PQR for each forcefield and pH.
+
+    Each combination of a forcefield in ``args.forcefields`` and a pH in
+    ``args.ph_values`` gets its own output files named by
+    :func:`variant_path`.
+
+    :param args:  command-line arguments
+    :type args:  argparse.Namespace
+    :param pdblist:  list of PDB records
+    :type pdblist:  list
+    :param definition:  topology definition
+    :type definition:  Definition
+    :param is_cif:  indicates whether file is CIF format
+    :type is_cif:  bool
+    :param profile:  profile for recording the time of each phase
+    :type profile:  Profile
+    :return:  (missing atoms, PROPKA results, biomolecule) for the first
+        forcefield and pH
+    :rtype:  (list, list, Biomolecule)
+    :raises RuntimeError:  if the biomolecule could not be processed
+    """
+    if profile is None:
+        profile = profiling.Profile()
+    biomolecule, definition, ligand = setup_model(
+        args, pdblist, definition, profile
     )
+    _LOGGER.info(f"Loading forcefields: {', '.join(args.forcefields)}.")
+    with profile.phase("forcefield"):
+        forcefields = [
+            shared.get_forcefield(
+                ff_name, definition, args.userff, args.usernames
+            )
+            for ff_name in args.forcefields
+        ]
+    ph_values = args.ph_values if args.ph_values is not None else [args.ph]
+    try:
+        variant_results = non_trivial_variants(
+            args,
+            biomolecule,
+            ligand,
+            definition,
+            is_cif,
+            forcefields,
+            ph_values=ph_values,
+            profile=profile,
+        )
+    except ValueError as err:
+        _LOGGER.critical(err)
+        _LOGGER.critical("Giving up.")
+        raise RuntimeError from err
+    # Only name outputs by the options that have several values
+    ff_names = args.forcefields if len(args.forcefields) > 1 else [None]
+    phs = ph_values if args.ph_values is not None else [None]
+    with profile.phase("output"):
+        for (ff_name, ph), (results, variant_biomolecule) in zip(
+            itertools.product(ff_names, phs), variant_results, strict=True
+        ):
+            variant_args = argparse.Namespace(**vars(args))
+            for option in ["output_pqr", "pdb_output", "apbs_input"]:
+                path = getattr(args, option)
+                if path:
+                    setattr(
+                        variant_args, option, variant_path(path, ff_name, ph)
+                    )
+            _LOGGER.info(f"Writing output to {variant_args.output_pqr}.")
+            write_outputs(variant_args, results, variant_biomolecule, is_cif)
+    results, biomolecule = variant_results[0]
+    return results["missed_residues"], results["pka_df"], biomolecule
+
+
+def write_outputs(args, results, biomolecule, is_cif):
+    """Write the PQR file and any optional PDB and APBS files.
+
+    :param args:  command-line arguments
+    :type args:  argparse.Namespace
+    :param results:  results from :func:`process_model`
+    :type results:  dict
+    :param biomolecule:  processed biomolecule
+    :type biomolecule:  Biomolecule
+    :param is_cif:  indicates whether file is CIF format
+    :type is_cif:  bool
+    """
+    if args.output_format == "npz":
+        io.write_npz(args.output_pqr, results["atoms"])
+    else:
+        print_pqr(
+            args=args,
+            pqr_lines=results["lines"],
+            header_lines=results["header"],
+            missing_lines=results["missed_residues"],
+            is_cif=is_cif,
+        )
     if args.pdb_output:
         print_pdb(
             args=args,
@@ -830,6 +1406,172 @@ def main_driver(args: argparse.Namespace):
         )
     if args.apbs_input:
         io.dump_apbs(args.output_pqr, args.apbs_input)
+
+
+def model_path(path, serial):
+    """Add a model number to a file name.
+
+    For example, model 2 of ``out.pqr.gz`` is ``out_2.pqr.gz``.
+
+    :param path:  path to file
+    :type path:  str
+    :param serial:  model serial number
+    :type serial:  int
+    :return:  path to file for model
+    :rtype:  str
+    """
+    return suffixed_path(path, serial)
+
+
+def variant_path(path, ff_name=None, ph=None):
+    """Add a forcefield name and/or pH to a file name.
+
+    For example, the AMBER output at pH 7.5 for ``out.pqr.gz`` is
+    ``out_amber_ph7.5.pqr.gz``.
+
+    :param path:  path to file
+    :type path:  str
+    :param ff_name:  forcefield name (not added if None)
+    :type ff_name:  str
+    :param ph:  pH (not added if None)
+    :type ph:  float
+    :return:  path to file for forcefield and pH
+    :rtype:  str
+    """
+    suffixes = []
+    if ff_name is not None:
+        suffixes.append(ff_name.lower())
+    if ph is not None:
+        suffixes.append(f"ph{ph:g}")
+    return suffixed_path(path, "_".join(suffixes))
+
+
+def suffixed_path(path, suffix):
+    """Add a suffix to the stem of a file name.
+
+    :param path:  path to file (possibly compressed)
+    :type path:  str
+    :param suffix:  suffix appended to the stem after an underscore
+    :type suffix:  str
+    :return:  path to file
+    :rtype:  str
+    """
+    path = Path(path)
+    compression = ""
+    if path.suffix.lower() in COMPRESSED_OPENERS:
+        compression = path.suffix
+        path = path.with_suffix("")
+    return str(
+        path.with_name(f"{path.stem}_{suffix}{path.suffix}{compression}")
+    )
+
+
+def model_lines(lines, serial):
+    """Wrap the output lines for one model in MODEL/ENDMDL records.
+
+    :param lines:  lines from :func:`io.print_biomolecule_atoms`
+    :type lines:  [str]
+    :param serial:  model serial number
+    :type serial:  int
+    :return:  lines for model
+    :rtype:  [str]
+    """
+    lines = list(lines)
+    if lines and lines[-1] == "TER\nEND":
+        lines[-1] = "TER\n"
+    return [f"MODEL     {serial:4d}\n", *lines, "ENDMDL\n"]
+
+
+def run_ensemble(args, pdblist, definition, is_cif, profile=None):
+    """Process every model in a multi-model structure.
+
+    The forcefield and hydrogen definitions are loaded once and reused for
+    every model.  Depending on ``args.ensemble``, each model is written to
+    its own file (``split``) or all models are written to a single file with
+    MODEL/ENDMDL records (``multi``).
+
+    :param args:  command-line arguments
+    :type args:  argparse.Namespace
+    :param pdblist:  list or iterable of PDB records for all models
+    :type pdblist:  list
+    :param definition:  topology definition
+    :type definition:  Definition
+    :param is_cif:  indicates whether file is CIF format
+    :type is_cif:  bool
+    :param profile:  profile for recording the time of each phase
+    :type profile:  Profile
+    :return:  (missing atoms, PROPKA results, biomolecule) for the first
+        model
+    :rtype:  (list, list, Biomolecule)
+    """
+    if profile is None:
+        profile = profiling.Profile()
+    forcefield_ = hydrogen_handler = None
+    if not args.clean:
+        _LOGGER.info("Loading forcefield.")
+        with profile.phase("forcefield"):
+            forcefield_ = shared.get_forcefield(
+                args.ff, definition, args.userff, args.usernames
+            )
+        _LOGGER.info("Loading hydrogen topology definitions.")
+        with profile.phase("hydrogen handler"):
+            hydrogen_handler = shared.get_hydrogen_handler()
+    first = None
+    pqr_lines = []
+    pdb_lines = []
+    for serial, model_pdblist in pdb.iter_models(pdblist):
+        _LOGGER.info(f"Processing model {serial}.")
+        results, biomolecule = process_model(
+            args,
+            model_pdblist,
+            definition,
+            is_cif,
+            forcefield_=forcefield_,
+            hydrogen_handler=hydrogen_handler,
+            profile=profile,
+        )
+        profile.start("output")
+        if first is None:
+            first = results, biomolecule
+        if args.ensemble == "split":
+            model_args = argparse.Namespace(**vars(args))
+            model_args.output_pqr = model_path(args.output_pqr, serial)
+            if args.pdb_output:
+                model_args.pdb_output = model_path(args.pdb_output, serial)
+            if args.apbs_input:
+                model_args.apbs_input = model_path(args.apbs_input, serial)
+            write_outputs(model_args, results, biomolecule, is_cif)
+        else:
+            pqr_lines += model_lines(results["lines"], serial)
+            if args.pdb_output:
+                pdb_lines += model_lines(
+                    io.print_biomolecule_atoms(
+                        biomolecule.atoms,
+                        chainflag=args.keep_chain,
+                        pdbfile=True,
+                    ),
+                    serial,
+                )
+        profile.stop()
+    results, biomolecule = first
+    if args.ensemble == "multi":
+        profile.start("output")
+        print_pqr(
+            args=args,
+            pqr_lines=[*pqr_lines, "END"],
+            header_lines=results["header"],
+            missing_lines=results["missed_residues"],
+            is_cif=is_cif,
+        )
+        if args.pdb_output:
+            print_pdb(
+                args=args,
+                pdb_lines=[*pdb_lines, "END"],
+                header_lines=results["header"],
+                missing_lines=results["missed_residues"],
+                is_cif=is_cif,
+            )
+        profile.stop()
     return results["missed_residues"], results["pka_df"], biomolecule
 
 
@@ -842,20 +1584,22 @@ def main():
         sys.exit(1)
 
 
-def run_pdb2pqr(args: Sequence[str | PathLike]):
+def run_pdb2pqr(args: Sequence[str | PathLike], profile=None):
     """Run PDB2PQR with a list of arguments.
 
     Logger is not set up so that it can be called multiple times.
 
     :param args:  list of command-line arguments
     :type args:  list
+    :param profile:  profile for recording the time of each phase
+    :type profile:  Profile
     :return:  results of PDB2PQR run
     :rtype:  tuple
     """
     args_strlist = [str(arg) for arg in args]
     parser = build_main_parser()
     args_parsed = parser.parse_args(args_strlist)
-    return main_driver(args_parsed)
+    return main_driver(args_parsed, profile=profile)
 
 
 def dx_to_cube():
@@ -890,9 +1634,10 @@ def dx_to_cube():
     _LOGGER.info(f"Reading PQR from {args.pqr_input}...")
     with open(args.pqr_input) as pqr_file:
         atom_list = io.read_pqr(pqr_file)
-    _LOGGER.info(f"Reading DX from {args.dx_input}...")
-    with open(args.dx_input) as dx_file:
-        dx_dict = io.read_dx(dx_file)
-    _LOGGER.info(f"Writing Cube to {args.output}...")
-    with open(args.output, "w") as cube_file:
-        io.write_cube(cube_file, dx_dict, atom_list)
+    _LOGGER.info(
+        f"Converting DX from {args.dx_input} to Cube in {args.output}..."
+    )
+    with open(args.dx_input) as dx_file, open(args.output, "w") as cube_file:
+        dx_dict = io.read_dx_header(dx_file)
+        io.write_cube_header(cube_file, dx_dict, atom_list)
+        io.write_cube_values(cube_file, io.iter_dx_values(dx_file))
@@ -15,6 +15,8 @@ from .pdb import ATOM, HETATM
 class Nucleic(residue.Residue):
     """This class provides standard features of the nucleic acids listed below."""
 
+    __slots__ = ()
+
     def __init__(self, atoms: list[ATOM | HETATM], ref: DefinitionResidue):
         sample_atom = atoms[-1]
 
@@ -26,6 +28,8 @@ class Nucleic(residue.Residue):
 
         self.ffname = self.name
         self.map: dict[str, struct.Atom] = {}
+        self.biomolecule = None
+        self._charge = None
         self.dihedrals = []
         self.patches = []
         self.is3term = 0
@@ -81,18 +85,14 @@ class Nucleic(residue.Residue):
         :param atom:  atom to add to system.
         :type atom:  Atom
         """
-        self.atoms.append(atom)
+        residue.Residue.add_atom(self, atom)
         atomname = atom.name
-        self.map[atomname] = atom
         try:
             atom.reference = self.reference.map[atomname]
             for bond in atom.reference.bonds:
                 if self.has_atom(bond):
                     bondatom = self.map[bond]
-                    if bondatom not in atom.bonds:
-                        atom.bonds.append(bondatom)
-                    if atom not in bondatom.bonds:
-                        bondatom.bonds.append(atom)
+                    atom.connect(bondatom)
         except KeyError:
             atom.reference = None
 
@@ -115,6 +115,8 @@ class Nucleic(residue.Residue):
 class ADE(Nucleic):
     """Adenosine class."""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize residue.
 
@@ -146,6 +148,8 @@ A = ADE
 class CYT(Nucleic):
     """Cytidine class"""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize residue.
 
@@ -177,6 +181,8 @@ C = CYT
 class GUA(Nucleic):
     """Guanosine class"""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize residue.
 
@@ -208,6 +214,8 @@ G = GUA
 class THY(Nucleic):
     """Thymine class"""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize residue.
 
@@ -237,6 +245,8 @@ DT = THY
 class URA(Nucleic):
     """Uridine class"""
 
+    __slots__ = ()
+
     def __init__(self, atoms, ref: DefinitionResidue):
         """Initialize residue.
 
@@ -12,6 +12,8 @@ the classes is taken directly from the above PDB Format Description.
 
 import logging
 
+import numpy as np
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -594,6 +596,27 @@ class HETATM(BaseRecord):
             self.element = ""
             self.charge = ""
 
+    @classmethod
+    def from_fields(cls, **fields):
+        """Create a record from field values rather than a line of text.
+
+        :param fields:  values for the :class:`ATOM` fields (``serial``,
+            ``name``, ``res_name``, ``res_seq``, ``x``, ``y``, ``z``, etc.);
+            see :func:`atom_from_fields`
+        :type fields:  dict
+        :return:  new record
+        :rtype:  HETATM
+        """
+        record = atom_from_fields(cls, **fields)
+        record.sybyl_type = "A.aaa"
+        record.l_bonded_atoms = []
+        record.l_bonds = []
+        record.radius = 1.0
+        record.is_c_term = 0
+        record.is_n_term = 0
+        record.mol2charge = None
+        return record
+
 
 @register_line_parser
 class ATOM(BaseRecord):
@@ -674,6 +697,19 @@ class ATOM(BaseRecord):
             self.element = ""
             self.charge = ""
 
+    @classmethod
+    def from_fields(cls, **fields):
+        """Create a record from field values rather than a line of text.
+
+        :param fields:  values for the fields listed above (``serial``,
+            ``name``, ``res_name``, ``res_seq``, ``x``, ``y``, ``z``, etc.);
+            see :func:`atom_from_fields`
+        :type fields:  dict
+        :return:  new record
+        :rtype:  ATOM
+        """
+        return atom_from_fields(cls, **fields)
+
 
 @register_line_parser
 class MODEL(BaseRecord):
@@ -2514,6 +2550,93 @@ class HEADER(BaseRecord):
         self.id_code = line[62:66].strip()
 
 
+def atom_from_fields(
+    klass,
+    *,
+    serial,
+    name,
+    res_name,
+    res_seq,
+    x,
+    y,
+    z,
+    alt_loc="",
+    chain_id="",
+    ins_code="",
+    occupancy=0.00,
+    temp_factor=0.00,
+    seg_id="",
+    element="",
+    charge="",
+):
+    """Create an ATOM or HETATM record without parsing a PDB line.
+
+    Unlike parsing a line, the fields are not limited to the fixed PDB column
+    widths (e.g., multi-character chain IDs and 5-digit residue numbers are
+    kept intact).  The ``original_text`` of the record is a PDB-formatted
+    rendering of the fields.
+
+    :param klass:  record class (:class:`ATOM` or :class:`HETATM`)
+    :type klass:  type
+    :param serial:  atom serial number
+    :type serial:  int
+    :param name:  atom name
+    :type name:  str
+    :param res_name:  residue name
+    :type res_name:  str
+    :param res_seq:  residue sequence number
+    :type res_seq:  int
+    :param x:  X coordinate
+    :type x:  float
+    :param y:  Y coordinate
+    :type y:  float
+    :param z:  Z coordinate
+    :type z:  float
+    :param alt_loc:  alternate location indicator
+    :type alt_loc:  str
+    :param chain_id:  chain identifier
+    :type chain_id:  str
+    :param ins_code:  code for insertion of residues
+    :type ins_code:  str
+    :param occupancy:  occupancy
+    :type occupancy:  float
+    :param temp_factor:  temperature factor
+    :type temp_factor:  float
+    :param seg_id:  segment identifier
+    :type seg_id:  str
+    :param element:  element symbol
+    :type element:  str
+    :param charge:  charge on the atom
+    :type charge:  str
+    :return:  new record
+    :rtype:  BaseRecord
+    """
+    record = klass.__new__(klass)
+    atom_name = f"{name:<4}" if len(name) >= 4 else f" {name:<3}"
+    record.original_text = (
+        f"{klass.__name__:<6}{serial:>5} {atom_name}{alt_loc:1}"
+        f"{res_name:>3} {chain_id:1}{res_seq:>4}{ins_code:1}   "
+        f"{x:8.3f}{y:8.3f}{z:8.3f}{occupancy:6.2f}{temp_factor:6.2f}"
+        f"      {seg_id:<4}{element:>2}{charge:2}"
+    ).rstrip()
+    record.serial = serial
+    record.name = name
+    record.alt_loc = alt_loc
+    record.res_name = res_name
+    record.chain_id = chain_id
+    record.res_seq = res_seq
+    record.ins_code = ins_code
+    record.x = x
+    record.y = y
+    record.z = z
+    record.occupancy = occupancy
+    record.temp_factor = temp_factor
+    record.seg_id = seg_id
+    record.element = element
+    record.charge = charge
+    return record
+
+
 def read_atom(line):
     """If the ATOM/HETATM is not column-formatted, try to get some information
     by parsing whitespace from the right.  Look for five floating point
@@ -2551,21 +2674,35 @@ def read_atom(line):
     return klass(newline)
 
 
-def read_pdb(file_):
-    """Parse PDB-format data into array of Atom objects.
+#: Record types needed to build a biomolecule from coordinates
+COORDINATE_RECORDS = frozenset(
+    ["ATOM", "HETATM", "TER", "MODEL", "ENDMDL", "END"]
+)
+
+
+def iter_records(file_, types=None, errlist=None):
+    """Lazily parse PDB-format data, one record at a time.
+
+    Lines whose record type is not in ``types`` are skipped without creating
+    a record object.
 
     :param file_:  open File-like object
     :type file_:  file
-    :return:  (a list of objects from this module, a list of record names that
-        couldn't be parsed)
-    :rtype:  (list, list)
+    :param types:  record names to parse (e.g., :data:`COORDINATE_RECORDS`);
+        all records are parsed if None
+    :type types:  set
+    :param errlist:  list to which names of records that couldn't be parsed
+        are appended
+    :type errlist:  list
+    :return:  generator of objects from this module
+    :rtype:  BaseRecord
     """
-    pdblist = []  # Array of parsed lines (as objects)
-    errlist = []  # List of records we can't parse
+    if errlist is None:
+        errlist = []
 
     # We can come up with nothing if can't get our file off the web.
     if file_ is None:
-        return pdblist, errlist
+        return
 
     while True:
         line = file_.readline().strip()
@@ -2577,10 +2714,12 @@ def read_pdb(file_):
         record = ""
         try:
             record = line[0:6].strip()
+            if types is not None and record not in types:
+                continue
             if record not in errlist:
                 klass = LINE_PARSERS[record]
                 obj = klass(line)
-                pdblist.append(obj)
+                yield obj
         except (KeyError, ValueError) as details:
             if record not in ["HETATM", "ATOM"]:
                 errlist.append(record)
@@ -2595,10 +2734,11 @@ def read_pdb(file_):
             if record in ["ATOM", "HETATM"]:
                 try:
                     obj = read_atom(line)
-                    pdblist.append(obj)
                 except IndexError as details:
                     _LOGGER.error(f"Error parsing line: {details},")
                     _LOGGER.error(f"<{line.strip()}>")
+                else:
+                    yield obj
             elif record in ["SITE", "TURN"]:
                 pass
             elif record in ["SSBOND", "LINK"]:
@@ -2607,4 +2747,325 @@ def read_pdb(file_):
             else:
                 _LOGGER.error(f"Error parsing line: {details},")
                 _LOGGER.error(f"<{line.strip()}>")
+
+
+def read_pdb(file_):
+    """Parse PDB-format data into array of Atom objects.
+
+    :param file_:  open File-like object
+    :type file_:  file
+    :return:  (a list of objects from this module, a list of record names that
+        couldn't be parsed)
+    :rtype:  (list, list)
+    """
+    errlist = []  # List of records we can't parse
+    pdblist = list(iter_records(file_, errlist=errlist))
     return pdblist, errlist
+
+
+def iter_models(pdblist):
+    """Split records into separate lists for each model.
+
+    Records before the first MODEL record (e.g., the header) are included in
+    the list for every model; records after the last ENDMDL record are
+    dropped.  Records without any MODEL records are treated as a single
+    model.
+
+    :param pdblist:  list or iterable of objects from this module
+    :type pdblist:  list
+    :return:  generator of (model serial number, list of records for model)
+    :rtype:  (int, list)
+    """
+    shared = []
+    model = None
+    serial = None
+    for record in pdblist:
+        if isinstance(record, MODEL):
+            if model is not None:
+                yield serial, model
+            serial = record.serial
+            model = [*shared, record]
+        elif model is not None:
+            model.append(record)
+            if isinstance(record, ENDMDL):
+                yield serial, model
+                model = None
+        elif serial is None:
+            shared.append(record)
+    if model is not None:
+        yield serial, model
+    elif serial is None:
+        yield 1, shared
+
+
+#: ATOM/HETATM string columns and their (0-based, end-exclusive) line slices
+ATOM_STRING_COLUMNS = {
+    "record": (0, 6),
+    "name": (12, 16),
+    "alt_loc": (16, 17),
+    "res_name": (17, 20),
+    "chain_id": (21, 22),
+    "ins_code": (26, 27),
+    "seg_id": (72, 76),
+    "element": (76, 78),
+    "charge": (78, 80),
+}
+
+
+class ColumnRecord:
+    """A lightweight view of a single row of :class:`AtomColumns`.
+
+    Provides the same attributes as :class:`ATOM` and :class:`HETATM` so that
+    residues can be built from columnar data without parsing a record object
+    for every line.
+    """
+
+    __slots__ = (
+        "alt_loc",
+        "chain_id",
+        "charge",
+        "element",
+        "ins_code",
+        "mol2charge",
+        "name",
+        "occupancy",
+        "record",
+        "res_name",
+        "res_seq",
+        "seg_id",
+        "serial",
+        "temp_factor",
+        "x",
+        "y",
+        "z",
+    )
+
+    def record_type(self):
+        """Return PDB record type as string.
+
+        :return:  record type
+        :rtype:  str
+        """
+        return self.record
+
+
+class AtomColumns:
+    """Column-oriented storage for ATOM and HETATM records.
+
+    Each field is a :mod:`numpy` array with one entry per atom record; the
+    field names match the attributes of :class:`ATOM`.  Coordinates are stored
+    in a single ``(N, 3)`` array, :attr:`coords`.
+
+    Two bookkeeping columns are also kept: :attr:`model` is the number of
+    MODEL records that preceded each atom and :attr:`ter` is the number of TER
+    records that preceded each atom.  :attr:`num_ter` is the total number of
+    TER records in the file.
+    """
+
+    def __init__(self, lines=(), model=None, ter=None, num_ter=0):
+        """Slice fixed-width ATOM/HETATM lines into columns.
+
+        :param lines:  ATOM/HETATM lines without line terminators
+        :type lines:  [str]
+        :param model:  number of MODEL records preceding each line
+        :type model:  [int]
+        :param ter:  number of TER records preceding each line
+        :type ter:  [int]
+        :param num_ter:  total number of TER records in the file
+        :type num_ter:  int
+        :raises ValueError:  if a mandatory numeric column can't be parsed
+        """
+        num_lines = len(lines)
+        chars = np.array(lines, dtype="U80").view("U1").reshape(num_lines, 80)
+        for field, (start, stop) in ATOM_STRING_COLUMNS.items():
+            setattr(self, field, self._slice(chars, start, stop))
+        self.serial = self._slice(chars, 6, 11).astype(np.int64)
+        self.res_seq = self._slice(chars, 22, 26).astype(np.int64)
+        self.coords = np.empty((num_lines, 3), dtype=np.float64)
+        for i, start in enumerate((30, 38, 46)):
+            self.coords[:, i] = self._slice(chars, start, start + 8).astype(
+                np.float64
+            )
+        occupancy = self._slice(chars, 54, 60)
+        temp_factor = self._slice(chars, 60, 66)
+        # Like ATOM, fall back to defaults for all of the optional fields when
+        # occupancy or temperature factor are missing or not numbers.
+        missing = (occupancy == "") | (temp_factor == "")
+        occupancy[missing] = "0"
+        temp_factor[missing] = "0"
+        try:
+            self.occupancy = occupancy.astype(np.float64)
+            self.temp_factor = temp_factor.astype(np.float64)
+        except ValueError:
+            invalid = ~(
+                self._is_number(occupancy) & self._is_number(temp_factor)
+            )
+            missing |= invalid
+            occupancy[invalid] = "0"
+            temp_factor[invalid] = "0"
+            self.occupancy = occupancy.astype(np.float64)
+            self.temp_factor = temp_factor.astype(np.float64)
+        for field in ("seg_id", "element", "charge"):
+            getattr(self, field)[missing] = ""
+        self.model = np.zeros(num_lines, dtype=np.int64)
+        if model is not None:
+            self.model[:] = model
+        self.ter = np.zeros(num_lines, dtype=np.int64)
+        if ter is not None:
+            self.ter[:] = ter
+        self.num_ter = num_ter
+
+    @staticmethod
+    def _is_number(values):
+        """Test which strings can be converted to numbers.
+
+        :param values:  array of strings
+        :type values:  numpy.ndarray
+        :return:  boolean array that is True for numbers
+        :rtype:  numpy.ndarray
+        """
+        valid = np.ones(len(values), dtype=bool)
+        for index, value in enumerate(values.tolist()):
+            try:
+                float(value)
+            except ValueError:
+                valid[index] = False
+        return valid
+
+    @staticmethod
+    def _slice(chars, start, stop):
+        """Extract one fixed-width column as a stripped string array.
+
+        :param chars:  ``(N, 80)`` array of single characters
+        :type chars:  numpy.ndarray
+        :param start:  first column (0-based)
+        :type start:  int
+        :param stop:  last column (exclusive)
+        :type stop:  int
+        :return:  array of stripped strings
+        :rtype:  numpy.ndarray
+        """
+        width = stop - start
+        field = np.ascontiguousarray(chars[:, start:stop]).view(f"U{width}")
+        return np.char.strip(field.ravel())
+
+    def __len__(self):
+        return len(self.serial)
+
+    @property
+    def x(self):
+        """X coordinates (a view of :attr:`coords`)."""
+        return self.coords[:, 0]
+
+    @property
+    def y(self):
+        """Y coordinates (a view of :attr:`coords`)."""
+        return self.coords[:, 1]
+
+    @property
+    def z(self):
+        """Z coordinates (a view of :attr:`coords`)."""
+        return self.coords[:, 2]
+
+    def take(self, index):
+        """Return a new object with only the selected rows.
+
+        :param index:  boolean mask or integer indices of rows to keep
+        :type index:  numpy.ndarray
+        :return:  subset of columns
+        :rtype:  AtomColumns
+        """
+        subset = self.__class__.__new__(self.__class__)
+        for field in (
+            *ATOM_STRING_COLUMNS,
+            "serial",
+            "res_seq",
+            "coords",
+            "occupancy",
+            "temp_factor",
+            "model",
+            "ter",
+        ):
+            setattr(subset, field, getattr(self, field)[index])
+        subset.num_ter = self.num_ter
+        return subset
+
+    def records(self, start=0, stop=None):
+        """Yield row views for a range of atoms.
+
+        :param start:  first row
+        :type start:  int
+        :param stop:  last row (exclusive); defaults to the end
+        :type stop:  int
+        :return:  generator of row views
+        :rtype:  ColumnRecord
+        """
+        stop = len(self) if stop is None else stop
+        fields = {
+            field: getattr(self, field)[start:stop].tolist()
+            for field in (
+                *ATOM_STRING_COLUMNS,
+                "serial",
+                "res_seq",
+                "occupancy",
+                "temp_factor",
+            )
+        }
+        coords = self.coords[start:stop].tolist()
+        for i, (x, y, z) in enumerate(coords):
+            row = ColumnRecord()
+            for field, values in fields.items():
+                setattr(row, field, values[i])
+            row.x = x
+            row.y = y
+            row.z = z
+            row.mol2charge = None
+            yield row
+
+
+def read_pdb_columns(file_):
+    """Parse PDB-format data into columns without per-line record objects.
+
+    ATOM and HETATM lines are sliced directly into :class:`AtomColumns`; all
+    other lines are kept as raw text.
+
+    :param file_:  open File-like object
+    :type file_:  file
+    :return:  (ATOM/HETATM columns, list of other lines, list of record names
+        that are not recognized)
+    :rtype:  (AtomColumns, [str], [str])
+    """
+    atom_lines = []
+    model = []
+    ter = []
+    other_lines = []
+    errlist = []
+    num_models = 0
+    num_ter = 0
+    if file_ is None:
+        return AtomColumns(), other_lines, errlist
+    for raw_line in file_:
+        line = raw_line.strip()
+        if line == "":
+            break
+        record = line[0:6].strip()
+        if record in ("ATOM", "HETATM"):
+            if len(line) < 27:
+                # Not column-formatted; see read_atom
+                atom_lines.append(read_atom(line).original_text)
+            else:
+                atom_lines.append(line)
+            model.append(num_models)
+            ter.append(num_ter)
+            continue
+        if record == "MODEL":
+            num_models += 1
+        elif record == "TER":
+            num_ter += 1
+        elif record not in LINE_PARSERS and record not in errlist:
+            errlist.append(record)
+            _LOGGER.error(f"Error parsing line: {record}")
+            _LOGGER.error(f"<{line}>")
+        other_lines.append(line)
+    columns = AtomColumns(atom_lines, model=model, ter=ter, num_ter=num_ter)
+    return columns, other_lines, errlist
@@ -0,0 +1,118 @@
+"""Timing and memory profiles of PDB2PQR runs.
+
+A :class:`Profile` records the wall time, CPU time, and peak resident set
+size (RSS) of each phase of a run, e.g.:
+
+.. code-block:: python
+
+    profile = Profile()
+    with profile.phase("definitions"):
+        definition = io.get_definitions()
+    profile.start("debump")
+    ...
+    profile.start("hydrogens")
+    ...
+    profile.stop()
+    profile.as_dict()
+"""
+
+import json
+import logging
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def peak_rss():
+    """Get the peak resident set size of this process.
+
+    :return:  peak RSS in bytes (None if not available on this platform)
+    :rtype:  int
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes and macOS reports bytes
+    return max_rss if sys.platform == "darwin" else 1024 * max_rss
+
+
+class Profile:
+    """Per-phase wall time, CPU time, and peak RSS of a run."""
+
+    def __init__(self):
+        self.phases = []
+        self._current = None
+
+    def start(self, name):
+        """Start a phase, ending the current phase (if any).
+
+        :param name:  name of phase
+        :type name:  str
+        """
+        self.stop()
+        self._current = (name, time.perf_counter(), time.process_time())
+
+    def stop(self):
+        """End the current phase (if any)."""
+        if self._current is None:
+            return
+        name, wall_start, cpu_start = self._current
+        self._current = None
+        phase = {
+            "name": name,
+            "wall": time.perf_counter() - wall_start,
+            "cpu": time.process_time() - cpu_start,
+            "peak_rss": peak_rss(),
+        }
+        _LOGGER.debug(
+            f"Phase {name} took {phase['wall']:.3f} s "
+            f"({phase['cpu']:.3f} s CPU)"
+        )
+        self.phases.append(phase)
+
+    @contextmanager
+    def phase(self, name):
+        """Record a phase for the duration of a ``with`` block.
+
+        :param name:  name of phase
+        :type name:  str
+        """
+        self.start(name)
+        try:
+            yield self
+        finally:
+            self.stop()
+
+    def as_dict(self):
+        """Summarize the profile.
+
+        :return:  dictionary with the list of ``phases`` (each with ``name``,
+            ``wall`` and ``cpu`` time in seconds, and ``peak_rss`` in bytes
+            at the end of the phase) and the ``total_wall``,
+            ``total_cpu``, and ``peak_rss`` over all phases
+        :rtype:  dict
+        """
+        rss = [phase["peak_rss"] for phase in self.phases]
+        rss = [value for value in rss if value is not None]
+        return {
+            "phases": list(self.phases),
+            "total_wall": sum(phase["wall"] for phase in self.phases),
+            "total_cpu": sum(phase["cpu"] for phase in self.phases),
+            "peak_rss": max(rss, default=None),
+        }
+
+    def write_json(self, path):
+        """Write the profile summary to a JSON file.
+
+        :param path:  path to JSON file
+        :type path:  str
+        """
+        with open(path, "w") as json_file:
+            json.dump(self.as_dict(), json_file, indent=2)
@@ -16,6 +16,7 @@ import logging
 from math import log
 
 from .config import TITLE_STR
+from .utilities import open_file
 
 #: The number of Angstroms added to the molecular dimensions to determine the
 #: find grid dimensions
@@ -112,7 +113,7 @@ class Psize:
         :param filename:  string with path to PDB- or PQR-format file.
         :type filename:  str
         """
-        with open(filename, encoding="utf-8") as file_:
+        with open_file(filename) as file_:
             self.parse_lines(file_.readlines())
 
     def parse_lines(self, lines):
@@ -24,7 +24,29 @@ class Residue:
     residue and other helper functions.
     """
 
-    def __init__(self, atoms: list[pdb.ATOM | pdb.HETATM]):
+    __slots__ = (
+        "_charge",
+        "atoms",
+        "biomolecule",
+        "chain_id",
+        "dihedrals",
+        "ffname",
+        "fixed",
+        "ins_code",
+        "is3term",
+        "is5term",
+        "is_c_term",
+        "is_n_term",
+        "map",
+        "missing",
+        "name",
+        "naname",
+        "patches",
+        "reference",
+        "res_seq",
+    )
+
+    def __init__(self, atoms: list[pdb.ATOM | pdb.HETATM | pdb.ColumnRecord]):
         """Initialize the class
 
         :param atoms:  list of atom-like (:class:`HETATM` or :class:`ATOM`)
@@ -43,12 +65,16 @@ class Residue:
         self.is_n_term = None
         self.is_c_term = None
         self.dihedrals = []
+        self.biomolecule = None
+        self._charge = None
         atomclass = ""
         for atom in atoms:
             if isinstance(atom, pdb.ATOM):
                 atomclass = "ATOM"
             elif isinstance(atom, pdb.HETATM):
                 atomclass = "HETATM"
+            elif isinstance(atom, pdb.ColumnRecord):
+                atomclass = atom.record
             atom = structures.Atom(atom, atomclass, self)
             atomname = atom.name
             if atomname not in self.map:
@@ -132,6 +158,8 @@ class Residue:
         """
         self.atoms.append(atom)
         self.map[atom.name] = atom
+        self.update_biomolecule(added=[atom])
+        self.charge_changed()
 
     def remove_atom(self, atomname):
         """Remove an atom from the residue object.
@@ -142,15 +170,34 @@ class Residue:
         # Delete the atom from the map
         atom = self.map[atomname]
         bonds = atom.bonds
+        graph = atom.bond_graph
         del self.map[atomname]
         # Delete the atom from the list
         self.atoms.remove(atom)
         # Delete all instances of the atom as a bond
-        for bondatom in bonds:
-            if atom in bondatom.bonds:
-                bondatom.bonds.remove(atom)
+        if graph is not None:
+            graph.remove_atom(atom)
+        else:
+            for bondatom in bonds:
+                bondatom.remove_bond(atom)
+        self.update_biomolecule(removed=[atom])
+        self.charge_changed()
         del atom
 
+    def update_biomolecule(self, added=(), removed=()):
+        """Update the atom index of the biomolecule containing this residue.
+
+        This is called whenever atoms are added, removed, or reordered (see
+        :meth:`Biomolecule.update_atoms`).
+
+        :param added:  atoms added to the residue
+        :type added:  [Atom]
+        :param removed:  atoms removed from the residue
+        :type removed:  [Atom]
+        """
+        if self.biomolecule is not None:
+            self.biomolecule.update_atoms(added=added, removed=removed)
+
     def rename_atom(self, oldname, newname):
         """Rename an atom to a new name.
 
@@ -189,15 +236,31 @@ class Residue:
         """Get the total charge of the residue.
 
         In order to get rid of floating point rounding error, do a string
-        transformation.
+        transformation.  The charge is cached until an atom charge changes
+        or atoms are added or removed (see :meth:`charge_changed`).
 
         Returns:
             charge: The charge of the residue (float)
         """
-        charge = (atom.ffcharge for atom in self.atoms if atom.ffcharge)
-        charge = sum(charge)
-        charge = float(f"{charge:.4f}")
-        return charge
+        if self._charge is None:
+            charge = (atom.ffcharge for atom in self.atoms if atom.ffcharge)
+            charge = sum(charge)
+            self._charge = float(f"{charge:.4f}")
+        return self._charge
+
+    def charge_changed(self):
+        """Discard the cached charge of the residue and its biomolecule.
+
+        This is called when the charge of an atom is set and when atoms are
+        added or removed.
+        """
+        if self._charge is None:
+            # The biomolecule charges are only cached once every residue
+            # charge is, so there is nothing more to discard
+            return
+        self._charge = None
+        if self.biomolecule is not None:
+            self.biomolecule.charges_changed()
 
     def rename_residue(self, name):
         """Rename the residue.
@@ -329,6 +392,7 @@ class Residue:
                 templist.append(atom)
         # Change the list pointer
         self.atoms = templist[:]
+        self.update_biomolecule()
 
     def letter_code(self) -> str:
         """Default letter code for residue.
@@ -0,0 +1,193 @@
+"""Parameters shared by PDB2PQR runs in several worker processes.
+
+Topology definitions, forcefields, and hydrogen definitions do not depend on
+the structure being processed.  A :class:`ParameterStore` loads them once so
+they can be reused by every run in a process and handed to worker processes:
+
+.. code-block:: python
+
+    store = shared.ParameterStore(ff_names=["parse"])
+    with shared.share(store) as initargs, ProcessPoolExecutor(
+        initializer=shared.init_worker, initargs=initargs
+    ) as executor:
+        executor.map(run_pdb2pqr, jobs)
+
+Forked workers inherit the parent's store without copying; the store is
+moved out of the reach of the cyclic garbage collector (:func:`gc.freeze`)
+so its memory pages stay shared with the parent.  Spawned workers receive
+the store in pickled form and load it once without parsing any data files.
+"""
+
+import gc
+import logging
+import pickle
+from contextlib import contextmanager
+
+from . import forcefield, hydrogens, io
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ParameterStore:
+    """Parameters loaded once and shared by many runs.
+
+    The stored objects are shared by every run that uses them and must be
+    treated as read-only.
+    """
+
+    #: Store installed in this process (see :func:`install`)
+    installed = None
+
+    def __init__(self, definition=None, ff_names=(), cache_dir=None):
+        """Load parameters.
+
+        :param definition:  topology definitions (loaded if None)
+        :type definition:  Definition
+        :param ff_names:  names of forcefields to load now
+        :type ff_names:  [str]
+        :param cache_dir:  directory for caching compiled definitions
+        :type cache_dir:  str
+        """
+        if definition is None:
+            definition = io.get_definitions(cache_dir=cache_dir)
+        self.definition = definition
+        self.forcefields = {}
+        self._hydrogen_handler = None
+        for ff_name in ff_names:
+            self.get_forcefield(ff_name)
+
+    def get_forcefield(self, ff_name, userff=None, usernames=None):
+        """Get a forcefield, loading it if needed.
+
+        :param ff_name:  the name of the forcefield (can be None)
+        :type ff_name:  str
+        :param userff:  path for user-defined forcefields file
+        :type userff:  str
+        :param usernames:  path to user-defined atom/residue names file
+        :type usernames:  str
+        :return:  forcefield
+        :rtype:  Forcefield
+        """
+        key = (ff_name, userff, usernames)
+        if key not in self.forcefields:
+            self.forcefields[key] = forcefield.Forcefield(
+                ff_name, self.definition, userff, usernames
+            )
+        return self.forcefields[key]
+
+    @property
+    def hydrogen_handler(self):
+        """Hydrogen topology definitions (loaded on first use).
+
+        :rtype:  HydrogenHandler
+        """
+        if self._hydrogen_handler is None:
+            self._hydrogen_handler = hydrogens.create_handler()
+        return self._hydrogen_handler
+
+
+def install(store):
+    """Use a parameter store for the runs in this process.
+
+    :param store:  parameter store (or None to stop using a store)
+    :type store:  ParameterStore
+    """
+    ParameterStore.installed = store
+
+
+def get_store():
+    """Get the parameter store installed in this process.
+
+    :return:  parameter store or None if none is installed
+    :rtype:  ParameterStore
+    """
+    return ParameterStore.installed
+
+
+def get_definitions(cache_dir=None):
+    """Get topology definitions from the installed store or load them.
+
+    :param cache_dir:  directory for caching compiled definitions
+    :type cache_dir:  str
+    :return:  topology definitions
+    :rtype:  Definition
+    """
+    store = get_store()
+    if store is not None:
+        return store.definition
+    return io.get_definitions(cache_dir=cache_dir)
+
+
+def get_forcefield(ff_name, definition, userff=None, usernames=None):
+    """Get a forcefield from the installed store or load it.
+
+    :param ff_name:  the name of the forcefield (can be None)
+    :type ff_name:  str
+    :param definition:  the definition object for the forcefield
+    :type definition:  Definition
+    :param userff:  path for user-defined forcefields file
+    :type userff:  str
+    :param usernames:  path to user-defined atom/residue names file
+    :type usernames:  str
+    :return:  forcefield
+    :rtype:  Forcefield
+    """
+    store = get_store()
+    if store is not None and store.definition is definition:
+        return store.get_forcefield(ff_name, userff, usernames)
+    return forcefield.Forcefield(ff_name, definition, userff, usernames)
+
+
+def get_hydrogen_handler():
+    """Get hydrogen definitions from the installed store or load them.
+
+    :return:  hydrogen topology definitions
+    :rtype:  HydrogenHandler
+    """
+    store = get_store()
+    if store is not None:
+        return store.hydrogen_handler
+    return hydrogens.create_handler()
+
+
+@contextmanager
+def share(store):
+    """Share a parameter store with worker processes started in this context.
+
+    The store is installed in this process and frozen for copy-on-write
+    sharing with forked workers.  Pass the yielded arguments to
+    :func:`init_worker` (e.g., as ``initargs`` of a process pool) so
+    spawned workers load the store as well.
+
+    :param store:  parameter store (should already hold every forcefield
+        the workers need, so they are not loaded again in each worker)
+    :type store:  ParameterStore
+    :return:  arguments for :func:`init_worker`
+    :rtype:  (bytes,)
+    """
+    _ = store.hydrogen_handler
+    payload = pickle.dumps(store, protocol=pickle.HIGHEST_PROTOCOL)
+    previous = get_store()
+    install(store)
+    gc.collect()
+    gc.freeze()
+    try:
+        yield (payload,)
+    finally:
+        gc.unfreeze()
+        install(previous)
+
+
+def init_worker(payload):
+    """Install a shared parameter store in a worker process.
+
+    Forked workers keep the store inherited from the parent; spawned workers
+    load it from the pickled payload.
+
+    :param payload:  pickled parameter store from :func:`share`
+    :type payload:  bytes
+    """
+    if get_store() is not None:
+        return
+    install(pickle.loads(payload))
+    _LOGGER.debug("Loaded shared parameter store.")
@@ -9,6 +9,8 @@ associated methods.
 
 from typing import Self
 
+import numpy as np
+
 from .config import BACKBONE
 from .pdb import ATOM, HETATM
 
@@ -73,8 +75,49 @@ class Atom:
     for analysis.
     This class also simplifies code by combining :class:`ATOM` and
     :class:`HETATM` objects into a single class.
+
+    The coordinates are stored in a row of a :mod:`numpy` array with shape
+    (N, 3); a new atom has an array of its own with one row.  Atoms in a
+    :class:`Biomolecule` share one array with a row for each atom (see
+    :meth:`Biomolecule.pack_coordinates`); :attr:`x`, :attr:`y`, and
+    :attr:`z` read and write that row.
+
+    The attributes are stored in ``__slots__`` rather than a per-instance
+    dictionary to keep large structures small in memory.
     """
 
+    __slots__ = (
+        "_coords",
+        "_ffcharge",
+        "_row",
+        "added",
+        "alt_loc",
+        "bonds",
+        "cell",
+        "chain_id",
+        "charge",
+        "element",
+        "hacceptor",
+        "hdonor",
+        "id",
+        "ins_code",
+        "mol2charge",
+        "name",
+        "occupancy",
+        "optimizeable",
+        "radius",
+        "refdistance",
+        "reference",
+        "res_name",
+        "res_seq",
+        "residue",
+        "seg_id",
+        "serial",
+        "sybyl_type",
+        "temp_factor",
+        "type",
+    )
+
     def __init__(
         self,
         atom: ATOM | HETATM | Self | None = None,
@@ -99,9 +142,8 @@ class Atom:
         self.chain_id = None
         self.res_seq = None
         self.ins_code = None
-        self.x = None
-        self.y = None
-        self.z = None
+        self._coords = np.full((1, 3), np.nan)
+        self._row = 0
         self.occupancy = None
         self.temp_factor = None
         self.seg_id = None
@@ -111,7 +153,7 @@ class Atom:
         self.reference = None
         self.residue = None
         self.radius = None
-        self.ffcharge = None
+        self._ffcharge = None
         self.hdonor = 0
         self.hacceptor = 0
         self.cell = None
@@ -341,25 +383,127 @@ class Atom:
         outstr += f"{self.seg_id:4.4s}{self.element:>2.2s}{self.charge:2.2s}"
         return outstr
 
+    @property
+    def x(self):
+        """The x coordinate of the atom.
+
+        :rtype:  float
+        """
+        return self._coords.item(self._row, 0)
+
+    @x.setter
+    def x(self, value):
+        self._coords[self._row, 0] = value
+
+    @property
+    def y(self):
+        """The y coordinate of the atom.
+
+        :rtype:  float
+        """
+        return self._coords.item(self._row, 1)
+
+    @y.setter
+    def y(self, value):
+        self._coords[self._row, 1] = value
+
+    @property
+    def z(self):
+        """The z coordinate of the atom.
+
+        :rtype:  float
+        """
+        return self._coords.item(self._row, 2)
+
+    @z.setter
+    def z(self, value):
+        self._coords[self._row, 2] = value
+
+    @property
+    def ffcharge(self):
+        """The forcefield charge of the atom.
+
+        Setting the charge updates the charge of the residue (see
+        :meth:`Residue.charge_changed`).
+
+        :rtype:  float
+        """
+        return self._ffcharge
+
+    @ffcharge.setter
+    def ffcharge(self, value):
+        self._ffcharge = value
+        if self.residue is not None:
+            self.residue.charge_changed()
+
     @property
     def coords(self):
         """Return the x,y,z coordinates of the atom.
 
-        .. todo:
-           All atom coordinates should be converted to :mod:`numpy` arrays
+        The list is a copy, so it does not change when the atom is moved.
 
         :return:  list of the coordinates
         :rtype:  [float, float, float]
         """
-        return [self.x, self.y, self.z]
+        return self._coords[self._row].tolist()
+
+    def bind_coords(self, coords, index):
+        """Store the coordinates of the atom in a row of a shared array.
+
+        The current coordinates are copied to the row and the atom reads and
+        writes its coordinates there from now on.
+
+        :param coords:  array of coordinates with shape (N, 3)
+        :type coords:  numpy.ndarray
+        :param index:  row of the array for this atom
+        :type index:  int
+        """
+        coords[index] = self._coords[self._row]
+        self._coords = coords
+        self._row = index
+
+    @property
+    def bond_graph(self):
+        """The bond graph of the biomolecule containing the atom.
+
+        :return:  bond graph (None if the atom is not in a biomolecule)
+        :rtype:  BondGraph
+        """
+        biomolecule = getattr(self.residue, "biomolecule", None)
+        return None if biomolecule is None else biomolecule.bond_graph
 
     def add_bond(self, bondedatom):
-        """Add a bond to the list of bonds.
+        """Add a bond to the list of bonds (unless it is already there).
+
+        :param bondedatom:  the atom to bond to
+        :type bondedatom:  ATOM
+        """
+        graph = self.bond_graph
+        if graph is not None:
+            graph.add(self, bondedatom)
+        elif bondedatom not in self.bonds:
+            self.bonds.append(bondedatom)
+
+    def remove_bond(self, bondedatom):
+        """Remove a bond from the list of bonds (if it is there).
+
+        :param bondedatom:  the bonded atom
+        :type bondedatom:  ATOM
+        """
+        graph = self.bond_graph
+        if graph is not None:
+            graph.discard(self, bondedatom)
+        elif bondedatom in self.bonds:
+            self.bonds.remove(bondedatom)
+
+    def connect(self, bondedatom):
+        """Bond two atoms to each other (unless they are already bonded).
 
         :param bondedatom:  the atom to bond to
         :type bondedatom:  ATOM
         """
-        self.bonds.append(bondedatom)
+        self.add_bond(bondedatom)
+        bondedatom.add_bond(self)
 
     @property
     def is_hydrogen(self):
@@ -11,8 +11,14 @@
 .. codeauthor::  Nathan Baker
 """
 
+import bz2
+import gzip
+import importlib.util
 import logging
+import lzma
 import math
+import sys
+from pathlib import Path
 
 import numpy as np
 
@@ -20,6 +26,89 @@ from .config import CHARGE_ERROR, RADIANS_TO_DEGREES, SMALL_NUMBER
 
 _LOGGER = logging.getLogger(__name__)
 
+#: Functions for opening files, indexed by compression suffix
+COMPRESSED_OPENERS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+
+
+def uncompressed_suffix(path):
+    """Return the file suffix, ignoring any compression suffix.
+
+    For example, both ``1abc.cif`` and ``1abc.cif.gz`` give ``.cif``.
+
+    :param path:  path to file
+    :type path:  str
+    :return:  lower-case file suffix
+    :rtype:  str
+    """
+    path = Path(path)
+    if path.suffix.lower() in COMPRESSED_OPENERS:
+        path = path.with_suffix("")
+    return path.suffix.lower()
+
+
+def open_file(path, mode="rt"):
+    """Open a text file, decompressing or compressing based on its suffix.
+
+    Files ending in ``.gz``, ``.bz2``, or ``.xz`` are streamed through the
+    corresponding compression module; other files are opened normally.
+
+    :param path:  path to file
+    :type path:  str
+    :param mode:  text mode for opening the file (``rt``, ``wt``, etc.)
+    :type mode:  str
+    :return:  file object
+    :rtype:  file
+    """
+    suffix = Path(path).suffix.lower()
+    opener = COMPRESSED_OPENERS.get(suffix, open)
+    return opener(path, mode, encoding="utf-8")
+
+
+def lazy_import(name):
+    """Import a module when one of its attributes is first used.
+
+    Slow-loading dependencies that are only needed by some runs (e.g.,
+    PROPKA, :mod:`requests`) are imported this way to keep startup fast.
+
+    :param name:  absolute module name
+    :type name:  str
+    :return:  module (loaded on first attribute access)
+    :rtype:  module
+    :raises ModuleNotFoundError:  if the module cannot be found
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        err = f"No module named {name!r}"
+        raise ModuleNotFoundError(err, name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def attributes(obj):
+    """Get the instance attributes of an object.
+
+    Unlike :func:`vars`, this includes attributes stored in ``__slots__``
+    (e.g., those of :class:`structures.Atom`).
+
+    :param obj:  object with attributes
+    :type obj:  object
+    :return:  dictionary of attribute values by name (unset slots are
+        omitted)
+    :rtype:  dict
+    """
+    attrs = dict(getattr(obj, "__dict__", {}))
+    for klass in type(obj).__mro__:
+        for name in vars(klass).get("__slots__", ()):
+            if hasattr(obj, name):
+                attrs[name] = getattr(obj, name)
+    return attrs
+
 
 def noninteger_charge(charge, error_tol=CHARGE_ERROR) -> str:
     """Test whether a charge is an integer.
@@ -154,6 +243,20 @@ def distance(coords1, coords2):
     return np.linalg.norm(coords1 - coords2)
 
 
+def distances(coords, coordlist):
+    """Calculate the distances from one coordinate to several others.
+
+    :param coords:  coordinates of form [x,y,z]
+    :type coords:  [float, float, float]
+    :param coordlist:  list of coordinates of form [x,y,z]
+    :type coordlist:  [[float, float, float]]
+    :return:  distances to each coordinate in the list
+    :rtype:  numpy.ndarray
+    """
+    coordlist = np.array(coordlist, dtype=float).reshape(-1, 3)
+    return np.linalg.norm(coordlist - np.array(coords), axis=1)
+
+
 def add(coords1, coords2):
     """Add one 3-dimensional point to another.
 
@@ -1,10 +1,26 @@
 """Basic tests of simple core functionality."""
 
+import gzip
+import json
+import subprocess
+import sys
 from pathlib import Path
 
 import common
+import numpy as np
 import pytest
 
+from pdb2pqr import hydrogens
+from pdb2pqr.biomolecule import Biomolecule
+from pdb2pqr.cells import Cells
+from pdb2pqr.debump import Debump
+from pdb2pqr.forcefield import Forcefield
+from pdb2pqr.io import get_definitions, get_molecule, read_npz, read_pqr
+from pdb2pqr.io import test_names_file as find_names_file
+from pdb2pqr.main import ph_sweep_values, run_pdb2pqr
+from pdb2pqr.profiling import Profile
+from pdb2pqr.topology import Topology
+
 # fmt: off
 #: Protein-nucleic acid complexes
 PROTEIN_NUCLEIC_SET = {"4UN3"}
@@ -156,6 +172,446 @@ def test_cyclic_peptide(input_pdb, expected_pqr, tmp_path):
     )
 
 
+@pytest.mark.parametrize("ensemble", ["split", "multi"], ids=str)
+def test_ensemble(ensemble, tmp_path):
+    """Test processing every model of an NMR ensemble."""
+    input_pdb = common.DATA_DIR / "1A1P.pdb"
+    args = f"--log-level=INFO --ff=AMBER --ensemble={ensemble}"
+    common.run_pdb2pqr_for_tests(
+        args=args,
+        input_pdb=input_pdb,
+        output_pqr="1A1P.pqr",
+        tmp_path=tmp_path,
+    )
+    num_models = input_pdb.read_text().count("\nMODEL ")
+    if ensemble == "split":
+        model_paths = sorted(tmp_path.glob("1A1P_*.pqr"))
+        assert len(model_paths) == num_models
+        assert model_paths[0].read_text() != model_paths[1].read_text()
+    else:
+        pqr_text = (tmp_path / "1A1P.pqr").read_text()
+        assert pqr_text.count("MODEL ") == num_models
+        assert pqr_text.count("ENDMDL") == num_models
+
+
+def test_multiple_forcefields(tmp_path):
+    """Test that several forcefields in one run match separate runs."""
+    input_pdb = common.DATA_DIR / "1AJJ.pdb"
+    args = "--log-level=INFO --titration-state-method=propka"
+    forcefields = ["AMBER", "CHARMM", "PARSE"]
+    for ff_name in forcefields:
+        common.run_pdb2pqr_for_tests(
+            args=f"{args} --ff={ff_name}",
+            input_pdb=input_pdb,
+            output_pqr=f"single_{ff_name}.pqr",
+            tmp_path=tmp_path,
+        )
+    common.run_pdb2pqr_for_tests(
+        args=" ".join([args, *(f"--ff={ff_name}" for ff_name in forcefields)]),
+        input_pdb=input_pdb,
+        output_pqr="multi.pqr.gz",
+        tmp_path=tmp_path,
+    )
+    for ff_name in forcefields:
+        with gzip.open(
+            tmp_path / f"multi_{ff_name.lower()}.pqr.gz", "rt"
+        ) as pqr_file:
+            multi_text = pqr_file.read()
+        single_text = (tmp_path / f"single_{ff_name}.pqr").read_text()
+        assert multi_text == single_text
+
+
+def test_ph_sweep(tmp_path):
+    """Test that a pH sweep matches separate runs at each pH."""
+    assert ph_sweep_values(2, 3, 0.5) == [2.0, 2.5, 3.0]
+    assert ph_sweep_values(7, 7, 1) == [7.0]
+    assert ph_sweep_values(8, 7, 1) == []
+    input_pdb = common.DATA_DIR / "1AJJ.pdb"
+    args = "--log-level=INFO --ff=AMBER --titration-state-method=propka"
+    ph_values = [3.0, 5.5, 8.0]
+    for ph in ph_values:
+        common.run_pdb2pqr_for_tests(
+            args=f"{args} --with-ph={ph}",
+            input_pdb=input_pdb,
+            output_pqr=f"single_{ph:g}.pqr",
+            tmp_path=tmp_path,
+        )
+    common.run_pdb2pqr_for_tests(
+        args=f"{args} --ph-sweep 3 8 2.5",
+        input_pdb=input_pdb,
+        output_pqr="sweep.pqr",
+        tmp_path=tmp_path,
+    )
+    for ph in ph_values:
+        sweep_text = (tmp_path / f"sweep_ph{ph:g}.pqr").read_text()
+        single_text = (tmp_path / f"single_{ph:g}.pqr").read_text()
+        assert sweep_text == single_text
+
+
+def test_npz_output(tmp_path):
+    """Test that NPZ output matches PQR output."""
+    input_pdb = common.DATA_DIR / "1QBS.pdb"
+    args = "--log-level=INFO --ff=AMBER"
+    common.run_pdb2pqr_for_tests(
+        args=args,
+        input_pdb=input_pdb,
+        output_pqr="1QBS.pqr",
+        tmp_path=tmp_path,
+    )
+    common.run_pdb2pqr_for_tests(
+        args=f"{args} --output-format=npz",
+        input_pdb=input_pdb,
+        output_pqr="1QBS.npz",
+        tmp_path=tmp_path,
+    )
+    with open(tmp_path / "1QBS.pqr") as pqr_file:
+        atoms = read_pqr(pqr_file)
+    for mmap in [False, True]:
+        arrays = read_npz(tmp_path / "1QBS.npz", mmap=mmap)
+        assert len(arrays["serial"]) == len(atoms)
+        assert list(arrays["name"]) == [atom.name for atom in atoms]
+        assert list(arrays["res_name"]) == [atom.res_name for atom in atoms]
+        assert list(arrays["res_seq"]) == [atom.res_seq for atom in atoms]
+        np.testing.assert_allclose(
+            arrays["coords"],
+            [[atom.x, atom.y, atom.z] for atom in atoms],
+            atol=1e-3,
+        )
+        np.testing.assert_allclose(
+            arrays["charge"], [atom.charge for atom in atoms], atol=1e-4
+        )
+        np.testing.assert_allclose(
+            arrays["radius"], [atom.radius for atom in atoms], atol=1e-4
+        )
+
+
+def test_npz_compressed_output(tmp_path):
+    """Test that NPZ output is not written under a compressed suffix."""
+    with pytest.raises(RuntimeError, match="compressed output"):
+        run_pdb2pqr(
+            [
+                "--ff=AMBER",
+                "--output-format=npz",
+                common.DATA_DIR / "1QBS.pdb",
+                tmp_path / "1QBS.npz.gz",
+            ]
+        )
+    assert not (tmp_path / "1QBS.npz.gz").exists()
+
+
+def test_apbs_input_compressed_output(tmp_path):
+    """Test that APBS input is not generated for compressed PQR output."""
+    with pytest.raises(RuntimeError, match="compressed output"):
+        run_pdb2pqr(
+            [
+                "--ff=AMBER",
+                f"--apbs-input={tmp_path / '1QBS.in'}",
+                common.DATA_DIR / "1QBS.pdb",
+                tmp_path / "1QBS.pqr.gz",
+            ]
+        )
+    assert not (tmp_path / "1QBS.in").exists()
+
+
+def test_run_profile(tmp_path):
+    """Test the per-phase profile of a run."""
+    profile = Profile()
+    output_pqr = tmp_path / "1QBS.pqr"
+    run_pdb2pqr(
+        [
+            "--ff=PARSE",
+            "--log-level=WARNING",
+            "--profile",
+            common.DATA_DIR / "1QBS.pdb",
+            output_pqr,
+        ],
+        profile=profile,
+    )
+    summary = profile.as_dict()
+    names = [phase["name"] for phase in summary["phases"]]
+    for name in [
+        "definitions",
+        "molecule",
+        "setup",
+        "forcefield",
+        "add hydrogens",
+        "hydrogen handler",
+        "optimize hydrogens",
+        "apply forcefield",
+        "output",
+    ]:
+        assert name in names
+    for phase in summary["phases"]:
+        assert phase["wall"] >= 0
+        assert phase["cpu"] >= 0
+    assert summary["total_wall"] > 0
+    with open(tmp_path / "1QBS.profile.json") as json_file:
+        written = json.load(json_file)
+    assert [phase["name"] for phase in written["phases"]] == names
+
+
+def test_compiled_forcefield(tmp_path):
+    """Test that compiled forcefield parameters are shared."""
+    definition = get_definitions()
+    amber = Forcefield("amber", definition, None)
+    assert Forcefield("amber", definition, None).map is amber.map
+    assert Forcefield("charmm", definition, None).map is not amber.map
+    # Changed parameter files must be compiled separately
+    user_ff = tmp_path / "user.dat"
+    user_ff.write_text("ALA N -0.5 1.8\n")
+    user = Forcefield(None, definition, str(user_ff), find_names_file("amber"))
+    assert user.get_params("ALA", "N") == (-0.5, 1.8)
+    user_ff.write_text("ALA N -0.25 1.8\n")
+    user = Forcefield(None, definition, str(user_ff), find_names_file("amber"))
+    assert user.get_params("ALA", "N") == (-0.25, 1.8)
+
+
+def test_forcefield_assign():
+    """Test bulk assignment of forcefield parameters."""
+    definition = get_definitions()
+    pdblist, _ = get_molecule(common.DATA_DIR / "1QBS.pdb")
+    biomolecule = Biomolecule(pdblist, definition)
+    for ff_name in ["amber", "parse"]:
+        forcefield_ = Forcefield(ff_name, definition, None)
+        for resname, residue in forcefield_.map.items():
+            for atomname, atom in residue.atoms.items():
+                assert forcefield_.get_params(resname, atomname) == (
+                    atom.charge,
+                    atom.radius,
+                )
+        hitlist, misslist = forcefield_.assign(biomolecule)
+        assert len(hitlist) + len(misslist) == len(biomolecule.atoms)
+        assert hitlist
+        for atom in hitlist:
+            assert forcefield_.get_params(atom.residue.ffname, atom.name) == (
+                atom.ffcharge,
+                atom.radius,
+            )
+
+
+def test_shared_coordinates():
+    """Test that atom coordinates are backed by one biomolecule array."""
+    definition = get_definitions()
+    pdblist, _ = get_molecule(common.DATA_DIR / "1QBS.pdb")
+    biomolecule = Biomolecule(pdblist, definition)
+    atoms = biomolecule.atoms
+    coords = biomolecule.coordinates
+    assert coords.shape == (len(atoms), 3)
+    np.testing.assert_array_equal(coords, [atom.coords for atom in atoms])
+    atom = atoms[10]
+    before = atom.coords
+    atom.x += 1.0
+    assert coords[10, 0] == atom.x == before[0] + 1.0
+    coords[10, 1] = -2.0
+    assert atom.y == -2.0
+    assert type(atom.z) is float
+    copied = biomolecule.copy()
+    copied.atoms[10].z = 100.0
+    assert atom.z != 100.0
+    assert copied.coordinates[10, 2] == 100.0
+    cells = Cells(5)
+    cells.assign_cells(biomolecule)
+    for atom in atoms:
+        expected = Cells(5)
+        expected.add_cell(atom)
+        assert atom.cell == next(iter(expected.cellmap))
+    residue = biomolecule.residues[0]
+    residue.remove_atom(residue.atoms[-1].name)
+    assert biomolecule.coordinates.shape == (len(atoms) - 1, 3)
+
+
+def test_slotted_structures():
+    """Test that atoms and residues store their attributes in slots."""
+    pdblist, _ = get_molecule(common.DATA_DIR / "1AFS.pdb")
+    biomolecule = Biomolecule(pdblist, get_definitions())
+    for residue in biomolecule.residues:
+        assert not hasattr(residue, "__dict__")
+        for atom in residue.atoms:
+            assert not hasattr(atom, "__dict__")
+    copied = biomolecule.copy()
+    for residue, new_residue in zip(
+        biomolecule.residues, copied.residues, strict=True
+    ):
+        assert new_residue is not residue
+        assert new_residue.name == residue.name
+        assert new_residue.reference is residue.reference
+        for atom, new_atom in zip(
+            residue.atoms, new_residue.atoms, strict=True
+        ):
+            assert new_atom.residue is new_residue
+            assert new_atom.name == atom.name
+            assert new_atom.coords == atom.coords
+            assert [bond.name for bond in new_atom.bonds] == [
+                bond.name for bond in atom.bonds
+            ]
+
+
+def test_atom_index():
+    """Test the cached atom list and stable atom IDs."""
+    pdblist, _ = get_molecule(common.DATA_DIR / "1QBS.pdb")
+    biomolecule = Biomolecule(pdblist, get_definitions())
+    atoms = biomolecule.atoms
+    assert biomolecule.atoms is atoms
+    assert [atom.id for atom in atoms] == list(range(len(atoms)))
+    assert biomolecule.num_atom_ids == len(atoms)
+    residue = biomolecule.residues[1]
+    removed = residue.atoms[-1]
+    residue.remove_atom(removed.name)
+    assert biomolecule.atoms is not atoms
+    assert removed not in biomolecule.atoms
+    with pytest.raises(KeyError):
+        biomolecule.get_atom_by_id(removed.id)
+    residue.create_atom("HX", [1.0, 2.0, 3.0])
+    added = residue.get_atom("HX")
+    assert added.id == len(atoms)
+    assert biomolecule.get_atom_by_id(added.id) is added
+    assert added in biomolecule.atoms
+    for atom in biomolecule.atoms:
+        assert biomolecule.get_atom_by_id(atom.id) is atom
+    copied = biomolecule.copy()
+    assert [atom.id for atom in copied.atoms] == [
+        atom.id for atom in biomolecule.atoms
+    ]
+    assert copied.get_atom_by_id(added.id).residue.biomolecule is copied
+
+
+def test_bond_graph():
+    """Test that the bond graph mirrors the atom bond lists."""
+    pdblist, _ = get_molecule(common.DATA_DIR / "1QBS.pdb")
+    biomolecule = Biomolecule(pdblist, get_definitions())
+    biomolecule.update_bonds()
+    graph = biomolecule.bond_graph
+    atoms = biomolecule.atoms
+    assert len(graph) == sum(len(atom.bonds) for atom in atoms)
+    indptr, indices = graph.csr(biomolecule.num_atom_ids)
+    for atom in atoms:
+        bonded = indices[indptr[atom.id] : indptr[atom.id + 1]]
+        assert bonded.tolist() == sorted(bond.id for bond in atom.bonds)
+        for bond in atom.bonds:
+            assert graph.has_bond(atom, bond)
+            assert graph.is_bonded(bond, atom)
+    atom, other = atoms[0], atoms[-1]
+    assert not graph.is_bonded(atom, other)
+    bond = atom.bonds[0]
+    mask = graph.excluded_mask(
+        [atom.id, atom.id, bond.id], [bond.id, other.id, atom.id]
+    )
+    assert mask.tolist() == [True, False, True]
+    mask = graph.excluded_mask(atom.id, [bond.id, other.id])
+    assert mask.tolist() == [True, False]
+    debumper = Debump(biomolecule)
+    assert debumper.exclude_bonded(atom, [bond, other]) == [other]
+    atom.connect(other)
+    assert other in atom.bonds
+    assert atom in other.bonds
+    assert graph.is_bonded(other, atom)
+    num_bonds = len(graph)
+    other_bonds = len(other.bonds)
+    other.residue.remove_atom(other.name)
+    assert other not in atom.bonds
+    assert not graph.has_bond(atom, other)
+    assert len(other.bonds) == other_bonds
+    assert len(graph) == num_bonds - 2 * other_bonds
+    assert len(graph) == sum(len(atom.bonds) for atom in biomolecule.atoms)
+    indptr, indices = graph.csr(biomolecule.num_atom_ids)
+    assert indptr[other.id] == indptr[other.id + 1]
+    assert other.id not in indices.tolist()
+
+
+def test_charge_summary():
+    """Test that cached charges follow changes to atom charges."""
+    pdblist, _ = get_molecule(common.DATA_DIR / "1QBS.pdb")
+    definition = get_definitions()
+    biomolecule = Biomolecule(pdblist, definition)
+    biomolecule.apply_force_field(Forcefield("amber", definition, None))
+    summary = biomolecule.charge_summary
+    assert biomolecule.charge_summary is summary
+    assert summary["total"] == pytest.approx(
+        sum(residue.charge for residue in biomolecule.residues)
+    )
+    assert sum(summary["chains"].values()) == pytest.approx(summary["total"])
+    residue = biomolecule.residues[0]
+    charge = residue.charge
+    atom = residue.atoms[0]
+    atom.ffcharge += 0.5
+    assert biomolecule.charge_summary is not summary
+    assert residue.charge == pytest.approx(charge + 0.5)
+    assert biomolecule.charge_summary["total"] == pytest.approx(
+        summary["total"] + 0.5
+    )
+    assert residue in [
+        res for res, _ in biomolecule.charge_summary["noninteger"]
+    ]
+    residue.remove_atom(atom.name)
+    assert residue.charge == pytest.approx(charge - atom.ffcharge + 0.5)
+    # Chains split from one chain can share an ID
+    first, second = biomolecule.chains
+    chain_charges = biomolecule.charge_summary["chains"]
+    second.chain_id = first.chain_id
+    biomolecule.charges_changed()
+    assert biomolecule.charge_summary["chains"] == {
+        first.chain_id: pytest.approx(sum(chain_charges.values()))
+    }
+
+
+def test_hydrogen_definitions():
+    """Test cached hydrogen handler and on-demand hydrogen definitions."""
+    handler = hydrogens.create_handler()
+    assert hydrogens.create_handler() is handler
+    pdblist, _ = get_molecule(common.DATA_DIR / "1QBS.pdb")
+    biomolecule = Biomolecule(pdblist, get_definitions())
+    routines = hydrogens.HydrogenRoutines(Debump(biomolecule), handler)
+    with open(
+        Path(hydrogens.__file__).parents[1] / "dat/TOPOLOGY.xml"
+    ) as topo:
+        routines.read_hydrogen_def(Topology(topo))
+    res_names = {residue.name for residue in biomolecule.residues}
+    def_names = [hydrodef.name for hydrodef in routines.hydrodefs]
+    assert def_names
+    assert set(def_names) <= res_names | {"NTR", "CTR"}
+    assert len(def_names) < len(handler.map)
+
+
+def test_hydrogen_definitions_termini(tmp_path):
+    """Test that filtered hydrogen definitions keep the termini."""
+    pdblist, _ = get_molecule(common.DATA_DIR / "1AFS.pdb")
+    definition = get_definitions()
+    biomolecule = Biomolecule(pdblist, definition)
+    biomolecule.set_termini()
+    biomolecule.update_bonds()
+    routines = hydrogens.HydrogenRoutines(
+        Debump(biomolecule), hydrogens.create_handler()
+    )
+    assert {"NTR", "CTR"} <= set(routines.map)
+    common.run_pdb2pqr_for_tests(
+        args="--log-level=INFO --ff=AMBER",
+        input_pdb=common.DATA_DIR / "1AFS.pdb",
+        tmp_path=tmp_path,
+        expected_pqr=common.DATA_DIR / "1AFS_ff=AMBER.pqr",
+    )
+
+
+def test_lazy_imports():
+    """Test that optional heavy dependencies are not loaded at startup."""
+    # Submodules that are only imported once their packages are loaded
+    lazy_modules = [
+        "pdbx.reader",
+        "propka.conformation_container",
+        "requests.adapters",
+    ]
+    code = (
+        "import sys, pdb2pqr.main; "
+        f"print([m for m in {lazy_modules!r} if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "[]"
+
+
 @pytest.mark.parametrize("naming_test", NAMING_TESTS, ids=str)
 def test_ph_naming(naming_test, tmp_path):
     """Non-regression tests on naming schemes at different pH values."""
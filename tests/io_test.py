@@ -1,12 +1,45 @@
 """Tests of I/O functions."""
 
+import io
 import logging
+import threading
 from difflib import Differ
+from functools import partial
+from http.server import HTTPServer, SimpleHTTPRequestHandler
 from pathlib import Path
 
+import numpy as np
+import pdbx
 import pytest
 
-from pdb2pqr.io import read_dx, read_pqr, read_qcd, write_cube
+import pdb2pqr
+from pdb2pqr.biomolecule import Biomolecule
+from pdb2pqr.cif import atom_site, read_cif
+from pdb2pqr.io import (
+    StructureCache,
+    get_definitions,
+    get_molecule,
+    get_old_header,
+    get_pdb_file,
+    iter_pqr,
+    prefetch_structures,
+    print_biomolecule_atoms,
+    read_dx,
+    read_pqr,
+    read_qcd,
+    write_biomolecule_atoms,
+    write_cube,
+    write_cube_values,
+)
+from pdb2pqr.main import drop_water
+from pdb2pqr.pdb import (
+    ATOM,
+    COORDINATE_RECORDS,
+    iter_records,
+    read_pdb,
+    read_pdb_columns,
+)
+from pdb2pqr.utilities import COMPRESSED_OPENERS, open_file
 
 _LOGGER = logging.getLogger(__name__)
 DATA_DIR = Path("tests/data")
@@ -37,6 +70,330 @@ def test_read_qcd():
         read_qcd(qcd_file)
 
 
+@pytest.mark.parametrize(
+    "input_pdb", ["1AFS.pdb", "1K1I.pdb", "5vav_cyclic_peptide.pdb"], ids=str
+)
+def test_read_pdb_columns(input_pdb):
+    """Test that columnar parsing builds the same biomolecule as records."""
+    definition = get_definitions()
+    fields = [
+        "type",
+        "serial",
+        "name",
+        "res_name",
+        "chain_id",
+        "res_seq",
+        "ins_code",
+        "x",
+        "y",
+        "z",
+        "occupancy",
+        "temp_factor",
+        "element",
+    ]
+    with open(DATA_DIR / input_pdb) as pdb_file:
+        pdblist, _ = read_pdb(pdb_file)
+    with open(DATA_DIR / input_pdb) as pdb_file:
+        columns, other_lines, _ = read_pdb_columns(pdb_file)
+    biomol_records = Biomolecule(pdblist, definition)
+    biomol_columns = Biomolecule.from_columns(columns, definition, other_lines)
+    assert len(biomol_records.residues) == len(biomol_columns.residues)
+    for atom1, atom2 in zip(
+        biomol_records.atoms, biomol_columns.atoms, strict=True
+    ):
+        for field in fields:
+            assert getattr(atom1, field) == getattr(atom2, field)
+    assert get_old_header(pdblist) == get_old_header(other_lines)
+
+
+def test_read_pdb_columns_invalid_occupancy():
+    """Test that non-numeric occupancies are read like :class:`pdb.ATOM`."""
+    lines = [
+        (
+            "ATOM      1  N   THR A   1      46.148  16.581   2.104  1.00 "
+            "20.55           N"
+        ),
+        (
+            "ATOM      2  CA  THR A   1      44.862  15.936   2.105   N/A "
+            "18.89           C"
+        ),
+        (
+            "ATOM      3  C   THR A   1      43.983  16.642   1.087  1.00 "
+            "  N/A           C"
+        ),
+    ]
+    pdb_file = io.StringIO("\n".join(lines) + "\n")
+    columns, _, _ = read_pdb_columns(pdb_file)
+    for irow, line in enumerate(lines):
+        atom = ATOM(line)
+        assert columns.occupancy[irow] == atom.occupancy
+        assert columns.temp_factor[irow] == atom.temp_factor
+        assert columns.element[irow] == atom.element
+    assert columns.occupancy.tolist() == [1.0, 0.0, 0.0]
+
+
+@pytest.mark.parametrize("input_pqr", PQR_LIST[:5], ids=str)
+def test_iter_pqr(input_pqr):
+    """Test that :func:`iter_pqr` yields the atoms from :func:`read_pqr`."""
+    with open(input_pqr) as pqr_file:
+        atoms = read_pqr(pqr_file)
+    with open(input_pqr) as pqr_file:
+        for atom1, atom2 in zip(atoms, iter_pqr(pqr_file), strict=True):
+            assert str(atom1) == str(atom2)
+
+
+@pytest.mark.parametrize(
+    "input_pdb", ["1AFS.pdb", "1K1I.pdb", "1QBS.pdb"], ids=str
+)
+def test_iter_records(input_pdb):
+    """Test that a filtered record stream builds the same biomolecule."""
+    definition = get_definitions()
+    with open(DATA_DIR / input_pdb) as pdb_file:
+        pdblist, _ = read_pdb(pdb_file)
+    biomol_list = Biomolecule(drop_water(pdblist), definition)
+    with open(DATA_DIR / input_pdb) as pdb_file:
+        records = iter_records(pdb_file, types=COORDINATE_RECORDS)
+        biomol_stream = Biomolecule(drop_water(records), definition)
+    assert all(
+        record.record_type() in COORDINATE_RECORDS
+        for record in biomol_stream.pdblist
+    )
+    assert [str(chain) for chain in biomol_list.chains] == [
+        str(chain) for chain in biomol_stream.chains
+    ]
+    for atom1, atom2 in zip(
+        biomol_list.atoms, biomol_stream.atoms, strict=True
+    ):
+        assert str(atom1) == str(atom2)
+
+
+@pytest.mark.parametrize("input_cif", ["1FAS.cif", "3U7T.cif"], ids=str)
+def test_read_cif_atom_site(input_cif):
+    """Test that ATOM/HETATM records match the CIF ``atom_site`` rows."""
+    with open(DATA_DIR / input_cif) as cif_file:
+        atom_site = pdbx.load(cif_file)[0].get_object("atom_site")
+    with open(DATA_DIR / input_cif) as cif_file:
+        pdblist, errlist = read_cif(cif_file)
+    assert errlist == []
+    records = [
+        record
+        for record in pdblist
+        if record.record_type() in ["ATOM", "HETATM"]
+    ]
+    assert len(records) == atom_site.row_count
+    for irow, record in enumerate(records):
+        assert record.record_type() == atom_site.get_value("group_PDB", irow)
+        assert record.serial == int(atom_site.get_value("id", irow))
+        assert record.name == atom_site.get_value("label_atom_id", irow)
+        assert record.alt_loc == atom_site.get_value("label_alt_id", irow)
+        assert record.res_name == atom_site.get_value("label_comp_id", irow)
+        assert record.chain_id == atom_site.get_value("label_asym_id", irow)
+        assert record.res_seq == int(atom_site.get_value("auth_seq_id", irow))
+        assert record.x == float(atom_site.get_value("Cartn_x", irow))
+        assert record.element == atom_site.get_value("type_symbol", irow)
+
+
+def test_read_cif_missing_values():
+    """Test that unknown CIF values are defaulted or reported as errors."""
+    cif_text = """data_TEST
+loop_
+_atom_site.group_PDB
+_atom_site.id
+_atom_site.type_symbol
+_atom_site.label_atom_id
+_atom_site.label_alt_id
+_atom_site.label_comp_id
+_atom_site.label_asym_id
+_atom_site.auth_seq_id
+_atom_site.pdbx_PDB_ins_code
+_atom_site.Cartn_x
+_atom_site.Cartn_y
+_atom_site.Cartn_z
+_atom_site.occupancy
+_atom_site.B_iso_or_equiv
+_atom_site.pdbx_formal_charge
+_atom_site.pdbx_PDB_model_num
+ATOM 1 N N . THR A 1 ? 46.148 16.581 2.104 ? ? ? 1
+ATOM 2 O OXT . THR A 1 ? 44.862 15.936 2.105 1.00 18.89 -1 1
+ATOM 3 C CA . THR A ? ? 43.983 16.642 1.087 1.00 16.48 ? 1
+"""
+    block = pdbx.load(io.StringIO(cif_text))[0]
+    pdblist, errlist = atom_site(block)
+    records = [record for record in pdblist if record.record_type() == "ATOM"]
+    assert [record.name for record in records] == ["N", "OXT"]
+    assert records[0].charge == ""
+    assert records[0].occupancy == 0.0
+    assert records[1].charge == "1-"
+    assert errlist == ["ATOM"]
+
+
+@pytest.mark.parametrize("suffix", list(COMPRESSED_OPENERS), ids=str)
+@pytest.mark.parametrize("input_file", ["1AFS.pdb", "1FAS.cif"], ids=str)
+def test_compressed_molecule(input_file, suffix, tmp_path):
+    """Test reading compressed structure files."""
+    input_path = DATA_DIR / input_file
+    compressed_path = tmp_path / (input_file + suffix)
+    with open_file(compressed_path, "wt") as compressed_file:
+        compressed_file.write(input_path.read_text())
+    pdblist, is_cif = get_molecule(input_path)
+    compressed_pdblist, compressed_is_cif = get_molecule(compressed_path)
+    assert is_cif == compressed_is_cif
+    assert [str(record) for record in pdblist] == [
+        str(record) for record in compressed_pdblist
+    ]
+
+
+def test_lazy_patches():
+    """Test that patched definition residues are built on first use."""
+    definition = get_definitions()
+    num_built = definition.map.num_built
+    assert num_built < len(definition.map)
+    assert "ASH" in definition.map
+    assert definition.map.num_built == num_built
+    ash = definition.map["ASH"]
+    assert definition.map.num_built == num_built + 1
+    assert definition.map["ASH"] is ash
+    assert set(ash.map) == set(definition.map["ASP"].map) | {"HD1", "HD2"}
+    assert "OD2" in ash.map["HD2"].bonds
+    assert "HD2" in ash.map["OD2"].bonds
+    assert "HD2" not in definition.map["ASP"].map["OD2"].bonds
+
+
+def test_definition_cache(tmp_path):
+    """Test caching of compiled topology definitions."""
+    expected = get_definitions()
+    for _ in range(2):
+        definition = get_definitions(cache_dir=tmp_path)
+        assert sorted(definition.map) == sorted(expected.map)
+        assert sorted(definition.patches) == sorted(expected.patches)
+        for name, residue in expected.map.items():
+            assert str(definition.map[name]) == str(residue)
+    cache_files = list((tmp_path / "definitions").iterdir())
+    assert len(cache_files) == 1
+    # Changed definition files must not reuse the old cache
+    aa_path = tmp_path / "AA.xml"
+    dat_path = Path(pdb2pqr.__file__).parent / "dat"
+    aa_path.write_text((dat_path / "AA.xml").read_text() + "\n")
+    get_definitions(aa_path=str(aa_path), cache_dir=tmp_path)
+    assert len(list((tmp_path / "definitions").iterdir())) == 2
+
+
+def test_structure_cache(tmp_path):
+    """Test integrity checks and eviction in :class:`StructureCache`."""
+    cache = StructureCache(tmp_path, max_bytes=10)
+    assert cache.get("1abc.pdb") is None
+    digest = cache.put("1abc.pdb", b"12345")
+    assert cache.get("1abc.pdb") == b"12345"
+    (tmp_path / "objects" / digest).write_bytes(b"54321")
+    assert cache.get("1abc.pdb") is None
+    cache.put("1abc.pdb", b"12345")
+    cache.put("2abc.pdb", b"abcdefg")
+    assert cache.get("1abc.pdb") is None
+    assert cache.get("2abc.pdb") == b"abcdefg"
+
+
+@pytest.fixture
+def structure_mirror():
+    """Serve the test data directory as a local structure mirror."""
+    handler = partial(SimpleHTTPRequestHandler, directory=str(DATA_DIR))
+    server = HTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_from_mirror(structure_mirror, tmp_path):
+    """Test downloading and caching structures from a mirror."""
+    cache = StructureCache(tmp_path)
+    failed = prefetch_structures(
+        ["1AFS", "1K1I", "XXXX"], mirror=structure_mirror, cache=cache
+    )
+    assert failed == ["XXXX"]
+    expected = (DATA_DIR / "1AFS.pdb").read_text()
+    assert cache.get("1afs.pdb").decode("utf-8") == expected
+    pdb_file = get_pdb_file("1AFS", mirror="http://127.0.0.1:1", cache=cache)
+    assert pdb_file.read() == expected
+    cif_file = get_pdb_file("1FAS.cif", mirror=structure_mirror)
+    assert cif_file.read() == (DATA_DIR / "1FAS.cif").read_text()
+
+
+@pytest.mark.parametrize("pdbfile", [False, True], ids=str)
+@pytest.mark.parametrize("chainflag", [False, True], ids=str)
+def test_write_biomolecule_atoms(chainflag, pdbfile):
+    """Test that bulk-formatted lines match the per-atom string methods."""
+    with open(DATA_DIR / "1K1I.pdb") as pdb_file:
+        pdblist, _ = read_pdb(pdb_file)
+    atoms = Biomolecule(pdblist, get_definitions()).atoms
+    for iatom, atom in enumerate(atoms):
+        atom.ffcharge = [None, -0.5, 1234.5][iatom % 3]
+        atom.radius = [None, 1.5, 123.4][iatom % 3]
+        atom.x = [atom.x, -1234.5678][iatom % 2]
+    lines = print_biomolecule_atoms(atoms, chainflag, pdbfile)
+    expected = []
+    for atom in atoms:
+        if pdbfile:
+            expected.append(atom.get_pdb_string())
+        else:
+            expected.append(atom.get_pqr_string(chainflag=chainflag))
+    assert [line for line in lines if line[:3] != "TER"] == [
+        f"{line}\n" for line in expected
+    ]
+    output = io.StringIO()
+    write_biomolecule_atoms(output, atoms, chainflag, pdbfile)
+    assert output.getvalue() == "".join(lines)
+
+
+@pytest.mark.parametrize("cache_name", ["test.npy", "test.bin"], ids=str)
+def test_read_dx(tmp_path, caplog, cache_name):
+    """Test vectorized and cached reading of OpenDX files."""
+    values = [float(i) / 4 - 3 for i in range(2 * 3 * 4)]
+    dx_path = tmp_path / "test.dx"
+    with open(dx_path, "w") as dx_file:
+        dx_file.write("# Test grid\n")
+        dx_file.write("object 1 class gridpositions counts 2 3 4\n")
+        dx_file.write("origin -1.500000e+00 0.000000e+00 2.500000e+00\n")
+        dx_file.write("delta 5.000000e-01 0.000000e+00 0.000000e+00\n")
+        dx_file.write("delta 0.000000e+00 6.000000e-01 0.000000e+00\n")
+        dx_file.write("delta 0.000000e+00 0.000000e+00 7.000000e-01\n")
+        dx_file.write("object 2 class gridconnections counts 2 3 4\n")
+        dx_file.write(
+            "object 3 class array type double rank 0 items 24 data follows\n"
+        )
+        for i in range(0, len(values), 3):
+            dx_file.write(" ".join(f"{v:e}" for v in values[i : i + 3]))
+            dx_file.write("\n")
+        dx_file.write('attribute "dep" string "positions"\n')
+    cache_path = tmp_path / cache_name
+    caplog.set_level(logging.DEBUG, logger="pdb2pqr.io")
+    for cached in [False, True]:
+        caplog.clear()
+        with open(dx_path) as dx_file:
+            dx_dict = read_dx(dx_file, cache_path=cache_path)
+        assert ("Using cached DX values" in caplog.text) == cached
+        assert dx_dict["shape"] == (2, 3, 4)
+        assert dx_dict["lower left corner"] == [-1.5, 0.0, 2.5]
+        assert dx_dict["delta"].diagonal().tolist() == [0.5, 0.6, 0.7]
+        assert dx_dict["values"].tolist() == values
+        assert sorted(tmp_path.iterdir()) == sorted([cache_path, dx_path])
+
+
+@pytest.mark.parametrize("num_values", [1, 6, 17, 60])
+def test_write_cube_values(num_values):
+    """Test that chunked Cube values match the unchunked output."""
+    values = np.linspace(-2.5, 3.5, num_values)
+    expected = []
+    for i in range(0, num_values, 6):
+        expected.append(
+            " ".join(f"{val:< 13.5E}" for val in values[i : i + 6])
+        )
+    cube_file = io.StringIO()
+    chunks = [values[i : i + 5] for i in range(0, num_values, 5)]
+    write_cube_values(cube_file, chunks, chunk_lines=2)
+    assert cube_file.getvalue() == "\n".join(expected)
+
+
 def test_dx2cube(tmp_path):
     """Test conversion of OpenDX files to Cube files."""
     pqr_path = DATA_DIR / "dx2cube.pqr"
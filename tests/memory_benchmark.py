@@ -0,0 +1,139 @@
+"""Benchmark the memory used by a large biomolecule.
+
+A synthetic assembly is built by tiling copies of a structure (each copy in
+new chains, shifted so copies do not overlap) until it has the requested
+number of atoms.  The memory allocated while setting up the
+:class:`Biomolecule` is measured with :mod:`tracemalloc`.  Run from the top
+of the repository::
+
+    python tests/memory_benchmark.py --atoms 1000000 --output memory.json
+"""
+
+import argparse
+import copy
+import gc
+import itertools
+import json
+import string
+import time
+import tracemalloc
+from pathlib import Path
+
+from pdb2pqr import pdb
+from pdb2pqr.biomolecule import Biomolecule
+from pdb2pqr.io import get_definitions, get_molecule
+
+#: Where the test data lives
+DATA_DIR = Path("tests/data")
+
+#: Shift between copies of the structure (in Angstroms)
+COPY_SPACING = 100.0
+
+
+def chain_ids():
+    """Generate unique chain IDs.
+
+    :return:  chain IDs of increasing length
+    :rtype:  iterator of str
+    """
+    letters = string.ascii_uppercase + string.digits
+    for length in itertools.count(2):
+        for chars in itertools.product(letters, repeat=length):
+            yield "".join(chars)
+
+
+def synthetic_assembly(path, num_atoms):
+    """Tile copies of a structure into a large assembly.
+
+    :param path:  path to PDB file with the structure to copy
+    :type path:  str
+    :param num_atoms:  number of atom records in the assembly
+    :type num_atoms:  int
+    :return:  PDB records of assembly
+    :rtype:  list
+    """
+    pdblist, _ = get_molecule(path)
+    records = [
+        record
+        for record in pdblist
+        if isinstance(record, (pdb.ATOM, pdb.HETATM))
+    ]
+    old_chains = sorted({record.chain_id for record in records})
+    new_chains = chain_ids()
+    assembly = []
+    for index in itertools.count():
+        chain_map = {chain: next(new_chains) for chain in old_chains}
+        shift = COPY_SPACING * index
+        for record in records:
+            if len(assembly) == num_atoms:
+                return assembly
+            new_record = copy.copy(record)
+            new_record.chain_id = chain_map[record.chain_id]
+            new_record.x = record.x + shift
+            assembly.append(new_record)
+    return assembly
+
+
+def measure(pdblist, definition):
+    """Measure the memory used to set up a biomolecule.
+
+    :param pdblist:  PDB records of structure
+    :type pdblist:  list
+    :param definition:  topology definition
+    :type definition:  Definition
+    :return:  dictionary with the number of atoms and residues, time (s),
+        and memory retained by and allocated at peak while building the
+        biomolecule (bytes)
+    :rtype:  dict
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    biomolecule = Biomolecule(pdblist, definition)
+    wall = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    num_atoms = len(biomolecule.atoms)
+    return {
+        "atoms": num_atoms,
+        "residues": len(biomolecule.residues),
+        "wall": wall,
+        "retained": current,
+        "peak": peak,
+        "retained_per_atom": current / num_atoms,
+    }
+
+
+def main():
+    """Run the memory benchmark and report the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--atoms",
+        type=int,
+        default=200000,
+        help="number of atoms in synthetic assembly",
+    )
+    parser.add_argument(
+        "--input-pdb",
+        default=str(DATA_DIR / "1AFS.pdb"),
+        help="structure to copy into the assembly",
+    )
+    parser.add_argument("--output", help="path for JSON-format results")
+    args = parser.parse_args()
+    definition = get_definitions()
+    pdblist = synthetic_assembly(args.input_pdb, args.atoms)
+    results = measure(pdblist, definition)
+    print(
+        f"{results['atoms']} atoms in {results['residues']} residues: "
+        f"{results['retained'] / 2**20:.1f} MiB retained "
+        f"({results['retained_per_atom']:.0f} bytes/atom), "
+        f"{results['peak'] / 2**20:.1f} MiB peak, "
+        f"{results['wall']:.1f} s"
+    )
+    if args.output is not None:
+        with open(args.output, "w") as json_file:
+            json.dump(results, json_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Tests of parameters shared across runs and worker processes."""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import common
+import pytest
+
+from pdb2pqr import shared
+from pdb2pqr.main import build_main_parser, main_driver
+
+PARSER = build_main_parser()
+
+
+def run_job(input_pdb, output_pqr):
+    """Run PDB2PQR in a worker and report whether a store was used."""
+    args = PARSER.parse_args(
+        ["--ff=PARSE", "--log-level=WARNING", str(input_pdb), str(output_pqr)]
+    )
+    main_driver(args)
+    return shared.get_store() is not None
+
+
+def test_store_reuse():
+    """Test that an installed store is used instead of loading parameters."""
+    store = shared.ParameterStore(ff_names=["parse"])
+    shared.install(store)
+    try:
+        definition = shared.get_definitions()
+        assert definition is store.definition
+        parse = shared.get_forcefield("parse", definition)
+        assert parse is store.get_forcefield("parse")
+        assert shared.get_forcefield("amber", definition) is (
+            store.get_forcefield("amber")
+        )
+        handler = shared.get_hydrogen_handler()
+        assert handler is shared.get_hydrogen_handler()
+    finally:
+        shared.install(None)
+    assert shared.get_definitions() is not store.definition
+
+
+@pytest.mark.parametrize("method", ["fork", "spawn"])
+def test_share_with_workers(method, tmp_path):
+    """Test that workers produce the same output with a shared store."""
+    if method not in multiprocessing.get_all_start_methods():
+        pytest.skip(f"{method} not available")
+    input_pdb = Path(common.DATA_DIR / "1QBS.pdb").resolve()
+    expected_pqr = tmp_path / "expected.pqr"
+    assert not run_job(input_pdb, expected_pqr)
+    store = shared.ParameterStore(ff_names=["parse"])
+    outputs = [tmp_path / f"output{i}.pqr" for i in range(2)]
+    with (
+        shared.share(store) as initargs,
+        ProcessPoolExecutor(
+            max_workers=2,
+            mp_context=multiprocessing.get_context(method),
+            initializer=shared.init_worker,
+            initargs=initargs,
+        ) as executor,
+    ):
+        used_store = list(
+            executor.map(run_job, [input_pdb] * len(outputs), outputs)
+        )
+    assert shared.get_store() is None
+    assert all(used_store)
+    for output_pqr in outputs:
+        common.compare_pqr(output_pqr, expected_pqr)
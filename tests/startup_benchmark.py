@@ -0,0 +1,159 @@
+"""Benchmark PDB2PQR command-line startup time.
+
+Each scenario is run in a fresh interpreter with ``python -X importtime``
+and the wall time, total import time, and cumulative import time of
+selected modules are recorded.  Run from the top of the repository::
+
+    python tests/startup_benchmark.py --repeat 5 --output startup.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+#: Where the test data lives
+DATA_DIR = Path("tests/data")
+
+#: Modules whose cumulative import time is reported
+WATCHED_MODULES = [
+    "numpy",
+    "pdb2pqr.main",
+    "pdbx",
+    "propka.input",
+    "propka.lib",
+    "requests",
+]
+
+#: Entry point used to run PDB2PQR in a fresh interpreter
+ENTRY_POINT = "import sys; from pdb2pqr.main import main; sys.exit(main())"
+
+
+def parse_importtime(stderr):
+    """Parse ``python -X importtime`` output.
+
+    :param stderr:  standard error from an interpreter run with
+        ``-X importtime``
+    :type stderr:  str
+    :return:  (total import time, dictionary of cumulative import times by
+        module) in microseconds
+    :rtype:  (int, dict)
+    """
+    total = 0
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        try:
+            self_us = int(fields[0])
+            cumulative_us = int(fields[1])
+        except ValueError:
+            # Header line
+            continue
+        module = fields[2].strip()
+        total += self_us
+        cumulative[module] = cumulative_us
+    return total, cumulative
+
+
+def run_scenario(args):
+    """Run PDB2PQR once in a fresh interpreter.
+
+    :param args:  PDB2PQR command-line arguments
+    :type args:  [str]
+    :return:  dictionary with wall time (s), total import time (s), and
+        cumulative import times (s) of watched modules
+    :rtype:  dict
+    """
+    command = [sys.executable, "-X", "importtime", "-c", ENTRY_POINT, *args]
+    start = time.perf_counter()
+    result = subprocess.run(
+        command, capture_output=True, text=True, check=False
+    )
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        err = f"Command {command} failed:\n{result.stderr[-2000:]}"
+        raise RuntimeError(err)
+    total, cumulative = parse_importtime(result.stderr)
+    return {
+        "wall": wall,
+        "imports": total * 1e-6,
+        "modules": {
+            module: cumulative[module] * 1e-6
+            for module in WATCHED_MODULES
+            if module in cumulative
+        },
+    }
+
+
+def summarize(runs):
+    """Summarize several runs of a scenario.
+
+    :param runs:  results from :func:`run_scenario`
+    :type runs:  [dict]
+    :return:  minimum and median times
+    :rtype:  dict
+    """
+    modules = sorted({module for run in runs for module in run["modules"]})
+    return {
+        "repeat": len(runs),
+        "wall_min": min(run["wall"] for run in runs),
+        "wall_median": statistics.median(run["wall"] for run in runs),
+        "imports_min": min(run["imports"] for run in runs),
+        "imports_median": statistics.median(run["imports"] for run in runs),
+        "modules_median": {
+            module: statistics.median(
+                run["modules"].get(module, 0.0) for run in runs
+            )
+            for module in modules
+        },
+    }
+
+
+def main():
+    """Run the startup benchmarks and report the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="number of runs per scenario"
+    )
+    parser.add_argument(
+        "--input-pdb",
+        default=str(DATA_DIR / "1QBS.pdb"),
+        help="structure for the minimal run",
+    )
+    parser.add_argument("--output", help="path for JSON-format results")
+    args = parser.parse_args()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        scenarios = {
+            "help": ["--help"],
+            "minimal": [
+                "--ff=PARSE",
+                "--log-level=WARNING",
+                args.input_pdb,
+                str(Path(tmp_dir) / "output.pqr"),
+            ],
+        }
+        for name, scenario_args in scenarios.items():
+            runs = [run_scenario(scenario_args) for _ in range(args.repeat)]
+            results[name] = summarize(runs)
+    for name, summary in results.items():
+        print(
+            f"{name}: wall {summary['wall_median']:.3f} s "
+            f"(min {summary['wall_min']:.3f} s), "
+            f"imports {summary['imports_median']:.3f} s"
+        )
+        for module, seconds in summary["modules_median"].items():
+            print(f"    {module}: {seconds:.3f} s")
+    if args.output is not None:
+        with open(args.output, "w") as json_file:
+            json.dump(results, json_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()